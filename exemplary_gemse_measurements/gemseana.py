@@ -8,8 +8,23 @@
 ###############################################################
 
 import subprocess
+import concurrent.futures
+import asyncio
+import shlex
 import numpy as np
 import os
+import re
+import warnings
+import json
+import sqlite3
+import hashlib
+import datetime
+import time
+import resource
+import threading
+import functools
+import contextlib
+import tempfile
 import matplotlib.pyplot as plt
 # include the following lines for local analysis
 import getpass
@@ -41,44 +56,167 @@ gemse_mint = "#5a8fa3" # mint green color of the GeMSE logo
 
 
 
+###############################################################
+### Stage Instrumentation
+###############################################################
+
+
+# This dictionary holds the state of the stage instrumentation (see 'enable_stage_trace'). An empty 'pathstring_trace' means that the instrumentation is disabled.
+stage_trace_dict = {
+    "pathstring_trace" : "", # pathstring referring to the JSON-lines trace file
+    "records" : [], # records of all stages traced since 'enable_stage_trace' was called
+    "lock" : threading.Lock()}
+
+
+# This function is used to enable the stage instrumentation, i.e., every traced stage (wrapper functions of Moritz' executables and the main Python stages) appends one JSON line to 'pathstring_trace'.
+def enable_stage_trace(pathstring_trace):
+    stage_trace_dict["pathstring_trace"] = pathstring_trace
+    stage_trace_dict["records"] = []
+    return
+
+
+# This function is used to disable the stage instrumentation. It returns the records of all stages traced in the meantime.
+def disable_stage_trace():
+    stage_trace_dict["pathstring_trace"] = ""
+    return stage_trace_dict["records"]
+
+
+# This function is used to sum up the sizes of all existing files within 'input_pathstrings'.
+def get_total_file_bytes(input_pathstrings):
+    return sum([os.path.getsize(p) for p in input_pathstrings if type(p) == str and os.path.isfile(p)])
+
+
+# This context manager is used to record wall time, CPU time and peak RSS of a stage as well as its input and output byte counts and its exit code.
+# It yields the record dictionary (or 'None' if the instrumentation is disabled) such that the stage can fill in its exit code, child process resources (see 'execute_execstring') and output files.
+# Note that 'self_cpu_s' and 'self_peak_rss_mb' refer to the entire Python process (i.e., they include concurrently running threads).
+@contextlib.contextmanager
+def trace_stage(stage_name, input_pathstrings=[], output_pathstrings=[]):
+    if stage_trace_dict["pathstring_trace"] == "":
+        yield None
+        return
+    record = {
+        "stage" : stage_name,
+        "start" : datetime.datetime.now().isoformat(),
+        "input_bytes" : get_total_file_bytes(input_pathstrings),
+        "output_pathstrings" : list(output_pathstrings),
+        "returncode" : None,
+        "child_cpu_s" : 0.0,
+        "child_peak_rss_mb" : 0.0}
+    rusage_i = resource.getrusage(resource.RUSAGE_SELF)
+    t_i = time.perf_counter()
+    try:
+        yield record
+    finally:
+        rusage_f = resource.getrusage(resource.RUSAGE_SELF)
+        record["wall_s"] = time.perf_counter() -t_i
+        record["self_cpu_s"] = (rusage_f.ru_utime +rusage_f.ru_stime) -(rusage_i.ru_utime +rusage_i.ru_stime)
+        record["self_peak_rss_mb"] = rusage_f.ru_maxrss/1024
+        record["output_bytes"] = get_total_file_bytes(record["output_pathstrings"])
+        with stage_trace_dict["lock"]:
+            stage_trace_dict["records"].append(record)
+            with open(stage_trace_dict["pathstring_trace"], "a") as trace_file:
+                trace_file.write(json.dumps(record, default=str) +"\n")
+
+
+# This decorator is used to trace Python stages (e.g., 'get_timestamp_data_as_ndarray'). All existing files passed on as arguments are considered input files.
+# If the instrumentation is disabled the decorated function is called right away.
+def traced_stage(stage_function):
+    @functools.wraps(stage_function)
+    def traced_stage_function(*args, **kwargs):
+        if stage_trace_dict["pathstring_trace"] == "":
+            return stage_function(*args, **kwargs)
+        with trace_stage(stage_function.__name__, [a for a in list(args) +list(kwargs.values()) if type(a) == str]) as record:
+            result = stage_function(*args, **kwargs)
+            record["returncode"] = 0
+        return result
+    return traced_stage_function
+
+
+# This function is used to print a summary table of the stage records (e.g., as returned by 'disable_stage_trace').
+def print_stage_trace_summary(stage_records):
+    print(f"{'stage':<40} {'wall / s':>10} {'child CPU / s':>14} {'child RSS / MB':>15} {'in / MB':>10} {'out / MB':>10} {'exit code':>10}")
+    for record in stage_records:
+        print(f"{record['stage']:<40} {record['wall_s']:>10.2f} {record['child_cpu_s']:>14.2f} {record['child_peak_rss_mb']:>15.1f} {record['input_bytes']/2**20:>10.1f} {record['output_bytes']/2**20:>10.1f} {str(record['returncode']):>10}")
+    print(f"{'total':<40} {sum([r['wall_s'] for r in stage_records]):>10.2f} {sum([r['child_cpu_s'] for r in stage_records]):>14.2f}")
+    return
+
+
+
+
+
+
 ###############################################################
 ### Helper Functions
 ###############################################################
 
 
+# first line of the binary (pseudo) list file format written by 'gen_pseudo_list_file(flag_binary=True)'
+# It is followed by one line of json metadata (header list, number of events, dtype) and the raw 'timestamp_data_mc2_dtype' records.
+binary_list_file_magic = b"GEMSE_BINARY_LIST_FILE\n"
+
+
 # This function is used to save the 'input_data_raw_cut' structured array as a (pseudo) list file, which can further on be processed by the GeMSE analysis infrastructure
+# The events are formatted in blocks of 'input_block_events' events (one '%'-formatting per block) and written via a buffered file.
+# If 'flag_binary' is set, the events are instead saved in a compact binary format that cannot be processed by Moritz' scripts but can be read back by 'get_timestamp_data_as_ndarray' and 'iter_list_file_chunks' without parsing any text.
+@traced_stage
 def gen_pseudo_list_file(
     pathstring_output, # pathstring according to which the pseudo list file is supposed to be saved
     header_list, # list containing the integer values of the raw data list file header
-    input_data_raw_cut): # raw data (in the form of a numpy structured array) retrieved from the raw data list file via 'monxeana.get_raw_data_from_list_file()'
+    input_data_raw_cut, # raw data (in the form of a numpy structured array of dtype 'timestamp_data_mc2_dtype') retrieved from the raw data list file via 'get_timestamp_data_as_ndarray()'
+    input_block_events = 10**6, # number of events formatted at once
+    flag_binary = False): # flag indicating whether the compact binary format is supposed to be written
+
+    # writing the binary file
+    if flag_binary == True:
+        with open(pathstring_output, "wb") as list_file:
+            list_file.write(binary_list_file_magic)
+            list_file.write(json.dumps({"header_list" : [int(h) for h in header_list], "n_events" : len(input_data_raw_cut), "dtype" : str(timestamp_data_mc2_dtype.descr)}).encode() +b"\n")
+            list_file.write(np.ascontiguousarray(input_data_raw_cut, dtype=timestamp_data_mc2_dtype).tobytes())
+        print(f"\ngen_pseudo_list_file(): wrote '{pathstring_output}'")
+        return
 
-    # writing the file
-    with open(pathstring_output, "w") as list_file:
+    # writing the text file
+    with open(pathstring_output, "w", buffering=2**24) as list_file:
 
         # writing the header of the file
-        list_file.write("HEADER0:" +str(header_list[0]) +"\n")
-        list_file.write("HEADER1:" +str(header_list[1]) +"\n")
-        list_file.write("HEADER2:" +str(header_list[2]) +"\n")
-        list_file.write("HEADER3:" +str(header_list[3]) +"\n")
-        list_file.write("HEADER4:" +str(header_list[4]))
+        list_file.write("\n".join(["HEADER" +str(i) +":" +str(header_list[i]) for i in range(len(header_list))]))
 
         # writing the modified, i.e. cut, data
-        for i in range(len(input_data_raw_cut)):
-            list_file.write("\n" +str(int(+input_data_raw_cut[i]["timestamp_ps"]/10000)) +" " +str(int(input_data_raw_cut[i]["pulse_height_adc"])) +" " +str(input_data_raw_cut[i]["flag_mca"]) +" ")
+        for i in range(0, len(input_data_raw_cut), input_block_events):
+            block = input_data_raw_cut[i:i+input_block_events]
+            columns = np.empty((len(block), 3), np.int64)
+            columns[:,0] = block["timestamp_10ns"]
+            columns[:,1] = block["pulse_height_adc"]
+            columns[:,2] = block["extra"]
+            list_file.write(("\n%d %d %d "*len(block)) % tuple(columns.ravel().tolist()))
 
     print(f"\ngen_pseudo_list_file(): wrote '{pathstring_output}'")
     return
 
 
+# This function is used to memory-map a binary (pseudo) list file written by 'gen_pseudo_list_file(flag_binary=True)'.
+# It returns the header list and the (read-only) structured array, or 'None' if the file is not a binary list file.
+def load_binary_list_file(pathstring_data):
+    with open(pathstring_data, "rb") as input_file:
+        if input_file.read(len(binary_list_file_magic)) != binary_list_file_magic:
+            return None
+        metadata = json.loads(input_file.readline())
+        offset = input_file.tell()
+    if metadata["dtype"] != str(timestamp_data_mc2_dtype.descr):
+        raise Exception(f"load_binary_list_file(): '{pathstring_data}' was written with a different dtype: {metadata['dtype']}")
+    timestamp_data = np.memmap(pathstring_data, dtype=timestamp_data_mc2_dtype, mode="r", offset=offset, shape=(metadata["n_events"],))
+    return metadata["header_list"], timestamp_data
+
+
 # This functions is used to check whether two files match line by line.
+# For (pseudo) list files 'compare_list_files' (see below) is much faster and returns a structured summary.
 def compare_files_line_by_line(pathstring_file_a, pathstring_file_b):
 
     # opening both lines
     with open(pathstring_file_a, 'r') as file_a, open(pathstring_file_b, 'r') as file_b:
-        ctr_lines = 0
         ctr_different_lines = 0
         # looping over both lines simultaneously utilizing 'zip'
-        for line_a, line_b in zip(file_a, file_b):
+        for ctr_lines, (line_a, line_b) in enumerate(zip(file_a, file_b)):
             if line_a == line_b:
                 continue
             else:
@@ -86,11 +224,181 @@ def compare_files_line_by_line(pathstring_file_a, pathstring_file_b):
                 print(f"file_a: {line_a}")
                 print(f"file_b: {line_b}")
                 ctr_different_lines += 1
-            ctr_lines += 1
     print(f"compare_files_line_by_line: {ctr_different_lines} different lines")
     return
 
 
+# This function is used to compute the sha1 hashes and the numbers of newlines of consecutive blocks of 'input_block_bytes' bytes of a file (starting at byte 'input_offset').
+def get_block_hashes(pathstring, input_offset=0, input_block_bytes=2**26):
+    hash_list = []
+    newline_list = []
+    with open(pathstring, "rb") as input_file:
+        input_file.seek(input_offset)
+        for block in iter(lambda: input_file.read(input_block_bytes), b""):
+            hash_list.append(hashlib.sha1(block).hexdigest())
+            newline_list.append(block.count(b"\n"))
+    return hash_list, newline_list
+
+
+# This function is used to extend the byte range from 'start' to 'end' (both absolute file positions) of a list file to complete lines.
+# The range is extended backwards to the beginning of the line containing 'start' (but not beyond 'body_start') and forwards to the end of the line containing 'end', i.e., both ends lie within the bytes adjacent to the range.
+def get_line_aligned_byte_range(input_file, start, end, body_start, input_search_bytes=2**16):
+    while start > body_start:
+        lower = max(body_start, start -input_search_bytes)
+        input_file.seek(lower)
+        i = input_file.read(start -lower).rfind(b"\n")
+        if i >= 0:
+            start = lower +i +1
+            break
+        start = lower
+    pos = end
+    while True:
+        input_file.seek(pos)
+        block = input_file.read(input_search_bytes)
+        if block == b"":
+            end = pos
+            break
+        i = block.find(b"\n")
+        if i >= 0:
+            end = pos +i +1
+            break
+        pos += len(block)
+    return start, end
+
+
+# This function is used to add the differences between two sets of events (given as lists of the 'timestamp_10ns', 'pulse_height_adc' and 'extra' columns) to the summary dictionary of 'compare_list_files'.
+# Only the first 'min(len(a), len(b))' events are compared. The i-th difference is reported as '{index_key : index_offset +i}' (or 'index_offset +index_map[i]' if 'index_map' is given, e.g., to map events onto line numbers).
+def add_list_file_differences(summary_dict, columns_a, columns_b, index_offset, n_differences_max, index_key="event_index", index_map=None):
+    keys = ["timestamp_10ns", "pulse_height_adc", "extra"]
+    l = min(len(columns_a[0]), len(columns_b[0]))
+    mask_different = np.zeros(l, bool)
+    for key, column_a, column_b in zip(keys, columns_a, columns_b):
+        mask_key = column_a[:l] != column_b[:l]
+        summary_dict["n_different_" +key] += int(np.count_nonzero(mask_key))
+        mask_different |= mask_key
+    for i in np.flatnonzero(mask_different)[:max(0, n_differences_max -len(summary_dict["first_differences"]))]:
+        summary_dict["first_differences"].append({
+            index_key : index_offset +int(i if index_map is None else index_map[i]),
+            "a" : [int(column_a[i]) for column_a in columns_a],
+            "b" : [int(column_b[i]) for column_b in columns_b]})
+    summary_dict["n_different_events"] += int(np.count_nonzero(mask_different))
+    return
+
+
+# This function is used to check whether two (pseudo) list files contain the same events.
+# First the bodies of both files are compared via block hashes (computed for both files in parallel threads). Only the mismatching blocks (e.g., due to different line endings or actual differences) are extended to complete lines, parsed and compared numerically.
+# If the bodies differ in size (or a mismatching byte range contains a different number of lines in both files, i.e., the events are shifted) both files are instead parsed chunk by chunk and compared entirely.
+# On the block hash path the events within identical blocks are counted as lines, i.e., without parsing them. Accordingly the differences are reported by their 'line_index' within file a (starting with 0 for the first header line, as the bad line indices of 'get_timestamp_data_as_ndarray'),
+# whereas the numeric path reports the 'event_index' (i.e., the index within the array returned by 'get_timestamp_data_as_ndarray').
+# A mismatching range whose bad lines differ between both files is compared entirely as well, since its events cannot be matched line by line.
+# Instead of printing every difference a summary dictionary is returned containing the event numbers, the number of differing events (per column) and the first 'n_differences_max' differences.
+@traced_stage
+def compare_list_files(
+    pathstring_file_a,
+    pathstring_file_b,
+    flag_ignore_header = False, # flag indicating whether differing headers are supposed to be ignored
+    n_differences_max = 10, # maximum number of differences listed in the summary
+    chunk_events = 10**6, # number of events compared at once
+    block_bytes = 2**26): # number of bytes per hashed block
+
+    fname = "compare_list_files"
+    summary_dict = {
+        "identical" : False,
+        "method" : "block_hashes",
+        "header_identical" : False,
+        "n_events_a" : None,
+        "n_events_b" : None,
+        "n_mismatching_blocks" : 0,
+        "n_different_events" : 0,
+        "n_different_timestamp_10ns" : 0,
+        "n_different_pulse_height_adc" : 0,
+        "n_different_extra" : 0,
+        "first_differences" : []}
+
+    # comparing the headers
+    header_lists, body_offsets = [], []
+    for pathstring in [pathstring_file_a, pathstring_file_b]:
+        binary_list_file = load_binary_list_file(pathstring)
+        if binary_list_file != None:
+            header_lists.append(binary_list_file[0])
+            body_offsets.append(None)
+            continue
+        with open(pathstring, "rb") as input_file:
+            header_lists.append(read_list_file_header(input_file))
+            body_offsets.append(input_file.tell())
+    summary_dict["header_identical"] = header_lists[0] == header_lists[1]
+
+    # case 1: comparing block hashes of the raw bodies and parsing only the mismatching blocks
+    body_bytes = os.path.getsize(pathstring_file_a) -body_offsets[0] if None not in body_offsets else None
+    if None not in body_offsets and body_bytes == os.path.getsize(pathstring_file_b) -body_offsets[1]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            (hash_list_a, newline_list_a), (hash_list_b, newline_list_b) = list(executor.map(get_block_hashes, [pathstring_file_a, pathstring_file_b], body_offsets, [block_bytes]*2))
+        mismatching_blocks = [k for k in range(len(hash_list_a)) if hash_list_a[k] != hash_list_b[k]]
+        summary_dict["n_mismatching_blocks"] = len(mismatching_blocks)
+        with open(pathstring_file_a, "rb") as file_a, open(pathstring_file_b, "rb") as file_b:
+            n_lines = []
+            for input_file, body_offset, newline_list in [(file_a, body_offsets[0], newline_list_a), (file_b, body_offsets[1], newline_list_b)]:
+                input_file.seek(body_offset +body_bytes -1)
+                n_lines.append(sum(newline_list) +(1 if body_bytes > 0 and input_file.read(1) != b"\n" else 0))
+            # extending the mismatching blocks to complete lines (positions relative to the body of file a) and merging overlapping ranges
+            byte_ranges = []
+            for k in mismatching_blocks:
+                start, end = get_line_aligned_byte_range(file_a, body_offsets[0] +k*block_bytes, body_offsets[0] +min((k+1)*block_bytes, body_bytes), body_offsets[0])
+                if byte_ranges != [] and start -body_offsets[0] <= byte_ranges[-1][1]:
+                    byte_ranges[-1][1] = max(byte_ranges[-1][1], end -body_offsets[0])
+                else:
+                    byte_ranges.append([start -body_offsets[0], end -body_offsets[0]])
+            # parsing and comparing the mismatching ranges
+            n_bad_lines = [0, 0]
+            for start, end in byte_ranges:
+                chunks, line_offsets = [], []
+                for input_file, body_offset, newline_list in [(file_a, body_offsets[0], newline_list_a), (file_b, body_offsets[1], newline_list_b)]:
+                    input_file.seek(body_offset +(start //block_bytes)*block_bytes)
+                    line_offsets.append(sum(newline_list[:start //block_bytes]) +input_file.read(start %block_bytes).count(b"\n"))
+                    input_file.seek(body_offset +start)
+                    chunks.append(input_file.read(end -start))
+                if chunks[0].count(b"\n") != chunks[1].count(b"\n") or line_offsets[0] != line_offsets[1]:
+                    break
+                (values_a, bad_line_indices_a), (values_b, bad_line_indices_b) = parse_list_file_chunk(chunks[0]), parse_list_file_chunk(chunks[1])
+                if bad_line_indices_a != bad_line_indices_b:
+                    break
+                valid_lines = np.delete(np.arange(chunks[0].count(b"\n") +(0 if chunks[0].endswith(b"\n") else 1)), bad_line_indices_a)
+                add_list_file_differences(summary_dict, [values_a[:,j] for j in range(3)], [values_b[:,j] for j in range(3)], len(header_lists[0]) +line_offsets[0], n_differences_max, "line_index", valid_lines)
+                n_bad_lines[0] += len(bad_line_indices_a)
+                n_bad_lines[1] += len(bad_line_indices_b)
+            else:
+                summary_dict["n_events_a"] = n_lines[0] -n_bad_lines[0]
+                summary_dict["n_events_b"] = n_lines[1] -n_bad_lines[1]
+                summary_dict["identical"] = (summary_dict["header_identical"] or flag_ignore_header) and summary_dict["n_events_a"] == summary_dict["n_events_b"] and summary_dict["n_different_events"] == 0
+                print(f"{fname}(): {summary_dict['n_events_a']} vs. {summary_dict['n_events_b']} events, {len(mismatching_blocks)} mismatching blocks, {summary_dict['n_different_events']} differing events, headers are {'' if summary_dict['header_identical'] else 'NOT '}identical")
+                return summary_dict
+        # the events are shifted (or differ in bad lines) within a mismatching range, i.e., the files are compared entirely
+        for key in ["n_different_events", "n_different_timestamp_10ns", "n_different_pulse_height_adc", "n_different_extra"]:
+            summary_dict[key] = 0
+        summary_dict["first_differences"] = []
+
+    # case 2: comparing the events chunk by chunk
+    summary_dict["method"] = "numeric"
+    n_events_a, n_events_b = 0, 0
+    iter_a = iter_list_file_chunks(pathstring_file_a, chunk_events=chunk_events)
+    iter_b = iter_list_file_chunks(pathstring_file_b, chunk_events=chunk_events)
+    keys = ["timestamp_10ns", "pulse_height_adc", "extra"]
+    while True:
+        chunk_a = next(iter_a, (None, np.zeros(0, timestamp_data_mc2_dtype)))[1]
+        chunk_b = next(iter_b, (None, np.zeros(0, timestamp_data_mc2_dtype)))[1]
+        if len(chunk_a) == 0 and len(chunk_b) == 0:
+            break
+        add_list_file_differences(summary_dict, [chunk_a[key] for key in keys], [chunk_b[key] for key in keys], n_events_a, n_differences_max)
+        n_events_a += len(chunk_a)
+        n_events_b += len(chunk_b)
+    summary_dict["n_events_a"] = n_events_a
+    summary_dict["n_events_b"] = n_events_b
+    summary_dict["identical"] = (summary_dict["header_identical"] or flag_ignore_header) and n_events_a == n_events_b and summary_dict["n_different_events"] == 0
+    print(f"{fname}(): {n_events_a} vs. {n_events_b} events, {summary_dict['n_different_events']} differing events, headers are {'' if summary_dict['header_identical'] else 'NOT '}identical")
+
+    return summary_dict
+
+
 # This function is used to extract both the base and the exponent of a float represented as a string in scientific notation (e.g., 4.77e-7).
 def det_base_and_exponent_of_scientific_notation(input_float, input_precision=5):
 
@@ -166,35 +474,121 @@ def conv_scifloat_string_to_latex_syntax(scifloat_string):
 ###############################################################
 
 
+# This function is used to convert an argument list into the corresponding (properly quoted) shell command string, e.g., for printing.
+def conv_args_to_execstring(args):
+    return " ".join([shlex.quote(str(arg)) for arg in args])
+
+
+# This function is used to convert the exit status returned by 'os.wait4' into a return code (negative values correspond to the terminating signal, as for 'subprocess').
+def conv_wait_status_to_returncode(status):
+    return os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+
+# This function is used to record the resources of a reaped child process in a stage record (see 'trace_stage').
+def add_child_rusage_to_record(record, returncode, rusage, execstring):
+    record["returncode"] = returncode
+    record["child_cpu_s"] = rusage.ru_utime +rusage.ru_stime
+    record["child_peak_rss_mb"] = rusage.ru_maxrss/1024
+    record["execstring"] = execstring
+    return
+
+
+# This function is used to execute the commands assembled by the wrapper functions below.
+# 'execstring' is either an argument list (executed directly, i.e., without a shell) or a shell command string.
+# It returns the 'subprocess.CompletedProcess' instance, i.e., the return code and (if 'flag_capture_output' is set) stdout and stderr of the executed command.
+# If a stage record is passed on (see 'trace_stage'), the child process is reaped via 'os.wait4' such that its CPU time and peak RSS can be recorded.
+def execute_execstring(execstring, flag_capture_output=False, record=None):
+    flag_shell = type(execstring) == str
+    if record == None:
+        if flag_capture_output == True:
+            return subprocess.run(execstring, shell=flag_shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        return subprocess.run(execstring, shell=flag_shell)
+    # the output is captured via temporary files (rather than pipes) as the child process is reaped via 'os.wait4' instead of 'communicate()'
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(execstring, shell=flag_shell, stdout=stdout_file if flag_capture_output == True else None, stderr=stderr_file if flag_capture_output == True else None)
+        pid, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = conv_wait_status_to_returncode(status)
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        stdout = stdout_file.read().decode(errors="replace") if flag_capture_output == True else None
+        stderr = stderr_file.read().decode(errors="replace") if flag_capture_output == True else None
+    add_child_rusage_to_record(record, process.returncode, rusage, execstring if flag_shell == True else conv_args_to_execstring(execstring))
+    return subprocess.CompletedProcess(execstring, process.returncode, stdout, stderr)
+
+
+# These functions are used to assemble the argument lists of Moritz' C++ executables (see the wrapper functions below).
+def get_make_rootfile_list_args(
+    input_pathstring_mca_list_file,
+    input_pathstring_calibration_function,
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts):
+    return [input_abspath_gemse_root_scripts +"make_rootfile_list", input_pathstring_mca_list_file, input_pathstring_calibration_function]
+
+def get_make_spectrum_list_args(
+    input_pathstring_root_file = "XXX",
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
+    input_time_window = [0,0]):
+    args = [input_abspath_gemse_root_scripts +"make_spectrum_list", "--file", input_pathstring_root_file, "--energy"]
+    if input_time_window != [0,0]:
+        args += ["--t_min", str(int(input_time_window[0])), "--t_max", str(int(input_time_window[1]))]
+    return args
+
+def get_plot_rate_args(
+    input_pathstring_root_file = "XXX",
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
+    input_energy_calibration = False,
+    input_binwidth = 1,
+    input_pulse_height_range = [0,16383]):
+    args = [input_abspath_gemse_root_scripts +"plot_rate", "--file", input_pathstring_root_file]
+    if input_energy_calibration == True:
+        args += ["--energy"]
+    args += ["--range_min", str(input_pulse_height_range[0]), "--range_max", str(input_pulse_height_range[1])]
+    args += ["--binwidth", str(input_binwidth)]
+    return args
+
+def get_add_spectra_args(
+    input_pathstrings_cut_spectra,
+    input_pathstring_output_spectrum,
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts):
+    return [input_abspath_gemse_root_scripts +"add_spectra"] +list(input_pathstrings_cut_spectra) +[input_pathstring_output_spectrum]
+
+def get_gemse_analysis_args(
+    input_pathstring_gemse_analysis_configuration_file = "XXX",
+    input_abspath_gemse_analysis = abspath_gemse_analysis):
+    return [input_abspath_gemse_analysis +"GeMSE_analysis", input_pathstring_gemse_analysis_configuration_file]
+
+
 # This function is a wrapper for Moritz' C++ executable 'make_rootfile_list'.
 def make_rootfile_list(
     input_pathstring_mca_list_file,
     input_pathstring_calibration_function,
-    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts):
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
+    flag_capture_output = False): # flag indicating whether stdout and stderr are supposed to be captured (instead of printed)
 
     # executing the 'make_rootfile_list' executable
-    execstring = input_abspath_gemse_root_scripts +"make_rootfile_list" +" " +input_pathstring_mca_list_file +" " +input_pathstring_calibration_function
-    print(f"make_rootfile_list(): executing\n{execstring}\n")
-    subprocess.call(execstring, shell=True)
+    args = get_make_rootfile_list_args(input_pathstring_mca_list_file, input_pathstring_calibration_function, input_abspath_gemse_root_scripts)
+    print(f"make_rootfile_list(): executing\n{conv_args_to_execstring(args)}\n")
+    with trace_stage("make_rootfile_list", [input_pathstring_mca_list_file, input_pathstring_calibration_function], [input_pathstring_mca_list_file +".root"]) as record:
+        result = execute_execstring(args, flag_capture_output, record)
 
-    return
+    return result
 
 
 # This function is a wrapper for Moritz' C++ executable 'make_spectrum_list'.
 def make_spectrum_list(
     input_pathstring_root_file = "XXX",
     input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
-    input_time_window = [0,0]):
+    input_time_window = [0,0],
+    flag_capture_output = False): # flag indicating whether stdout and stderr are supposed to be captured (instead of printed)
 
     # executing the 'make_spectrum_list' executable
-    if input_time_window == [0,0]:
-        execstring = input_abspath_gemse_root_scripts +"make_spectrum_list" +" --file " +input_pathstring_root_file +" --energy"
-    else:
-        execstring = input_abspath_gemse_root_scripts +"make_spectrum_list" +" --file " +input_pathstring_root_file +" --energy --t_min " +str(int(input_time_window[0])) +" --t_max " +str(int(input_time_window[1]))
-    print(f"make_spectrum_list(): executing\n{execstring}\n")
-    subprocess.call(execstring, shell=True)
+    args = get_make_spectrum_list_args(input_pathstring_root_file, input_abspath_gemse_root_scripts, input_time_window)
+    print(f"make_spectrum_list(): executing\n{conv_args_to_execstring(args)}\n")
+    with trace_stage("make_spectrum_list", [input_pathstring_root_file]) as record:
+        result = execute_execstring(args, flag_capture_output, record)
+        if record != None and input_pathstring_root_file.endswith(".root"):
+            record["output_pathstrings"] = get_spectrum_pathstrings(input_pathstring_root_file[:-5], input_time_window)
 
-    return
+    return result
 
 
 # This function is a wrapper for Moritz' C++ executable 'plot_rate'.
@@ -203,47 +597,207 @@ def plot_rate(
     input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
     input_energy_calibration = False, # flag indicating whether the energy values are supposed to be used
     input_binwidth = 1, # binwidth in seconds
-    input_pulse_height_range = [0,16383]): # pulse height
+    input_pulse_height_range = [0,16383], # pulse height
+    flag_capture_output = False): # flag indicating whether stdout and stderr are supposed to be captured (instead of printed)
 
     # executing the 'plot_rate' executable
-    execstring = input_abspath_gemse_root_scripts +"plot_rate" +" --file " +input_pathstring_root_file
-    if input_energy_calibration == True:
-        execstring = execstring + " --energy"
-    execstring = execstring +f" --range_min {input_pulse_height_range[0]} --range_max {input_pulse_height_range[1]}"
-    execstring = execstring +f" --binwidth {input_binwidth}"
-    print(f"plot_rate(): executing\n{execstring}\n")
-    subprocess.call(execstring, shell=True)
+    args = get_plot_rate_args(input_pathstring_root_file, input_abspath_gemse_root_scripts, input_energy_calibration, input_binwidth, input_pulse_height_range)
+    print(f"plot_rate(): executing\n{conv_args_to_execstring(args)}\n")
+    with trace_stage("plot_rate", [input_pathstring_root_file]) as record:
+        result = execute_execstring(args, flag_capture_output, record)
 
-    return
+    return result
 
 
 # This function is a wrapper for Moritz' C++ executable 'add_spectra'.
 def add_spectra(
     input_pathstrings_cut_spectra,
     input_pathstring_output_spectrum,
-    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts):
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
+    flag_capture_output = False): # flag indicating whether stdout and stderr are supposed to be captured (instead of printed)
 
     # executing the 'add_spectra' executable
-    execstring = input_abspath_gemse_root_scripts +"add_spectra"
-    for i in range(len(input_pathstrings_cut_spectra)):
-        execstring = execstring +" " +input_pathstrings_cut_spectra[i]
-    execstring = execstring +" " +input_pathstring_output_spectrum
-    print(f"add_spectra(): executing\n{execstring}\n")
-    subprocess.call(execstring, shell=True)
+    args = get_add_spectra_args(input_pathstrings_cut_spectra, input_pathstring_output_spectrum, input_abspath_gemse_root_scripts)
+    print(f"add_spectra(): executing\n{conv_args_to_execstring(args)}\n")
+    with trace_stage("add_spectra", input_pathstrings_cut_spectra, [input_pathstring_output_spectrum +".root"]) as record:
+        result = execute_execstring(args, flag_capture_output, record)
 
-    return
+    return result
 
 
 # This function is a wrapper for Moritz' C++ executable 'GeMSE_analysis'.
 def gemse_analysis(
     input_pathstring_gemse_analysis_configuration_file = "XXX",
-    input_abspath_gemse_analysis = abspath_gemse_analysis):
+    input_abspath_gemse_analysis = abspath_gemse_analysis,
+    flag_capture_output = False): # flag indicating whether stdout and stderr are supposed to be captured (instead of printed)
 
-    # executing the 'make_rootfile_list' executable
-    execstring = input_abspath_gemse_analysis +"GeMSE_analysis" +" " +input_pathstring_gemse_analysis_configuration_file
-    print(f"gemse_analysis(): executing\n{execstring}\n")
-    subprocess.call(execstring, shell=True)
+    # executing the 'GeMSE_analysis' executable
+    args = get_gemse_analysis_args(input_pathstring_gemse_analysis_configuration_file, input_abspath_gemse_analysis)
+    print(f"gemse_analysis(): executing\n{conv_args_to_execstring(args)}\n")
+    with trace_stage("gemse_analysis", [input_pathstring_gemse_analysis_configuration_file]) as record:
+        result = execute_execstring(args, flag_capture_output, record)
 
+    return result
+
+
+
+
+
+###############################################################
+### GeMSE analysis infrastructure: asynchronous execution
+###############################################################
+
+
+# The executables can also be run in the background, e.g., to continue working in a Jupyter notebook while 'GeMSE_analysis' is running.
+# All tasks are executed by an event loop running in a separate (daemon) thread, at most 'max_concurrency' of them simultaneously.
+# Their stdout and stderr are written line by line into a per-task log file (within 'abspath_task_logs' by default) such that they can be followed, e.g., via 'tail -f'.
+# Usage:
+#     future = gemseana.submit_tool("gemse_analysis", input_pathstring_gemse_analysis_configuration_file=...) # returns immediately, 'future.cancel()' terminates the executable
+#     result = await gemseana.run_tool_async("make_spectrum_list", input_pathstring_root_file=..., input_time_window=[0,3600]) # awaitable front-end
+#     result = gemseana.run_tool("add_spectra", input_pathstrings_cut_spectra=[...], input_pathstring_output_spectrum=...) # blocking front-end
+
+
+abspath_task_logs = os.path.expanduser("~") +"/.cache/gemseana/task_logs/"
+
+
+# This dictionary holds the state of the background event loop (see 'get_task_event_loop').
+task_executor_dict = {
+    "loop" : None, # event loop running in the background thread
+    "thread" : None, # background thread
+    "semaphore" : None, # semaphore limiting the number of simultaneously running executables (created within the event loop)
+    "max_concurrency" : max(1, (os.cpu_count() or 2)//2), # maximum number of simultaneously running executables
+    "tasks" : [], # dictionaries describing all submitted tasks (see 'submit_task')
+    "lock" : threading.Lock()}
+
+
+# This dictionary maps the names of Moritz' executables onto the functions assembling their argument lists.
+tool_args_functions = {
+    "make_rootfile_list" : get_make_rootfile_list_args,
+    "make_spectrum_list" : get_make_spectrum_list_args,
+    "plot_rate" : get_plot_rate_args,
+    "add_spectra" : get_add_spectra_args,
+    "gemse_analysis" : get_gemse_analysis_args}
+
+
+# This function is used to retrieve the background event loop (which is started on the first call).
+def get_task_event_loop():
+    with task_executor_dict["lock"]:
+        if task_executor_dict["loop"] == None:
+            task_executor_dict["loop"] = asyncio.new_event_loop()
+            task_executor_dict["thread"] = threading.Thread(target=task_executor_dict["loop"].run_forever, name="gemseana_task_executor", daemon=True)
+            task_executor_dict["thread"].start()
+    return task_executor_dict["loop"]
+
+
+# This function is used to set the maximum number of simultaneously running executables (only tasks submitted afterwards are affected).
+def set_task_max_concurrency(max_concurrency):
+    with task_executor_dict["lock"]:
+        task_executor_dict["max_concurrency"] = max_concurrency
+        task_executor_dict["semaphore"] = None
+    return
+
+
+# This coroutine is used to read a pipe of a child process line by line, every line is immediately written (and flushed) into 'log_file'.
+# It returns the entire output as a string.
+async def stream_pipe_to_log_file(pipe, log_file, prefix=""):
+    loop = asyncio.get_event_loop()
+    reader = asyncio.StreamReader(limit=2**24)
+    transport, protocol = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    lines = []
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.decode(errors="replace")
+            lines.append(line)
+            log_file.write(prefix +line)
+            log_file.flush()
+    finally:
+        transport.close()
+    return "".join(lines)
+
+
+# This coroutine is used to execute an argument list within the background event loop.
+# The child process is reaped via 'os.wait4' (within a worker thread), i.e., no child watcher is required and the stage instrumentation (see 'trace_stage') also records its resources.
+# If the task is cancelled the child process is terminated.
+async def execute_args_async(args, pathstring_log, stage_name):
+    loop = asyncio.get_event_loop()
+    if task_executor_dict["semaphore"] == None:
+        task_executor_dict["semaphore"] = asyncio.Semaphore(task_executor_dict["max_concurrency"])
+    async with task_executor_dict["semaphore"]:
+        with trace_stage(stage_name, [arg for arg in args[1:] if os.path.isfile(arg)]) as record, open(pathstring_log, "w") as log_file:
+            log_file.write(f"# {conv_args_to_execstring(args)}\n# started: {datetime.datetime.now()}\n")
+            log_file.flush()
+            process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            try:
+                stdout, stderr = await asyncio.gather(
+                    stream_pipe_to_log_file(process.stdout, log_file),
+                    stream_pipe_to_log_file(process.stderr, log_file, "[stderr] "))
+                pid, status, rusage = await loop.run_in_executor(None, os.wait4, process.pid, 0)
+            except asyncio.CancelledError:
+                process.terminate()
+                await loop.run_in_executor(None, process.wait)
+                log_file.write(f"# cancelled: {datetime.datetime.now()}\n")
+                raise
+            process.returncode = conv_wait_status_to_returncode(status)
+            log_file.write(f"# finished: {datetime.datetime.now()} (return code {process.returncode})\n")
+            if record != None:
+                add_child_rusage_to_record(record, process.returncode, rusage, conv_args_to_execstring(args))
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+
+# This function is used to submit an argument list to the background event loop.
+# It returns immediately with a 'concurrent.futures.Future' whose result is the 'subprocess.CompletedProcess' instance of the executable ('future.cancel()' terminates the executable).
+def submit_task(
+    args, # argument list, e.g., as returned by 'get_gemse_analysis_args'
+    pathstring_log = "", # pathstring of the log file, by default 'abspath_task_logs +<datetime>_<stage_name>.log'
+    stage_name = "task"): # name of the task (utilized for the log file and the stage instrumentation)
+    if pathstring_log == "":
+        os.makedirs(abspath_task_logs, exist_ok=True)
+        pathstring_log = abspath_task_logs +datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f") +"_" +stage_name +".log"
+    future = asyncio.run_coroutine_threadsafe(execute_args_async(list(args), pathstring_log, stage_name), get_task_event_loop())
+    task_executor_dict["tasks"].append({"stage_name" : stage_name, "args" : list(args), "pathstring_log" : pathstring_log, "submitted" : datetime.datetime.now(), "future" : future})
+    print(f"submit_task(): submitted '{stage_name}' (log: '{pathstring_log}')\n{conv_args_to_execstring(args)}\n")
+    return future
+
+
+# This function is used to submit one of Moritz' executables ('tool_name', see 'tool_args_functions') to the background event loop.
+# The keyword arguments are passed on to the corresponding 'get_*_args' function, the return value is that of 'submit_task'.
+def submit_tool(tool_name, pathstring_log="", **kwargs):
+    if tool_name not in tool_args_functions:
+        raise Exception(f"submit_tool(): unknown tool '{tool_name}', available tools: {list(tool_args_functions.keys())}")
+    return submit_task(tool_args_functions[tool_name](**kwargs), pathstring_log, tool_name)
+
+
+# This coroutine is the awaitable front-end of 'submit_tool', it can be awaited from any event loop (e.g., the one of the Jupyter kernel).
+async def run_tool_async(tool_name, pathstring_log="", **kwargs):
+    return await asyncio.wrap_future(submit_tool(tool_name, pathstring_log, **kwargs))
+
+
+# This function is the blocking front-end of 'submit_tool'. Interrupting it (e.g., via the Jupyter 'stop' button) terminates the executable.
+def run_tool(tool_name, pathstring_log="", **kwargs):
+    future = submit_tool(tool_name, pathstring_log, **kwargs)
+    try:
+        return future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        raise
+
+
+# This function is used to print an overview of all submitted tasks.
+def print_task_overview():
+    for i, task in enumerate(task_executor_dict["tasks"]):
+        future = task["future"]
+        if future.cancelled():
+            status = "cancelled"
+        elif not future.done():
+            status = "running/pending"
+        elif future.exception() != None:
+            status = f"failed ({future.exception()})"
+        else:
+            status = f"finished (return code {future.result().returncode})"
+        print(f"{i:>3} {task['stage_name']:<20} {task['submitted'].strftime('%Y-%m-%d %H:%M:%S'):<20} {status:<30} {task['pathstring_log']}")
     return
 
 
@@ -255,6 +809,162 @@ def gemse_analysis(
 ###############################################################
 
 
+# The isotope parameters folder (see 'gen_analysis_configuration_file') contains one 'parameters_<isotope>.txt' file per isotope, read by 'GeMSE_analysis'.
+# Every file consists of the following headings, each followed by either a single value or one value per peak.
+# The tuples hold the heading (without the leading '# ', units in parentheses and trailing whitespace), the key of the parsed isotope dictionary and whether there is one value per peak.
+isotope_parameters_headings = [
+    ("Half-life", "half_life_s", False),
+    ("Number of peaks", "n_peaks", False),
+    ("Peak Energies", "peak_energies_kev", True),
+    ("Background efficiency", "background_efficiencies", True),
+    ("Lower Fit Range", "fit_range_lower_kev", True),
+    ("Upper Fit Range", "fit_range_upper_kev", True),
+    ("lower limit of fit parameter „signal“", "signal_limit_lower_bq", False),
+    ("upper limit of fit parameter „signal“", "signal_limit_upper_bq", False),
+    ("lower limit of fit parameter „sample_const“", "sample_const_limits_lower_hz", True),
+    ("upper limit of fit parameter „sample_const“", "sample_const_limits_upper_hz", True),
+    ("lower limit of fit parameter „bck_const“", "bck_const_limits_lower_hz", True),
+    ("upper limit of fit parameter „bck_const“", "bck_const_limits_upper_hz", True),
+    ("lower limit of fit parameter „bck_gauss“", "bck_gauss_limits_lower_hz", True),
+    ("upper limit of fit parameter „bck_gauss“", "bck_gauss_limits_upper_hz", True),
+    ("integration constant", "integration_constant", False),
+]
+isotope_parameters_filename_pattern = re.compile(r"^parameters_(?P<isotope>\w+)\.txt$")
+
+
+# This function is used to parse and validate a single isotope parameters file (e.g., 'parameters_Co60.txt').
+# It returns a dictionary with the keys given in 'isotope_parameters_headings', the per-peak values are stored as NumPy arrays and the scalar values as floats ('n_peaks' as an int).
+def parse_isotope_parameters_file(pathstring_isotope_parameters_file):
+    # reading the values below every heading
+    heading_values = []
+    with open(pathstring_isotope_parameters_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#"):
+                heading_values.append([re.sub(r"\s*\(.*\)$", "", line[1:].strip()), []])
+            elif line != "" and heading_values != []:
+                heading_values[-1][1].append(line)
+    # checking the headings and converting the values
+    if [heading for heading, values in heading_values] != [heading for heading, key, flag_per_peak in isotope_parameters_headings]:
+        raise Exception(f"parse_isotope_parameters_file(): '{pathstring_isotope_parameters_file}' does not feature the expected headings {[heading for heading, key, flag_per_peak in isotope_parameters_headings]}")
+    isotope_parameters_dict = {}
+    try:
+        n_peaks = int(heading_values[1][1][0])
+        for (heading, key, flag_per_peak), (_, values) in zip(isotope_parameters_headings, heading_values):
+            if len(values) != (n_peaks if flag_per_peak == True else 1):
+                raise Exception(f"'{heading}' features {len(values)} instead of {n_peaks if flag_per_peak == True else 1} value(s)")
+            isotope_parameters_dict[key] = np.array(values, dtype=np.float64) if flag_per_peak == True else float(values[0])
+    except Exception as e:
+        raise Exception(f"parse_isotope_parameters_file(): invalid isotope parameters file '{pathstring_isotope_parameters_file}': {e}")
+    isotope_parameters_dict["n_peaks"] = n_peaks
+    # checking the values for consistency
+    if isotope_parameters_dict["half_life_s"] <= 0:
+        raise Exception(f"parse_isotope_parameters_file(): '{pathstring_isotope_parameters_file}' features a non-positive half-life")
+    if np.any(isotope_parameters_dict["fit_range_lower_kev"] >= isotope_parameters_dict["peak_energies_kev"]) or np.any(isotope_parameters_dict["fit_range_upper_kev"] <= isotope_parameters_dict["peak_energies_kev"]):
+        raise Exception(f"parse_isotope_parameters_file(): '{pathstring_isotope_parameters_file}' features peak energies outside of their fit ranges")
+    for key_lower, key_upper in [("signal_limit_lower_bq", "signal_limit_upper_bq"), ("sample_const_limits_lower_hz", "sample_const_limits_upper_hz"), ("bck_const_limits_lower_hz", "bck_const_limits_upper_hz"), ("bck_gauss_limits_lower_hz", "bck_gauss_limits_upper_hz")]:
+        if np.any(isotope_parameters_dict[key_lower] > isotope_parameters_dict[key_upper]):
+            raise Exception(f"parse_isotope_parameters_file(): '{pathstring_isotope_parameters_file}' features '{key_lower}' exceeding '{key_upper}'")
+    for value in isotope_parameters_dict.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return isotope_parameters_dict
+
+
+# This function is used to remove the commented-out entries (e.g., "#Mn54", which 'GeMSE_analysis' skips) from a list of isotopes to analyze.
+def get_analyzed_isotopes(list_isotopes):
+    return [isotope.strip() for isotope in list_isotopes if not isotope.strip().startswith("#")]
+
+
+# This function is used to load the parameters file of a single isotope (see 'parse_isotope_parameters_file').
+# The parsed files are memoized on their modification times, i.e., a file is only parsed again once it has been modified.
+def get_isotope_parameters(abspath_isotope_parameters_folder, isotope):
+    pathstring_isotope_parameters_file = os.path.abspath(abspath_isotope_parameters_folder) +"/parameters_" +isotope +".txt"
+    if not os.path.isfile(pathstring_isotope_parameters_file):
+        raise Exception(f"get_isotope_parameters(): no parameters file for isotope '{isotope}' in '{os.path.abspath(abspath_isotope_parameters_folder)}'")
+    return parse_isotope_parameters_file_memoized(pathstring_isotope_parameters_file, os.stat(pathstring_isotope_parameters_file).st_mtime_ns)
+
+@functools.lru_cache(maxsize=256)
+def parse_isotope_parameters_file_memoized(pathstring_isotope_parameters_file, mtime_ns):
+    return parse_isotope_parameters_file(pathstring_isotope_parameters_file)
+
+
+# This function is used to generate the peak index of several isotopes, i.e., a NumPy record array of all their peaks sorted by energy.
+def gen_isotope_peak_index(isotopes_dict):
+    peaks = np.zeros(
+        shape = sum([isotope_parameters_dict["n_peaks"] for isotope_parameters_dict in isotopes_dict.values()]),
+        dtype = np.dtype([("isotope", "U16"), ("peak", np.int16), ("energy_kev", np.float64), ("fit_range_lower_kev", np.float64), ("fit_range_upper_kev", np.float64)]))
+    i = 0
+    for isotope, isotope_parameters_dict in isotopes_dict.items():
+        n_peaks = isotope_parameters_dict["n_peaks"]
+        peaks["isotope"][i:i+n_peaks] = isotope
+        peaks["peak"][i:i+n_peaks] = np.arange(n_peaks)
+        peaks["energy_kev"][i:i+n_peaks] = isotope_parameters_dict["peak_energies_kev"]
+        peaks["fit_range_lower_kev"][i:i+n_peaks] = isotope_parameters_dict["fit_range_lower_kev"]
+        peaks["fit_range_upper_kev"][i:i+n_peaks] = isotope_parameters_dict["fit_range_upper_kev"]
+        i += n_peaks
+    peaks = np.sort(peaks, order="energy_kev")
+    peaks.setflags(write=False)
+    return peaks
+
+
+# This function is used to retrieve the peak index (see 'gen_isotope_peak_index') of the isotopes in 'list_isotopes', only their parameters files are parsed.
+def get_isotope_peaks(abspath_isotope_parameters_folder, list_isotopes):
+    return gen_isotope_peak_index({isotope : get_isotope_parameters(abspath_isotope_parameters_folder, isotope) for isotope in get_analyzed_isotopes(list_isotopes)})
+
+
+# This function is used to load all isotope parameters files within 'abspath_isotope_parameters_folder' into a registry dictionary (e.g., to look up which isotope features a peak at a given energy).
+# The registry is memoized on the modification times of the files within the folder. Since all files are parsed, a single invalid file raises an exception, use 'get_isotope_parameters' or 'get_isotope_peaks' for specific isotopes.
+# The returned registry is of the following format:
+#     {
+#         "abspath_isotope_parameters_folder" : "...",
+#         "isotopes" : {"Co60" : <dictionary returned by 'parse_isotope_parameters_file'>, ...},
+#         "peaks" : <NumPy record array of all peaks sorted by energy, fields: 'isotope', 'peak', 'energy_kev', 'fit_range_lower_kev', 'fit_range_upper_kev'>,
+#     }
+def load_isotope_parameter_registry(abspath_isotope_parameters_folder):
+    abspath_isotope_parameters_folder = os.path.abspath(abspath_isotope_parameters_folder)
+    if not os.path.isdir(abspath_isotope_parameters_folder):
+        raise Exception(f"load_isotope_parameter_registry(): isotope parameters folder '{abspath_isotope_parameters_folder}' does not exist")
+    folder_state = [(filename, os.stat(abspath_isotope_parameters_folder +"/" +filename).st_mtime_ns) for filename in sorted(os.listdir(abspath_isotope_parameters_folder)) if isotope_parameters_filename_pattern.match(filename)]
+    return load_isotope_parameter_registry_memoized(abspath_isotope_parameters_folder, tuple(folder_state))
+
+@functools.lru_cache(maxsize=8)
+def load_isotope_parameter_registry_memoized(abspath_isotope_parameters_folder, folder_state):
+    isotopes = [isotope_parameters_filename_pattern.match(filename).group("isotope") for filename, mtime_ns in folder_state]
+    isotopes_dict = {isotope : get_isotope_parameters(abspath_isotope_parameters_folder, isotope) for isotope in isotopes}
+    return {
+        "abspath_isotope_parameters_folder" : abspath_isotope_parameters_folder,
+        "isotopes" : isotopes_dict,
+        "peaks" : gen_isotope_peak_index(isotopes_dict)}
+
+
+# This function is used to look up the peaks (see the 'peaks' record array of 'load_isotope_parameter_registry') within the energy interval [energy_min_kev, energy_max_kev].
+# If 'flag_fit_ranges' is set to True, all peaks whose fit ranges overlap with the interval are returned instead.
+def find_isotope_peaks(
+    abspath_isotope_parameters_folder, # isotope parameters folder
+    energy_min_kev, # lower end of the energy interval
+    energy_max_kev, # upper end of the energy interval
+    flag_fit_ranges = False): # flag indicating whether the fit ranges (instead of the peak energies) are compared to the interval
+    peaks = load_isotope_parameter_registry(abspath_isotope_parameters_folder)["peaks"]
+    if flag_fit_ranges == True:
+        return peaks[(peaks["fit_range_upper_kev"] >= energy_min_kev) & (peaks["fit_range_lower_kev"] <= energy_max_kev)]
+    return peaks[np.searchsorted(peaks["energy_kev"], energy_min_kev, side="left"):np.searchsorted(peaks["energy_kev"], energy_max_kev, side="right")]
+
+
+# This function is used to check whether every (not commented-out) isotope of 'list_isotopes' features a valid parameters file within 'abspath_isotope_parameters_folder'.
+# Only the parameters files of these isotopes are parsed, i.e., invalid files of other isotopes do not matter.
+def validate_isotopes(abspath_isotope_parameters_folder, list_isotopes):
+    abspath_isotope_parameters_folder = os.path.abspath(abspath_isotope_parameters_folder)
+    if not os.path.isdir(abspath_isotope_parameters_folder):
+        raise Exception(f"validate_isotopes(): isotope parameters folder '{abspath_isotope_parameters_folder}' does not exist")
+    missing_isotopes = [isotope for isotope in get_analyzed_isotopes(list_isotopes) if not os.path.isfile(abspath_isotope_parameters_folder +"/parameters_" +isotope +".txt")]
+    if missing_isotopes != []:
+        raise Exception(f"validate_isotopes(): no parameters files for the isotopes {missing_isotopes} in '{abspath_isotope_parameters_folder}'")
+    for isotope in get_analyzed_isotopes(list_isotopes):
+        get_isotope_parameters(abspath_isotope_parameters_folder, isotope) # raises an exception if the file is invalid
+    return True
+
+
 # This function is used to generate a `analysis_configuration_file'.
 def gen_analysis_configuration_file(
     pathstring_output,
@@ -269,7 +979,12 @@ def gen_analysis_configuration_file(
     threshold_on_bayes_factor = 0.33,
     cl_for_activity_limit = 0.95,
     fract_uncert_efficency = 0.02,
-    list_isotopes_to_analyze = ["U238", "Ra226", "Th228", "Ra228", "Co60", "K40", "Cs137", "Mn54", "Ti44", "Na22", "Al26"]):
+    list_isotopes_to_analyze = ["U238", "Ra226", "Th228", "Ra228", "Co60", "K40", "Cs137", "Mn54", "Ti44", "Na22", "Al26"],
+    flag_validate_isotopes = True): # flag indicating whether the isotope parameters files of 'list_isotopes_to_analyze' are checked beforehand (see 'validate_isotopes')
+
+    # checking the requested isotopes
+    if flag_validate_isotopes == True:
+        validate_isotopes(abspath_isotope_parameters_folder, list_isotopes_to_analyze)
 
     # opening and writing the output
     with open(pathstring_output, 'w+') as f:
@@ -314,180 +1029,708 @@ def gen_analysis_configuration_file(
     return pathstring_output
 
 
-# This function is used to generate a 'gemse_analysis_wiki_syntax' file from a 'gemse_analysis_summary' file.
-# The idea here is to simply copy the contents of the output file into the corresponding wiki note without having to adjust every single entry manually.
-def gen_analysis_results_wiki_syntax_file(pathstring_gemse_analysis_summary, pathstring_gemse_analysis_summary_wiki_syntax):
-
-    # opening both files
-    with open(pathstring_gemse_analysis_summary, 'r') as input_file, open(pathstring_gemse_analysis_summary_wiki_syntax, 'w+') as output_file:
-
-        # looping over the contents of the input file
-        flag_isotope_results = False
-        flag_everything_went_fine = True
-        write_string_analysis_parameters = ""
-        write_string_isotopes = ""
-        write_string_activity = ""
-        write_string_bayes_factor = ""
-        for i, line in enumerate(input_file, start=0):
-
-            line_list = list(line.split())
-
-            # extracting: analysis parameters
-            if flag_isotope_results == False and i != 0 and "#################################" not in line and line != "\n" and not ("Isotope" in line and "Activity (Bq)" in line and "Bayes Factor" in line):
-                if "sample spectrum" in line or "background spectrum" in line or "simulated efficiencies" in line or "energy resolution" in line:
-                    add = line_list[0] +" " +line_list[1] +" " +"''%%" +list(line_list[2].split("/"))[-1] +"%%''"
-                    print(line_list)
-                else:
-                    add = line[:-1]
-                write_string_analysis_parameters = write_string_analysis_parameters  +add +r" \\ "
+# This function is used to read an analysis configuration file (see 'gen_analysis_configuration_file').
+# It returns a dictionary with the headings (without the leading '# ') as keys and the lists of the subsequent (non-empty) lines as values, e.g., {"sample name" : ["sample"], ..., "isotopes to analyze" : ["U238", "Ra226", ...]}.
+# The isotopes to analyze are the last section, commented-out isotopes (e.g., "#Mn54") are therefore kept as values rather than interpreted as headings.
+def read_analysis_configuration_file(pathstring_gemse_analysis_configuration_file):
+    configuration_dict = {}
+    heading = ""
+    with open(pathstring_gemse_analysis_configuration_file, 'r') as configuration_file:
+        for line in configuration_file:
+            if line.startswith("#") and heading != "isotopes to analyze":
+                heading = line[1:].strip()
+                configuration_dict[heading] = []
+            elif line.strip() != "" and heading != "":
+                configuration_dict[heading].append(line.strip())
+    return configuration_dict
+
+
+# This function is used to write an analysis configuration file from a dictionary as returned by 'read_analysis_configuration_file'.
+def write_analysis_configuration_file(pathstring_output, configuration_dict):
+    with open(pathstring_output, 'w+') as f:
+        for heading, values in configuration_dict.items():
+            f.write(f"# {heading}\n")
+            for value in values:
+                f.write(f"{value}\n")
+    return pathstring_output
 
-            # extracting: isotope limits/activities
-            if flag_isotope_results == True:
-                isotope = line_list[0]
-                bayes_factor = line_list[-1]
-                # case 1: limit placed
-                if len(line_list) == 4 and "<" in line_list:
-                    limit = line_list[2]
-                    print(f"isotope: {isotope};   limit: {limit} Bq;   bayes factor: {bayes_factor}")
-                    write_string_isotopes = write_string_isotopes +isotope +r" \\ "
-                    write_string_activity = write_string_activity +f"< {limit}" +r" \\ "
-                    write_string_bayes_factor = write_string_bayes_factor +bayes_factor +r" \\ "
-                # case 2: activity determined
-                elif len(line_list) == 7 and "-" in line_list and "+" in line_list:
-                    activity = line_list[1]
-                    activity_e_lower = line_list[3]
-                    activity_e_upper = line_list[5]
-                    print(f"isotope: {isotope};   activity: ({activity}-{activity_e_lower}+{activity_e_upper}) Bq;   bayes factor: {bayes_factor}")
-                    write_string_isotopes = write_string_isotopes +isotope +r" \\ "
-                    write_string_activity = write_string_activity +f"({activity} - {activity_e_lower} + {activity_e_upper})" +r" \\ "
-                    write_string_bayes_factor = write_string_bayes_factor +bayes_factor +r" \\ "
-                # case 3: exception caught
-                else:
-                    flag_everything_went_fine = False
-                    print(f"gen_analysis_results_wiki_syntax_file(): ERROR reading line '{line_list}'")
-                # writing the isotope results to the output file
-                
 
-            # checking whether the the current lines contain information on the isotope analysis
-            if "Isotope" in line and "Activity (Bq)" in line and "Bayes Factor" in line:
+# This function is used to list all input files of a 'GeMSE_analysis' run according to an analysis configuration file (e.g., to compute the input hash of the analysis stage, see 'run_stage').
+# These are the configuration file itself, the sample, background, efficiency and resolution files and all parameters files within the isotope parameters folder.
+def get_gemse_analysis_input_pathstrings(pathstring_gemse_analysis_configuration_file):
+    configuration_dict = read_analysis_configuration_file(pathstring_gemse_analysis_configuration_file)
+    input_pathstrings = [pathstring_gemse_analysis_configuration_file]
+    for heading in ["sample spectrum file name", "background spectrum file name", "efficiency file name", "resolution file name"]:
+        input_pathstrings += configuration_dict.get(heading, [])
+    for abspath_isotope_parameters_folder in configuration_dict.get("isotope parameters folder", []):
+        if os.path.isdir(abspath_isotope_parameters_folder):
+            input_pathstrings += sorted([os.path.join(abspath_isotope_parameters_folder, filename) for filename in os.listdir(abspath_isotope_parameters_folder) if filename.endswith(".txt")])
+        else:
+            input_pathstrings.append(abspath_isotope_parameters_folder)
+    return input_pathstrings
+
+
+# This dictionary defines the analysis parameter lines of a 'gemse_analysis_summary' file (i.e., '<sample name>_activities_summary.txt', see 'parse_activities_summary'): label ---> (key, type).
+# For the type 'basename' only the file name of the pathstring is kept.
+activities_summary_parameter_table = {
+    "sample name" : ("sample_id", "basename"),
+    "sample spectrum" : ("sample_spectrum", "basename"),
+    "background spectrum" : ("background_spectrum", "basename"),
+    "simulated efficiencies" : ("simulated_efficiencies", "basename"),
+    "fractional uncertainty efficiencies" : ("fractional_uncertainty_efficiencies", float),
+    "energy resolution" : ("energy_resolution", "basename"),
+    "measurement time sample" : ("measurement_time_s", float),
+    "measurement time background" : ("measurement_time_background_sec", float),
+    "BF threshold for signal" : ("bf_threshold_for_signal", float),
+    "CL for activity limit" : ("cl_for_activity_limit", float)}
+
+# compiled patterns of the lines of a 'gemse_analysis_summary' file
+activities_summary_datetimestamp_pattern = re.compile(r"^\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2}$")
+activities_summary_parameter_pattern = re.compile(r"^(?P<label>[^:]+):\s*(?P<value>\S+)")
+activities_summary_isotope_header_pattern = re.compile(r"^Isotope\s.*Activity \(Bq\)\s.*Bayes Factor")
+activities_summary_limit_pattern = re.compile(r"^(?P<isotope>\S+)\s+<\s*(?P<upper_limit_bq>\S+)\s+(?P<bayes_factor>\S+)$")
+activities_summary_activity_pattern = re.compile(r"^(?P<isotope>\S+)\s+(?P<activity_bq>\S+)\s+-\s+(?P<activity_bq_lower>\S+)\s+\+\s+(?P<activity_bq_upper>\S+)\s+(?P<bayes_factor>\S+)$")
+
+
+# This function is used to parse a 'gemse_analysis_summary' file (i.e., '<sample name>_activities_summary.txt') into a dictionary, this is the only parser of the summary format (it is utilized by the wiki, .json and plot outputs).
+# The returned dictionary contains:
+#     "datetimestamp" : analysis date (string as written by 'GeMSE_analysis')
+#     "parameters" : typed analysis parameters (see 'activities_summary_parameter_table')
+#     "parameter_strings" : analysis parameters as written within the summary file
+#     "parameter_lines" : [label, line] pairs of all analysis parameter lines (in order)
+#     "isotope_data" : {isotope : {"bayes_factor", "upper_limit_bq", "activity_bq", "activity_bq_lower", "activity_bq_upper" (floats or None), "strings" : {...} (as written within the summary file)}}
+#     "unparsed_lines" : lines of the isotope results that match neither an upper limit nor an activity
+def parse_activities_summary(pathstring_gemse_analysis_summary):
+    summary_record = {
+        "pathstring_summary" : pathstring_gemse_analysis_summary,
+        "datetimestamp" : "",
+        "parameters" : {},
+        "parameter_strings" : {},
+        "parameter_lines" : [],
+        "isotope_data" : {},
+        "unparsed_lines" : []}
+    flag_isotope_results = False
+    with open(pathstring_gemse_analysis_summary, 'r') as input_file:
+        for i, line in enumerate(input_file):
+            line = line.rstrip("\r\n")
+            # isotope results
+            if flag_isotope_results == True:
+                if line.strip() == "":
+                    continue
+                match = activities_summary_limit_pattern.match(line.strip()) or activities_summary_activity_pattern.match(line.strip())
+                if match == None:
+                    summary_record["unparsed_lines"].append(line)
+                    continue
+                strings = match.groupdict()
+                isotope = strings.pop("isotope")
+                summary_record["isotope_data"][isotope] = {key : float(strings[key]) if key in strings else None for key in ["bayes_factor", "upper_limit_bq", "activity_bq", "activity_bq_lower", "activity_bq_upper"]}
+                summary_record["isotope_data"][isotope]["strings"] = strings
+            elif activities_summary_isotope_header_pattern.match(line.strip()):
                 flag_isotope_results = True
+            # analysis parameters
+            elif i != 0 and "#################################" not in line and line != "":
+                match = activities_summary_parameter_pattern.match(line)
+                label = match.group("label").strip() if match != None else ""
+                summary_record["parameter_lines"].append([label, line])
+                if activities_summary_datetimestamp_pattern.match(line.strip()) and summary_record["datetimestamp"] == "":
+                    summary_record["datetimestamp"] = line.strip()
+                elif label in activities_summary_parameter_table:
+                    key, value_type = activities_summary_parameter_table[label]
+                    value = match.group("value")
+                    summary_record["parameter_strings"][key] = value.split("/")[-1] if value_type == "basename" else value
+                    summary_record["parameters"][key] = value.split("/")[-1] if value_type == "basename" else value_type(value)
+    return summary_record
 
-        # printing the analysis parameters to the output file
-        output_file.write(f"| GeMSE analysis | {write_string_analysis_parameters[:-4]} |||\n")
-        output_file.write(f"| ::: | isotope | activity limit / measured activity [Bq] | bayes factor |\n")
-        output_file.write(f"| ::: | {write_string_isotopes[:-4]} | {write_string_activity[:-4]} | {write_string_bayes_factor[:-4]} |\n\n")
 
-        # printing the result of this function to screen
-        if flag_everything_went_fine == True:
-            print(f"gen_analysis_results_wiki_syntax_file(): successfully saved '{pathstring_gemse_analysis_summary_wiki_syntax}'")
+# This function is used to generate a 'gemse_analysis_wiki_syntax' file from a 'gemse_analysis_summary' file.
+# The idea here is to simply copy the contents of the output file into the corresponding wiki note without having to adjust every single entry manually.
+# If the summary file has already been parsed (see 'parse_activities_summary') the parsed dictionary can be passed on as 'summary_record'.
+def gen_analysis_results_wiki_syntax_file(pathstring_gemse_analysis_summary, pathstring_gemse_analysis_summary_wiki_syntax, summary_record=None):
+
+    # parsing the summary file
+    if summary_record == None:
+        summary_record = parse_activities_summary(pathstring_gemse_analysis_summary)
+
+    # analysis parameters (the pathstrings are shortened to the file names)
+    parameters_list = []
+    for label, line in summary_record["parameter_lines"]:
+        if label in ["sample spectrum", "background spectrum", "simulated efficiencies", "energy resolution"]:
+            parameters_list.append(f"{label}: ''%%{summary_record['parameter_strings'][activities_summary_parameter_table[label][0]]}%%''")
+        else:
+            parameters_list.append(line)
+
+    # isotope limits/activities
+    isotopes_list = []
+    activities_list = []
+    bayes_factors_list = []
+    for isotope, isotope_data in summary_record["isotope_data"].items():
+        strings = isotope_data["strings"]
+        # case 1: limit placed
+        if isotope_data["upper_limit_bq"] != None:
+            print(f"isotope: {isotope};   limit: {strings['upper_limit_bq']} Bq;   bayes factor: {strings['bayes_factor']}")
+            activities_list.append(f"< {strings['upper_limit_bq']}")
+        # case 2: activity determined
         else:
-            print(f"gen_analysis_results_wiki_syntax_file(): saved '{pathstring_gemse_analysis_summary_wiki_syntax}' with ERROR")
+            print(f"isotope: {isotope};   activity: ({strings['activity_bq']}-{strings['activity_bq_lower']}+{strings['activity_bq_upper']}) Bq;   bayes factor: {strings['bayes_factor']}")
+            activities_list.append(f"({strings['activity_bq']} - {strings['activity_bq_lower']} + {strings['activity_bq_upper']})")
+        isotopes_list.append(isotope)
+        bayes_factors_list.append(strings["bayes_factor"])
+    # case 3: exception caught
+    for line in summary_record["unparsed_lines"]:
+        print(f"gen_analysis_results_wiki_syntax_file(): ERROR reading line '{line.split()}'")
+
+    # printing the analysis parameters to the output file
+    wiki_linebreak = r" \\ "
+    with open(pathstring_gemse_analysis_summary_wiki_syntax, 'w+') as output_file:
+        output_file.write(f"| GeMSE analysis | {wiki_linebreak.join(parameters_list)} |||\n")
+        output_file.write(f"| ::: | isotope | activity limit / measured activity [Bq] | bayes factor |\n")
+        output_file.write(f"| ::: | {wiki_linebreak.join(isotopes_list)} | {wiki_linebreak.join(activities_list)} | {wiki_linebreak.join(bayes_factors_list)} |\n\n")
+
+    # printing the result of this function to screen
+    if summary_record["unparsed_lines"] == []:
+        print(f"gen_analysis_results_wiki_syntax_file(): successfully saved '{pathstring_gemse_analysis_summary_wiki_syntax}'")
+    else:
+        print(f"gen_analysis_results_wiki_syntax_file(): saved '{pathstring_gemse_analysis_summary_wiki_syntax}' with ERROR")
 
     return pathstring_gemse_analysis_summary_wiki_syntax
 
 
-# This function is meant to summarize the wrapper functions for Moritz' C++ scripts defined above allowing for a all in one GeMSE analysis.
-def all_in_one_gemse_analysis(
+# This function is used to convert a parsed summary file (see 'parse_activities_summary') into the analysis results dictionary saved as '.json' file by 'gemse_analysis_aftermath' (and ingested by 'ingest_analysis_results').
+def gen_analysis_results_dictionary(
+    summary_record, # parsed summary file
+    input_filenames, # list containing the utilized mca list files
+    input_time_windows, # list containing the utilized time windows for the respective mca list files
+    input_sample_mass, # mass of the examined sample in kg
+    input_pathstring_calibration_function): # pathstring referring to the utilized calibration function
+
+    # analysis parameters
+    if summary_record["unparsed_lines"] != []:
+        raise Exception(f"something went wrong: {summary_record['unparsed_lines'][0].split()}")
+    analysis_dictionary = {
+        "mca_list_files" : input_filenames,
+        "mca_list_files_time_windows" : input_time_windows,
+        "sample_mass_kg" : input_sample_mass,
+        "calibration_function" : list(input_pathstring_calibration_function.split("/"))[-1],
+        "isotope_data" : {}}
+    analysis_dictionary.update({"datetimestamp" : summary_record["datetimestamp"]})
+    for key, value in summary_record["parameter_strings"].items():
+        analysis_dictionary.update({key : value})
+        if key == "measurement_time_s":
+            analysis_dictionary.update({"measurement_time_d" : summary_record["parameters"]["measurement_time_s"] / (60*60*24)})
+
+    # isotope limits/activities
+    for isotope, isotope_data in summary_record["isotope_data"].items():
+        analysis_dictionary["isotope_data"][isotope] = {
+            "bayes_factor" : isotope_data["strings"]["bayes_factor"],
+            "upper_limit_bq" : "",
+            "activity_bq" : "",
+            "activity_bq_lower" : "",
+            "activity_bq_upper" : "",
+            "upper_limit_bq_per_kg" : "",
+            "activity_bq_per_kg" : "",
+            "activity_bq_lower_per_kg" : "",
+            "activity_bq_upper_per_kg" : ""}
+        if isotope_data["upper_limit_bq"] != None:
+            analysis_dictionary["isotope_data"][isotope]["upper_limit_bq"] = isotope_data["upper_limit_bq"]
+            analysis_dictionary["isotope_data"][isotope]["upper_limit_bq_per_kg"] = isotope_data["upper_limit_bq"] / input_sample_mass
+        else:
+            for key in ["activity_bq", "activity_bq_lower", "activity_bq_upper"]:
+                analysis_dictionary["isotope_data"][isotope][key] = isotope_data["strings"][key]
+                analysis_dictionary["isotope_data"][isotope][key +"_per_kg"] = isotope_data[key] / input_sample_mass
+
+    return analysis_dictionary
+
+
+# This function is used to generate the reports of a single summary file from one parse, i.e., the wiki syntax file ('<summary>_wikisyntax.txt') and the parsed summary as '.json' file ('<summary>.json').
+# It returns the parsed summary (see 'parse_activities_summary').
+def gen_activities_summary_reports(pathstring_gemse_analysis_summary):
+    summary_record = parse_activities_summary(pathstring_gemse_analysis_summary)
+    pathstring_without_extension = pathstring_gemse_analysis_summary[:-4] if pathstring_gemse_analysis_summary.endswith(".txt") else pathstring_gemse_analysis_summary
+    gen_analysis_results_wiki_syntax_file(pathstring_gemse_analysis_summary, pathstring_without_extension +"_wikisyntax.txt", summary_record)
+    with open(pathstring_without_extension +".json", "w") as json_output_file:
+        json.dump(summary_record, json_output_file, indent=4)
+    return summary_record
+
+
+# This function is used to parse many summary files at once (e.g., all summaries of a measurement campaign) using a pool of worker processes.
+# 'input_summaries' is either a list of pathstrings or a folder which is searched recursively for '*_activities_summary.txt' files.
+# If 'flag_gen_reports' is set, the wiki syntax and '.json' files are (re)generated as well (see 'gen_activities_summary_reports').
+# It returns the list of parsed summaries.
+def parse_activities_summaries(
+    input_summaries, # list of pathstrings or folder
+    max_workers = 0, # number of worker processes (0 corresponds to 'os.cpu_count()')
+    flag_gen_reports = False): # flag indicating whether the wiki syntax and '.json' files are supposed to be generated
+
+    if type(input_summaries) == str:
+        pathstrings_summaries = sorted([os.path.join(root, filename) for root, dirs, filenames in os.walk(input_summaries) for filename in filenames if filename.endswith("_activities_summary.txt")])
+    else:
+        pathstrings_summaries = list(input_summaries)
+    max_workers = os.cpu_count() if max_workers == 0 else max_workers
+    function = gen_activities_summary_reports if flag_gen_reports == True else parse_activities_summary
+    if max_workers == 1 or len(pathstrings_summaries) < 2:
+        return [function(pathstring) for pathstring in pathstrings_summaries]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summary_records = list(executor.map(function, pathstrings_summaries, chunksize=max(1, len(pathstrings_summaries)//(4*max_workers))))
+    print(f"parse_activities_summaries(): parsed {len(summary_records)} summary files")
+    return summary_records
+
+
+# file name of the stage manifest saved within the measurement folder by 'all_in_one_gemse_analysis' (it records the input hashes of all stages that have been run successfully)
+stage_manifest_filename = "gemse_analysis_stage_manifest.json"
+
+
+# This function is used to compute the digest of an input file of an analysis stage.
+# Small files (e.g., configuration files, spectra) are hashed entirely such that rewriting them with identical content does not invalidate the stage, large files (e.g., mca list files) are represented by their fingerprint (see 'get_list_file_fingerprint').
+def get_file_digest(pathstring):
+    if not os.path.isfile(pathstring):
+        return None
+    if os.path.getsize(pathstring) > 2*list_file_cache_hash_bytes:
+        return get_list_file_fingerprint(pathstring)
+    with open(pathstring, "rb") as input_file:
+        return hashlib.sha1(input_file.read()).hexdigest()
+
+
+# This function is used to compute the input hash of an analysis stage from the digests of its input files and further parameters (e.g., the time window).
+def get_stage_input_hash(input_pathstrings, input_parameters={}):
+    input_dict = {
+        "files" : {os.path.abspath(p) : get_file_digest(p) for p in input_pathstrings},
+        "parameters" : input_parameters}
+    return hashlib.sha1(json.dumps(input_dict, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# This function is used to load the stage manifest (an empty dictionary is returned if there is none yet).
+def load_stage_manifest(pathstring_stage_manifest):
+    if pathstring_stage_manifest == "" or not os.path.isfile(pathstring_stage_manifest):
+        return {}
+    with open(pathstring_stage_manifest, "r") as json_input_file:
+        return json.load(json_input_file)
+
+
+# This function is used to record a successfully run stage (i.e., its input hash and output files) within the stage manifest.
+def record_stage(pathstring_stage_manifest, stage_key, input_hash, output_pathstrings):
+    if pathstring_stage_manifest == "":
+        return
+    stage_manifest = load_stage_manifest(pathstring_stage_manifest)
+    stage_manifest[stage_key] = {"input_hash" : input_hash, "output_pathstrings" : output_pathstrings}
+    with open(pathstring_stage_manifest +".tmp", "w") as json_output_file:
+        json.dump(stage_manifest, json_output_file, indent=4)
+    os.replace(pathstring_stage_manifest +".tmp", pathstring_stage_manifest)
+    return
+
+
+# This function is used to check whether a stage can be skipped, i.e., whether it was already run with identical inputs and all its output files still exist.
+# A stage without recorded output files is never considered up to date (there is nothing to check).
+def is_stage_up_to_date(pathstring_stage_manifest, stage_key, input_hash):
+    stage_manifest = load_stage_manifest(pathstring_stage_manifest)
+    if stage_key not in stage_manifest.keys() or stage_manifest[stage_key]["input_hash"] != input_hash:
+        return False
+    if stage_manifest[stage_key]["output_pathstrings"] == []:
+        return False
+    return all([os.path.isfile(p) for p in stage_manifest[stage_key]["output_pathstrings"]])
+
+
+# This function is used to run a stage of 'all_in_one_gemse_analysis' (i.e., a call to 'stage_function') unless it is up to date according to the stage manifest.
+# If 'pathstring_stage_manifest' is empty the stage is always run. The output files are determined after the stage has been run, therefore 'output_pathstrings' can also be a function returning the list of output files.
+def run_stage(
+    stage_function, # function executing the stage (returning a 'subprocess.CompletedProcess')
+    stage_key, # unique name of the stage
+    input_pathstrings, # list of input files
+    input_parameters, # dictionary of further parameters the stage depends on
+    output_pathstrings, # list of output files (or function returning that list)
+    pathstring_stage_manifest = ""):
+
+    input_hash = get_stage_input_hash(input_pathstrings, input_parameters)
+    if pathstring_stage_manifest != "" and is_stage_up_to_date(pathstring_stage_manifest, stage_key, input_hash):
+        print(f"run_stage(): skipping '{stage_key}' (up to date)\n")
+        return None
+    result = stage_function()
+    if result == None or result.returncode == 0:
+        record_stage(pathstring_stage_manifest, stage_key, input_hash, output_pathstrings() if callable(output_pathstrings) else output_pathstrings)
+    return result
+
+
+# This function is used to retrieve the uncut spectrum generated by 'make_spectrum_list' (i.e., for the time window '[0,0]') from the root file of an mca list file.
+# The string appended when 'make_spectrum_list' is run that is indicating the live time of the spectrum is not known a priori --> accordingly one needs to search for the correct file (ambiguities are resolved via 'get_list_file_live_time').
+def get_uncut_spectrum_candidates(pathstring_mca_list_file):
+    abspath_measurement_folder = pathstring_mca_list_file[:pathstring_mca_list_file.rfind("/")+1]
+    return [abspath_measurement_folder +filename for filename in os.listdir(abspath_measurement_folder if abspath_measurement_folder != "" else ".") if pathstring_mca_list_file +".root_spectrum_calibrated_0-" in abspath_measurement_folder +filename and filename.endswith(".root")]
+
+
+# This function is used to retrieve the output spectrum pathstrings of 'make_spectrum_list' for a given root file and time window.
+def get_spectrum_pathstrings(pathstring_mca_list_file, time_window):
+    if time_window == [0,0]:
+        return get_uncut_spectrum_candidates(pathstring_mca_list_file)
+    return [pathstring_mca_list_file +f".root_spectrum_calibrated_{str(int(time_window[0]))}-{str(int(time_window[1]))}s.root"]
+
+
+# This function is used to run the 'make_rootfile_list' and 'make_spectrum_list' conversions of several mca list files concurrently within a thread pool of 'max_workers' workers.
+# The 'make_spectrum_list' tasks of a file are submitted as soon as the root file of that very file is available.
+# Return codes, stdout and stderr are collected per task. If a task fails, all pending tasks are cancelled and an exception is raised.
+# The output of the executables is only captured for concurrent conversions (i.e., 'max_workers' > 1), otherwise it is streamed just as for the former sequential execution (and 'stdout' and 'stderr' of the tasks are 'None').
+# If 'input_pathstring_stage_manifest' is given, conversions whose inputs did not change since their last successful run are skipped (see 'run_stage').
+def run_list_file_conversions(
+    input_pathstrings_mca_list_files, # list of pathstrings referring to the raw mca list files
+    input_time_windows, # list of time windows corresponding to the entries of 'input_pathstrings_mca_list_files'
+    input_pathstring_calibration_function, # pathstring referring to the utilized energy calibration function
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts, # abspath of Moritz' 'GeMSE_ROOT_scripts' scripts
+    max_workers = 1, # number of conversions running simultaneously
+    input_pathstring_stage_manifest = ""): # pathstring referring to the stage manifest ("" means that all conversions are run)
+
+    fname = "run_list_file_conversions"
+    task_list = []
+    flag_capture_output = max_workers > 1 # the output of concurrent conversions would otherwise be interleaved
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        finished = [] # tasks whose outputs are available (either run or skipped), the corresponding follow-up tasks still need to be submitted
+
+        # This function is used to submit a task unless it is up to date.
+        def submit_task(task, task_function, task_kwargs, input_pathstrings, input_parameters):
+            task["stage_key"] = f"{task['task']}:{os.path.abspath(input_pathstrings_mca_list_files[task['file_index']])}:{task['time_window']}"
+            task["input_hash"] = get_stage_input_hash(input_pathstrings, input_parameters)
+            if input_pathstring_stage_manifest != "" and is_stage_up_to_date(input_pathstring_stage_manifest, task["stage_key"], task["input_hash"]):
+                print(f"{fname}(): skipping {task['task']} for '{input_pathstrings_mca_list_files[task['file_index']]}' (time window: {task['time_window']}, up to date)")
+                task.update({"returncode" : None, "stdout" : None, "stderr" : None})
+                task_list.append(task)
+                finished.append(task)
+            else:
+                pending[executor.submit(task_function, **task_kwargs)] = task
+            return
+
+        # This function is used to submit the follow-up tasks of a finished task.
+        def submit_follow_up_tasks(task):
+            # the root file is available, therefore the corresponding spectra can be generated
+            if task["task"] == "make_rootfile_list":
+                i = task["file_index"]
+                for time_window in input_time_windows[i]:
+                    submit_task(
+                        task = {"task" : "make_spectrum_list", "file_index" : i, "time_window" : time_window},
+                        task_function = make_spectrum_list,
+                        task_kwargs = {
+                            "input_pathstring_root_file" : input_pathstrings_mca_list_files[i] +".root",
+                            "input_abspath_gemse_root_scripts" : input_abspath_gemse_root_scripts,
+                            "input_time_window" : time_window,
+                            "flag_capture_output" : flag_capture_output},
+                        input_pathstrings = [input_pathstrings_mca_list_files[i] +".root", input_abspath_gemse_root_scripts +"make_spectrum_list"],
+                        input_parameters = {"time_window" : time_window})
+            return
+
+        for i in range(len(input_pathstrings_mca_list_files)):
+            submit_task(
+                task = {"task" : "make_rootfile_list", "file_index" : i, "time_window" : None},
+                task_function = make_rootfile_list,
+                task_kwargs = {
+                    "input_pathstring_mca_list_file" : input_pathstrings_mca_list_files[i],
+                    "input_pathstring_calibration_function" : input_pathstring_calibration_function,
+                    "input_abspath_gemse_root_scripts" : input_abspath_gemse_root_scripts,
+                    "flag_capture_output" : flag_capture_output},
+                input_pathstrings = [input_pathstrings_mca_list_files[i], input_pathstring_calibration_function, input_abspath_gemse_root_scripts +"make_rootfile_list"],
+                input_parameters = {"calibration_function" : os.path.abspath(input_pathstring_calibration_function)})
+        while len(finished) > 0:
+            submit_follow_up_tasks(finished.pop(0))
+        while len(pending) > 0:
+            done, not_done = concurrent.futures.wait(list(pending.keys()), return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                result = future.result()
+                task.update({"returncode" : result.returncode, "stdout" : result.stdout, "stderr" : result.stderr})
+                task_list.append(task)
+                print(f"{fname}(): finished {task['task']} for '{input_pathstrings_mca_list_files[task['file_index']]}' (time window: {task['time_window']}, return code: {task['returncode']})")
+                # failing fast
+                if task["returncode"] != 0:
+                    for f in pending.keys():
+                        f.cancel()
+                    raise Exception(f"{fname}(): {task['task']} failed for '{input_pathstrings_mca_list_files[task['file_index']]}' with return code {task['returncode']}" +(f":\n{task['stdout']}\n{task['stderr']}" if flag_capture_output == True else ""))
+                if task["task"] == "make_rootfile_list":
+                    output_pathstrings = [input_pathstrings_mca_list_files[task["file_index"]] +".root"]
+                else:
+                    output_pathstrings = get_spectrum_pathstrings(input_pathstrings_mca_list_files[task["file_index"]], task["time_window"])
+                record_stage(input_pathstring_stage_manifest, task["stage_key"], task["input_hash"], output_pathstrings)
+                finished.append(task)
+                while len(finished) > 0:
+                    submit_follow_up_tasks(finished.pop(0))
+
+    return task_list
+
+
+# This function is used to convert the mca list files into the final (calibrated and added) spectrum 'final_calibrated_added_spectrum.root' within the folder of the list files, i.e., the input of the bayesian analysis.
+# It returns the pathstring of the final spectrum.
+def gen_final_calibrated_added_spectrum(
     input_pathstrings_mca_list_files, # list of pathstrings referring to the raw mca list files (all within the same folder!)
     input_time_windows, # list of time windows corresponding to the entries of 'pathstrings_mca_list_files'
     input_pathstring_calibration_function, # pathstring referring to the utilized energy calibration function
-    input_pathstring_gemse_analysis_configuration_file, # pathstring referring to the analysis configuration file
     input_abspath_gemse_root_scripts = abspath_gemse_root_scripts, # abspath of Moritz' 'GeMSE_ROOT_scripts' scripts
-    input_abspath_gemse_analysis = abspath_gemse_analysis): # abspath of Moritz' 'GeMSE_analysis' scripts
+    max_workers = 1, # number of 'make_rootfile_list' and 'make_spectrum_list' conversions running simultaneously
+    input_pathstring_stage_manifest = ""): # pathstring referring to the stage manifest (see 'run_stage'), an empty string disables the stage cache
 
-    ### start
     abspath_measurement_folder = input_pathstrings_mca_list_files[0][:input_pathstrings_mca_list_files[0].rfind("/")+1]
-    print(f"all_in_one_gemse_analysis(): abspath_measurement_folder:\n{abspath_measurement_folder}\n")
     sepstring = "#################################################################\n"
 
-    ### mca list file(s) ---> root file(s)
-    print(sepstring +f"all_in_one_gemse_analysis(): mca list file(s) ---> root file(s)\n" +sepstring)
-    for i in range(len(input_pathstrings_mca_list_files)):
-        make_rootfile_list(
-            input_pathstring_mca_list_file = input_pathstrings_mca_list_files[i],
-            input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts,
-            input_pathstring_calibration_function = input_pathstring_calibration_function)
-
-    ### root file(s) ---> (cut) energy spectrum/spectra
-    print(sepstring +f"all_in_one_gemse_analysis(): root file(s) ---> (cut) energy spectrum/spectra\n" +sepstring)
+    ### mca list file(s) ---> root file(s) ---> (cut) energy spectrum/spectra
+    print(sepstring +f"gen_final_calibrated_added_spectrum(): mca list file(s) ---> root file(s) ---> (cut) energy spectrum/spectra\n" +sepstring)
     print(input_pathstrings_mca_list_files)
-    for i in range(len(input_pathstrings_mca_list_files)):
-        print(input_time_windows[i])
-        for j in range(len(input_time_windows[i])):
-            make_spectrum_list(
-                input_pathstring_root_file = input_pathstrings_mca_list_files[i] +".root",
-                input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts,
-                input_time_window = input_time_windows[i][j])
+    print(input_time_windows)
+    run_list_file_conversions(
+        input_pathstrings_mca_list_files = input_pathstrings_mca_list_files,
+        input_time_windows = input_time_windows,
+        input_pathstring_calibration_function = input_pathstring_calibration_function,
+        input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts,
+        max_workers = max_workers,
+        input_pathstring_stage_manifest = input_pathstring_stage_manifest)
 
     ### (cut) energy spectra ---> added energy spectra
-    print(sepstring +f"all_in_one_gemse_analysis(): (cut) energy spectra ---> added energy spectra\n" +sepstring)
+    print(sepstring +f"gen_final_calibrated_added_spectrum(): (cut) energy spectra ---> added energy spectra\n" +sepstring)
     for i in range(len(input_pathstrings_mca_list_files)):
+        pathstring_added_spectrum = input_pathstrings_mca_list_files[i] +".root_spectrum_calibrated_added_spectrum.root"
         # case 1: no 'time_window' was specified (i.e. '[0,0]')
         if input_time_windows[i] == [[0,0]]:
-            uncut_spectrum_candidates = [abspath_measurement_folder +filename for filename in os.listdir(abspath_measurement_folder) if input_pathstrings_mca_list_files[i] +".root_spectrum_calibrated_0-" in abspath_measurement_folder +filename and filename.endswith(".root")] # the string appended when 'make_spectrum_list' is run that is indicating the live time of the spectrum is not known a priori --> accordingly one needs to search for the correct file
+            uncut_spectrum_candidates = get_uncut_spectrum_candidates(input_pathstrings_mca_list_files[i])
+            if len(uncut_spectrum_candidates) > 1:
+                # several candidates (e.g., from an earlier, shorter version of the list file) ---> selecting the one matching the live time of the list file
+                t_live_s = get_list_file_live_time(input_pathstrings_mca_list_files[i])
+                matching_candidates = [c for c in uncut_spectrum_candidates if c.endswith(f"_calibrated_0-{int(round(t_live_s))}s.root")]
+                print(f"gen_final_calibrated_added_spectrum(): {len(uncut_spectrum_candidates)} uncut spectra found for {input_pathstrings_mca_list_files[i]}, live time of the list file: {t_live_s:.1f} s")
+                uncut_spectrum_candidates = matching_candidates if len(matching_candidates) == 1 else uncut_spectrum_candidates
             if len(uncut_spectrum_candidates) == 1:
-                execstring = "cp " +uncut_spectrum_candidates[0] +" " +input_pathstrings_mca_list_files[i] +".root_spectrum_calibrated_added_spectrum.root"
-                print("\n", execstring, "\n")
-                subprocess.call(execstring, shell=True)
+                execstring = ["cp", uncut_spectrum_candidates[0], pathstring_added_spectrum]
+                pathstrings_cut_spectra = uncut_spectrum_candidates
             else:
-                exception_string = f"all_in_one_gemse_analysis(): you specified no time cuts for file {input_pathstrings_mca_list_files[i]} and yet the following candidate files have been found:\n"
+                exception_string = f"gen_final_calibrated_added_spectrum(): you specified no time cuts for file {input_pathstrings_mca_list_files[i]} and yet the following candidate files have been found:\n"
                 exception_string = exception_string +''.join(["\t-->" +entry +"\n" for entry in uncut_spectrum_candidates])
                 raise Exception(exception_string)
         # case 2: exactly one (non default) 'time_window' was specified
         elif len(input_time_windows[i]) == 1:
-            execstring = "cp " +input_pathstrings_mca_list_files[i] +f".root_spectrum_calibrated_{str(int(input_time_windows[i][0][0]))}-{str(int(input_time_windows[i][0][1]))}s.root" +" " +input_pathstrings_mca_list_files[i] +".root_spectrum_calibrated_added_spectrum.root"
-            print("\n", execstring, "\n")
-            subprocess.call(execstring, shell=True)
+            pathstrings_cut_spectra = get_spectrum_pathstrings(input_pathstrings_mca_list_files[i], input_time_windows[i][0])
+            execstring = ["cp", pathstrings_cut_spectra[0], pathstring_added_spectrum]
         # case 3: multiple 'time_windows' are specified
         else:
-            add_spectra(
-                input_pathstrings_cut_spectra = [input_pathstrings_mca_list_files[i] +f".root_spectrum_calibrated_{str(int(itw[0]))}-{str(int(itw[1]))}s.root" for itw in input_time_windows[i]],
+            pathstrings_cut_spectra = [get_spectrum_pathstrings(input_pathstrings_mca_list_files[i], itw)[0] for itw in input_time_windows[i]]
+            execstring = []
+        # copying or adding the spectra (unless up to date)
+        def stage_function(execstring=execstring, pathstrings_cut_spectra=pathstrings_cut_spectra, i=i):
+            if execstring != []:
+                print("\n", conv_args_to_execstring(execstring), "\n")
+                with trace_stage("cp", pathstrings_cut_spectra, [pathstring_added_spectrum]) as record:
+                    return execute_execstring(execstring, False, record)
+            return add_spectra(
+                input_pathstrings_cut_spectra = pathstrings_cut_spectra,
                 input_pathstring_output_spectrum = input_pathstrings_mca_list_files[i] +".root_spectrum_calibrated_added_spectrum",
                 input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts)
+        result = run_stage(
+            stage_function = stage_function,
+            stage_key = f"add_spectra:{os.path.abspath(input_pathstrings_mca_list_files[i])}",
+            input_pathstrings = pathstrings_cut_spectra +[input_abspath_gemse_root_scripts +"add_spectra"],
+            input_parameters = {"time_windows" : input_time_windows[i]},
+            output_pathstrings = [pathstring_added_spectrum],
+            pathstring_stage_manifest = input_pathstring_stage_manifest)
+        if result != None and result.returncode != 0:
+            raise Exception(f"gen_final_calibrated_added_spectrum(): generating '{pathstring_added_spectrum}' failed with return code {result.returncode}")
     # adding all added spectra together to one final spectrum that will be used for the analysis
-    if len(input_pathstrings_mca_list_files) == 1:
-        execstring = "cp " +input_pathstrings_mca_list_files[0] +".root_spectrum_calibrated_added_spectrum.root" +" " +abspath_measurement_folder +"final_calibrated_added_spectrum.root"
-        print("\n", execstring, "\n")
-        subprocess.call(execstring, shell=True)
-    else:
-        add_spectra(
-            input_pathstrings_cut_spectra = [pathstring +".root_spectrum_calibrated_added_spectrum.root" for pathstring in input_pathstrings_mca_list_files],
+    pathstrings_added_spectra = [pathstring +".root_spectrum_calibrated_added_spectrum.root" for pathstring in input_pathstrings_mca_list_files]
+    def stage_function():
+        if len(input_pathstrings_mca_list_files) == 1:
+            execstring = ["cp", pathstrings_added_spectra[0], abspath_measurement_folder +"final_calibrated_added_spectrum.root"]
+            print("\n", conv_args_to_execstring(execstring), "\n")
+            with trace_stage("cp", pathstrings_added_spectra, [abspath_measurement_folder +"final_calibrated_added_spectrum.root"]) as record:
+                return execute_execstring(execstring, False, record)
+        return add_spectra(
+            input_pathstrings_cut_spectra = pathstrings_added_spectra,
             input_pathstring_output_spectrum = abspath_measurement_folder +"final_calibrated_added_spectrum",
             input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts)
+    result = run_stage(
+        stage_function = stage_function,
+        stage_key = "final_spectrum",
+        input_pathstrings = pathstrings_added_spectra +[input_abspath_gemse_root_scripts +"add_spectra"],
+        input_parameters = {},
+        output_pathstrings = [abspath_measurement_folder +"final_calibrated_added_spectrum.root"],
+        pathstring_stage_manifest = input_pathstring_stage_manifest)
+    if result != None and result.returncode != 0:
+        raise Exception(f"gen_final_calibrated_added_spectrum(): generating '{abspath_measurement_folder}final_calibrated_added_spectrum.root' failed with return code {result.returncode}")
+
+    return abspath_measurement_folder +"final_calibrated_added_spectrum.root"
+
+
+# This function is used to merge the '*_activities_summary.txt' files of analyses of different isotopes (of the same sample) into one summary file in the format written by 'GeMSE_analysis'.
+# The analysis parameters are taken from the first summary file, the isotope lines are sorted according to 'input_isotopes' (i.e., the order of the isotopes within the original configuration file).
+def merge_activities_summaries(input_pathstrings_summaries, pathstring_output, input_isotopes):
+    header_lines = []
+    isotope_lines = {}
+    for k, pathstring_summary in enumerate(input_pathstrings_summaries):
+        with open(pathstring_summary, 'r') as summary_file:
+            flag_isotope_results = False
+            for line in summary_file:
+                if flag_isotope_results == True:
+                    if line.strip() != "":
+                        isotope_lines[line.split()[0]] = line if line.endswith("\n") else line +"\n"
+                    continue
+                if k == 0:
+                    header_lines.append(line)
+                if "Isotope" in line and "Activity (Bq)" in line and "Bayes Factor" in line:
+                    flag_isotope_results = True
+    missing_isotopes = [isotope for isotope in input_isotopes if isotope not in isotope_lines]
+    if len(missing_isotopes) != 0:
+        raise Exception(f"merge_activities_summaries(): no results found for {missing_isotopes}")
+    with open(pathstring_output, 'w+') as output_file:
+        output_file.write("".join(header_lines) +"".join([isotope_lines[isotope] for isotope in input_isotopes]))
+    return pathstring_output
+
 
-    ### bayesian analysis
-    print(sepstring +f"all_in_one_gemse_analysis(): bayesian analysis\n" +sepstring)
-    # printing the analysis settings
-    print(f"all_in_one_gemse_analysis(): analysis settings")
-    sample_name = ""
-    results_folder = ""
-    with open(input_pathstring_gemse_analysis_configuration_file) as analysis_settings_file:
-        for line in analysis_settings_file:
-            print("\t", line[:-1])
-            if sample_name == "active":
-                sample_name = line[:-1]
-            if "# sample name" in line:
-                sample_name = "active"
-            if results_folder == "active":
-                results_folder = line[:-1]
-            if "# results folder" in line:
-                results_folder = "active"
-    print("")
-    print(f"all_in_one_gemse_analysis(): results_folder='{results_folder}'\n")
-    print(f"all_in_one_gemse_analysis(): sample_name='{sample_name}'\n")
-    print("")
-    # running the analysis
-    gemse_analysis(
-        input_pathstring_gemse_analysis_configuration_file = input_pathstring_gemse_analysis_configuration_file,
-        input_abspath_gemse_analysis = input_abspath_gemse_analysis)
-
-    ### aftermath
-    # printing the analysis results
-    print(f"all_in_one_gemse_analysis(): analysis results")
-    with open(results_folder +sample_name +"_activities_summary.txt") as analysis_results_file:
-        for line in analysis_results_file:
-            print("\t", line[:-1])
-    print("")
+# This function is used to run the bayesian analysis ('GeMSE_analysis') of the isotopes within an analysis configuration file concurrently.
+# One configuration file per isotope group is written (with the results folder '<results folder>isotopes_<isotopes>/'), the analyses are run in parallel and their summaries are finally merged into '<results folder><sample name>_activities_summary.txt'.
+# The BAT MCMC of the individual isotopes are independent, i.e., the results do not differ from those of a single 'GeMSE_analysis' run.
+# Just as 'gemse_analysis' it returns a 'subprocess.CompletedProcess' (with the concatenated output of all groups), its return code is non-zero if the analysis of any group failed.
+def run_parallel_gemse_analysis(
+    input_pathstring_gemse_analysis_configuration_file, # pathstring referring to the analysis configuration file (see 'gen_analysis_configuration_file')
+    input_isotope_groups = [], # list of isotope lists analyzed together (by default every isotope is analyzed separately)
+    input_abspath_gemse_analysis = abspath_gemse_analysis, # abspath of Moritz' 'GeMSE_analysis' scripts
+    max_workers = 0): # number of simultaneous 'GeMSE_analysis' runs (0 corresponds to 'os.cpu_count()')
+
+    # initial definitions
+    fname = "run_parallel_gemse_analysis"
+    configuration_dict = read_analysis_configuration_file(input_pathstring_gemse_analysis_configuration_file)
+    isotopes = get_analyzed_isotopes(configuration_dict["isotopes to analyze"]) # commented-out isotopes (e.g., "#Mn54") are not analyzed
+    results_folder = configuration_dict["results folder"][0]
+    sample_name = configuration_dict["sample name"][0]
+    isotope_groups = [[isotope] for isotope in isotopes] if input_isotope_groups == [] else input_isotope_groups
+    if sorted(sum(isotope_groups, [])) != sorted(isotopes):
+        raise Exception(f"{fname}(): the isotope groups {isotope_groups} do not correspond to the isotopes {isotopes} of '{input_pathstring_gemse_analysis_configuration_file}'")
+    max_workers = os.cpu_count() if max_workers == 0 else max_workers
+
+    # writing one configuration file per isotope group
+    pathstrings_configuration_files = []
+    pathstrings_summaries = []
+    for isotope_group in isotope_groups:
+        abspath_group_results_folder = results_folder +"isotopes_" +"_".join(isotope_group) +"/"
+        os.makedirs(abspath_group_results_folder, exist_ok=True)
+        group_configuration_dict = {**configuration_dict, "results folder" : [abspath_group_results_folder], "isotopes to analyze" : isotope_group}
+        pathstrings_configuration_files.append(write_analysis_configuration_file(abspath_group_results_folder +"analysis_configuration_file.txt", group_configuration_dict))
+        pathstrings_summaries.append(abspath_group_results_folder +sample_name +"_activities_summary.txt")
+
+    # running the analyses concurrently (the output of every analysis is saved in 'gemse_analysis.log' within its results folder)
+    print(f"{fname}(): analyzing {len(isotope_groups)} isotope groups with {max_workers} workers\n")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda pathstring: gemse_analysis(pathstring, input_abspath_gemse_analysis, flag_capture_output=True), pathstrings_configuration_files))
+    failed_groups = []
+    for isotope_group, pathstring_configuration_file, result in zip(isotope_groups, pathstrings_configuration_files, results):
+        with open(pathstring_configuration_file[:pathstring_configuration_file.rfind("/")+1] +"gemse_analysis.log", "w") as log_file:
+            log_file.write(result.stdout +result.stderr)
+        if result.returncode != 0:
+            failed_groups.append(isotope_group)
+    parallel_result = subprocess.CompletedProcess(
+        args = [get_gemse_analysis_args(pathstring_configuration_file, input_abspath_gemse_analysis) for pathstring_configuration_file in pathstrings_configuration_files],
+        returncode = 0 if len(failed_groups) == 0 else 1,
+        stdout = "".join([result.stdout for result in results]),
+        stderr = "".join([result.stderr for result in results]))
+    if len(failed_groups) != 0:
+        print(f"{fname}(): 'GeMSE_analysis' failed for the isotope groups {failed_groups} (see 'gemse_analysis.log' within '{results_folder}isotopes_*/')\n")
+        return parallel_result
+
+    # merging the summaries
+    pathstring_summary = merge_activities_summaries(pathstrings_summaries, results_folder +sample_name +"_activities_summary.txt", isotopes)
+    print(f"{fname}(): saved '{pathstring_summary}'\n")
+    return parallel_result
+
+
+# This function is meant to summarize the wrapper functions for Moritz' C++ scripts defined above allowing for a all in one GeMSE analysis.
+def all_in_one_gemse_analysis(
+    input_pathstrings_mca_list_files, # list of pathstrings referring to the raw mca list files (all within the same folder!)
+    input_time_windows, # list of time windows corresponding to the entries of 'pathstrings_mca_list_files'
+    input_pathstring_calibration_function, # pathstring referring to the utilized energy calibration function
+    input_pathstring_gemse_analysis_configuration_file, # pathstring referring to the analysis configuration file
+    input_abspath_gemse_root_scripts = abspath_gemse_root_scripts, # abspath of Moritz' 'GeMSE_ROOT_scripts' scripts
+    input_abspath_gemse_analysis = abspath_gemse_analysis, # abspath of Moritz' 'GeMSE_analysis' scripts
+    max_workers = 1, # number of 'make_rootfile_list' and 'make_spectrum_list' conversions running simultaneously (1 corresponds to the former sequential execution)
+    flag_use_stage_cache = True, # flag indicating whether stages whose inputs did not change since their last run are supposed to be skipped (see 'run_stage')
+    flag_parallel_isotopes = False, # flag indicating whether the isotopes are supposed to be analyzed concurrently (see 'run_parallel_gemse_analysis')
+    input_isotope_groups = [], # isotope groups analyzed together if 'flag_parallel_isotopes' is set (by default every isotope is analyzed separately)
+    flag_prescreen_isotopes = False, # flag indicating whether the isotopes without any significant peak (see 'screen_peak_regions') are supposed to be dropped prior to the bayesian analysis
+    prescreen_min_significance = 1.0, # isotopes whose peaks all fall below this significance are dropped if 'flag_prescreen_isotopes' is set
+    flag_trace_stages = False): # flag indicating whether wall time, CPU time, peak RSS and I/O of every stage are supposed to be recorded in '<results folder><sample name>_stage_trace.jsonl' (see 'trace_stage')
+
+    ### start
+    abspath_measurement_folder = input_pathstrings_mca_list_files[0][:input_pathstrings_mca_list_files[0].rfind("/")+1]
+    print(f"all_in_one_gemse_analysis(): abspath_measurement_folder:\n{abspath_measurement_folder}\n")
+    sepstring = "#################################################################\n"
+    pathstring_stage_manifest = abspath_measurement_folder +stage_manifest_filename if flag_use_stage_cache == True else ""
+    configuration_dict = read_analysis_configuration_file(input_pathstring_gemse_analysis_configuration_file)
+    sample_name = configuration_dict["sample name"][0]
+    results_folder = configuration_dict["results folder"][0]
+    if flag_trace_stages == True:
+        pathstring_stage_trace = results_folder +sample_name +"_stage_trace.jsonl"
+        print(f"all_in_one_gemse_analysis(): tracing stages in '{pathstring_stage_trace}'\n")
+        enable_stage_trace(pathstring_stage_trace)
+
+    # the stage trace is disabled even if a stage fails (otherwise every subsequent stage would still be traced)
+    try:
+
+        ### mca list file(s) ---> root file(s) ---> (cut) energy spectra ---> added energy spectrum
+        gen_final_calibrated_added_spectrum(
+            input_pathstrings_mca_list_files = input_pathstrings_mca_list_files,
+            input_time_windows = input_time_windows,
+            input_pathstring_calibration_function = input_pathstring_calibration_function,
+            input_abspath_gemse_root_scripts = input_abspath_gemse_root_scripts,
+            max_workers = max_workers,
+            input_pathstring_stage_manifest = pathstring_stage_manifest)
+
+        ### pre-screening
+        if flag_prescreen_isotopes == True:
+            print(sepstring +f"all_in_one_gemse_analysis(): pre-screening\n" +sepstring)
+            screening = screen_peak_regions(
+                input_pathstring_sample_spectrum = abspath_measurement_folder +"final_calibrated_added_spectrum.root",
+                input_pathstring_background_spectrum = configuration_dict["background spectrum file name"][0],
+                input_abspath_isotope_parameters_folder = configuration_dict["isotope parameters folder"][0],
+                input_isotopes = configuration_dict["isotopes to analyze"])
+            print_peak_region_screening(screening)
+            configuration_dict["isotopes to analyze"] = select_screened_isotopes(screening, configuration_dict["isotopes to analyze"], prescreen_min_significance)
+            print(f"\nall_in_one_gemse_analysis(): analyzing {configuration_dict['isotopes to analyze']}\n")
+            if get_analyzed_isotopes(configuration_dict["isotopes to analyze"]) == []:
+                raise Exception(f"all_in_one_gemse_analysis(): no isotope exceeds the pre-screening significance of {prescreen_min_significance}")
+            input_pathstring_gemse_analysis_configuration_file = write_analysis_configuration_file(abspath_measurement_folder +"prescreened_analysis_configuration_file.txt", configuration_dict)
+
+        ### bayesian analysis
+        print(sepstring +f"all_in_one_gemse_analysis(): bayesian analysis\n" +sepstring)
+        # printing the analysis settings
+        print(f"all_in_one_gemse_analysis(): analysis settings")
+        with open(input_pathstring_gemse_analysis_configuration_file) as analysis_settings_file:
+            for line in analysis_settings_file:
+                print("\t", line[:-1])
+        print("")
+        print(f"all_in_one_gemse_analysis(): results_folder='{results_folder}'\n")
+        print(f"all_in_one_gemse_analysis(): sample_name='{sample_name}'\n")
+        print("")
+        # running the analysis
+        if flag_parallel_isotopes == True:
+            stage_function = lambda: run_parallel_gemse_analysis(
+                input_pathstring_gemse_analysis_configuration_file = input_pathstring_gemse_analysis_configuration_file,
+                input_isotope_groups = input_isotope_groups,
+                input_abspath_gemse_analysis = input_abspath_gemse_analysis)
+        else:
+            stage_function = lambda: gemse_analysis(
+                input_pathstring_gemse_analysis_configuration_file = input_pathstring_gemse_analysis_configuration_file,
+                input_abspath_gemse_analysis = input_abspath_gemse_analysis)
+        result = run_stage(
+            stage_function = stage_function,
+            stage_key = "gemse_analysis",
+            input_pathstrings = get_gemse_analysis_input_pathstrings(input_pathstring_gemse_analysis_configuration_file) +[abspath_measurement_folder +"final_calibrated_added_spectrum.root", input_abspath_gemse_analysis +"GeMSE_analysis"],
+            input_parameters = {"isotope_groups" : input_isotope_groups} if flag_parallel_isotopes == True else {},
+            output_pathstrings = [results_folder +sample_name +"_activities_summary.txt"],
+            pathstring_stage_manifest = pathstring_stage_manifest)
+        if result != None and result.returncode != 0:
+            raise Exception(f"all_in_one_gemse_analysis(): the bayesian analysis failed with return code {result.returncode}")
+
+        ### aftermath
+        # printing the analysis results
+        print(f"all_in_one_gemse_analysis(): analysis results")
+        with open(results_folder +sample_name +"_activities_summary.txt") as analysis_results_file:
+            for line in analysis_results_file:
+                print("\t", line[:-1])
+        print("")
+
+    finally:
+        # printing the stage trace
+        if flag_trace_stages == True:
+            print(f"all_in_one_gemse_analysis(): stage trace")
+            print_stage_trace_summary(disable_stage_trace())
+            print("")
 
     ### end
     return
@@ -496,126 +1739,762 @@ def all_in_one_gemse_analysis(
 
     
 
+###############################################################
+### GeMSE analysis infrastructure: measurement campaigns
+###############################################################
+
+
+# A measurement campaign comprises the analyses of multiple samples, it is defined by a JSON manifest file of the following format:
+# {
+#     "abspath_campaign_folder" : "/path/to/campaign/", # every sample is analyzed within its own working folder '<abspath_campaign_folder><sample_name>/'
+#     "defaults" : { # settings utilized for all samples (unless overwritten by the sample)
+#         "pathstring_calibration_function" : "/path/to/calibration_function.root",
+#         "abspath_gemse_root_scripts" : "/path/to/GeMSE_ROOT_scripts/",
+#         "abspath_gemse_analysis" : "/path/to/GeMSE_analysis/",
+#         "max_workers" : 1, # see 'gen_final_calibrated_added_spectrum'
+#         "flag_parallel_isotopes" : false, # if set the isotopes (or the 'isotope_groups') are analyzed concurrently with 'resources["analysis"]["cpus"]' workers (see 'run_parallel_gemse_analysis')
+#         "configuration" : {"abspath_isotope_parameters_folder" : "...", "abspath_background_spectrum_root_file" : "...", "abspath_efficiency_root_file" : "...", "abspath_resolution_root_file" : "...", "accuracy_of_mcmc" : "medium"}, # keywords passed on to 'gen_analysis_configuration_file'
+#         "resources" : {"spectra" : {"cpus" : 1, "memory_gb" : 2}, "analysis" : {"cpus" : 1, "memory_gb" : 1}}}, # estimated resources of the campaign stages
+#     "samples" : [
+#         {"sample_name" : "ptfe_02", "list_files" : ["/path/to/list_file_ch000.txt"], "time_windows" : [[[0,0]]], "sample_mass_kg" : 1.2, "configuration" : {...}},
+#         ...]
+# }
+# Every sample is expanded into the stages listed in 'campaign_stages' which are stored as jobs in a SQLite database ('<abspath_campaign_folder>campaign.sqlite').
+# An interrupted campaign (e.g., due to a kernel crash) is therefore resumed by simply calling 'run_campaign' again.
+
+
+# campaign stages (in order of execution) and their default resources
+campaign_stages = ["spectra", "analysis", "aftermath"]
+campaign_stage_default_resources = {
+    "spectra" : {"cpus" : 1, "memory_gb" : 2},
+    "analysis" : {"cpus" : 1, "memory_gb" : 1},
+    "aftermath" : {"cpus" : 1, "memory_gb" : 1}}
+campaign_database_filename = "campaign.sqlite"
+
+
+# This function is used to load a campaign manifest and to merge the default settings into every sample.
+# It returns the campaign folder and the list of (merged) sample dictionaries.
+def load_campaign_manifest(pathstring_campaign_manifest):
+    with open(pathstring_campaign_manifest, "r") as manifest_file:
+        manifest = json.load(manifest_file)
+    abspath_campaign_folder = os.path.abspath(manifest["abspath_campaign_folder"]) +"/"
+    defaults = manifest.get("defaults", {})
+    sample_list = []
+    for sample in manifest["samples"]:
+        sample_dict = {**defaults, **sample}
+        sample_dict["configuration"] = {**defaults.get("configuration", {}), **sample.get("configuration", {})}
+        sample_dict["resources"] = {stage : {**campaign_stage_default_resources[stage], **defaults.get("resources", {}).get(stage, {}), **sample.get("resources", {}).get(stage, {})} for stage in campaign_stages}
+        sample_dict["abspath_working_folder"] = abspath_campaign_folder +sample_dict["sample_name"] +"/"
+        if len(sample_dict["list_files"]) != len(sample_dict["time_windows"]):
+            raise Exception(f"load_campaign_manifest(): sample '{sample_dict['sample_name']}' has {len(sample_dict['list_files'])} list files but {len(sample_dict['time_windows'])} time windows")
+        sample_list.append(sample_dict)
+    sample_names = [sample_dict["sample_name"] for sample_dict in sample_list]
+    if len(set(sample_names)) != len(sample_names):
+        raise Exception(f"load_campaign_manifest(): the sample names need to be unique: {sample_names}")
+    return abspath_campaign_folder, sample_list
+
+
+# This function is used to open (and if required create) the job database of a campaign.
+def open_campaign_database(pathstring_campaign_database):
+    connection = sqlite3.connect(pathstring_campaign_database)
+    connection.row_factory = sqlite3.Row
+    connection.execute("""CREATE TABLE IF NOT EXISTS jobs (
+        job_id INTEGER PRIMARY KEY,
+        sample_name TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        state TEXT NOT NULL,
+        depends_on INTEGER,
+        sample_json TEXT NOT NULL,
+        cpus REAL NOT NULL,
+        memory_gb REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        started TEXT,
+        finished TEXT,
+        error TEXT,
+        pathstring_log TEXT,
+        UNIQUE(sample_name, stage))""")
+    connection.commit()
+    return connection
+
+
+# This function is used to expand the samples of a campaign manifest into jobs (one per sample and stage).
+# Already existing jobs are kept (i.e., their state is preserved) but their settings are updated, jobs that were running when the campaign was interrupted are reset to 'pending'.
+def init_campaign(pathstring_campaign_manifest):
+    abspath_campaign_folder, sample_list = load_campaign_manifest(pathstring_campaign_manifest)
+    os.makedirs(abspath_campaign_folder, exist_ok=True)
+    pathstring_campaign_database = abspath_campaign_folder +campaign_database_filename
+    connection = open_campaign_database(pathstring_campaign_database)
+    with connection:
+        connection.execute("UPDATE jobs SET state='pending' WHERE state='running'")
+        for sample_dict in sample_list:
+            job_id_previous = None
+            for stage in campaign_stages:
+                connection.execute(
+                    "INSERT OR IGNORE INTO jobs (sample_name, stage, state, depends_on, sample_json, cpus, memory_gb, pathstring_log) VALUES (?, ?, 'pending', ?, ?, ?, ?, ?)",
+                    (sample_dict["sample_name"], stage, job_id_previous, json.dumps(sample_dict), sample_dict["resources"][stage]["cpus"], sample_dict["resources"][stage]["memory_gb"], sample_dict["abspath_working_folder"] +f"campaign_{stage}.log"))
+                connection.execute(
+                    "UPDATE jobs SET depends_on=?, sample_json=?, cpus=?, memory_gb=? WHERE sample_name=? AND stage=?",
+                    (job_id_previous, json.dumps(sample_dict), sample_dict["resources"][stage]["cpus"], sample_dict["resources"][stage]["memory_gb"], sample_dict["sample_name"], stage))
+                job_id_previous = connection.execute("SELECT job_id FROM jobs WHERE sample_name=? AND stage=?", (sample_dict["sample_name"], stage)).fetchone()["job_id"]
+    connection.close()
+    return pathstring_campaign_database
+
+
+# This function is used to set up the working folder of a sample, i.e., the mca list files are symlinked into it.
+# Hence all files generated by Moritz' executables (which are saved next to their input files) and the 'final_calibrated_added_spectrum.root' file are located within the working folder and concurrently analyzed samples never collide.
+# It returns the pathstrings of the symlinked list files.
+def prepare_campaign_working_folder(sample_dict):
+    abspath_working_folder = sample_dict["abspath_working_folder"]
+    os.makedirs(abspath_working_folder, exist_ok=True)
+    pathstrings_linked = []
+    for pathstring in sample_dict["list_files"]:
+        pathstring_linked = abspath_working_folder +os.path.basename(pathstring)
+        if os.path.lexists(pathstring_linked):
+            if os.path.realpath(pathstring_linked) != os.path.realpath(pathstring):
+                raise Exception(f"prepare_campaign_working_folder(): '{pathstring_linked}' already exists and does not refer to '{pathstring}'")
+        else:
+            os.symlink(os.path.abspath(pathstring), pathstring_linked)
+        pathstrings_linked.append(pathstring_linked)
+    return pathstrings_linked
+
+
+# This function is used to generate the analysis configuration file of a sample within its working folder.
+def gen_campaign_configuration_file(sample_dict):
+    return gen_analysis_configuration_file(**{
+        "pathstring_output" : sample_dict["abspath_working_folder"] +sample_dict["sample_name"] +"_analysis_configuration.txt",
+        "sample_name" : sample_dict["sample_name"],
+        "abspath_sample_spectrum_root_file" : sample_dict["abspath_working_folder"] +"final_calibrated_added_spectrum.root",
+        "abspath_results_folder" : sample_dict["abspath_working_folder"],
+        **sample_dict["configuration"]})
+
+
+# These functions correspond to the campaign stages (see 'campaign_stages'), they are executed within the worker processes of 'run_campaign'.
+def run_campaign_stage_spectra(sample_dict):
+    pathstrings_linked = prepare_campaign_working_folder(sample_dict)
+    gen_final_calibrated_added_spectrum(
+        input_pathstrings_mca_list_files = pathstrings_linked,
+        input_time_windows = sample_dict["time_windows"],
+        input_pathstring_calibration_function = sample_dict["pathstring_calibration_function"],
+        input_abspath_gemse_root_scripts = sample_dict.get("abspath_gemse_root_scripts", abspath_gemse_root_scripts),
+        max_workers = sample_dict.get("max_workers", 1),
+        input_pathstring_stage_manifest = sample_dict["abspath_working_folder"] +stage_manifest_filename)
+    return
+
+def run_campaign_stage_analysis(sample_dict):
+    pathstring_configuration_file = gen_campaign_configuration_file(sample_dict)
+    input_abspath_gemse_analysis = sample_dict.get("abspath_gemse_analysis", abspath_gemse_analysis)
+    def stage_function():
+        if sample_dict.get("flag_parallel_isotopes", False) == True:
+            result = run_parallel_gemse_analysis(
+                input_pathstring_gemse_analysis_configuration_file = pathstring_configuration_file,
+                input_isotope_groups = sample_dict.get("isotope_groups", []),
+                input_abspath_gemse_analysis = input_abspath_gemse_analysis,
+                max_workers = int(sample_dict["resources"]["analysis"]["cpus"]))
+        else:
+            result = gemse_analysis(
+                input_pathstring_gemse_analysis_configuration_file = pathstring_configuration_file,
+                input_abspath_gemse_analysis = input_abspath_gemse_analysis)
+        if result.returncode != 0:
+            raise Exception(f"run_campaign_stage_analysis(): 'GeMSE_analysis' failed with return code {result.returncode}")
+        return result
+    run_stage(
+        stage_function = stage_function,
+        stage_key = "gemse_analysis",
+        input_pathstrings = get_gemse_analysis_input_pathstrings(pathstring_configuration_file) +[sample_dict["abspath_working_folder"] +"final_calibrated_added_spectrum.root", input_abspath_gemse_analysis +"GeMSE_analysis"],
+        input_parameters = {"isotope_groups" : sample_dict.get("isotope_groups", [])} if sample_dict.get("flag_parallel_isotopes", False) == True else {},
+        output_pathstrings = [sample_dict["abspath_working_folder"] +sample_dict["sample_name"] +"_activities_summary.txt"],
+        pathstring_stage_manifest = sample_dict["abspath_working_folder"] +stage_manifest_filename)
+    return
+
+def run_campaign_stage_aftermath(sample_dict):
+    abspath_working_folder = sample_dict["abspath_working_folder"]
+    pathstring_summary = abspath_working_folder +sample_dict["sample_name"] +"_activities_summary.txt"
+    gen_analysis_results_wiki_syntax_file(pathstring_summary, abspath_working_folder +sample_dict["sample_name"] +"_activities_summary_wiki_syntax.txt")
+    # the elaborate aftermath (json output and commented spectrum plots) is only available if 'gemse_analysis_aftermath' is defined (see below)
+    if "gemse_analysis_aftermath" in globals():
+        gemse_analysis_aftermath(
+            input_filenames = [os.path.basename(pathstring) for pathstring in sample_dict["list_files"]],
+            input_time_windows = sample_dict["time_windows"],
+            input_sample_mass = sample_dict["sample_mass_kg"],
+            input_pathstring_calibration_function = sample_dict["pathstring_calibration_function"],
+            input_pathstring_gemse_analysis_summary = pathstring_summary,
+            input_pathstring_added_root_spectrum = abspath_working_folder +"final_calibrated_added_spectrum.root",
+            input_pathstring_wiki_syntax_output = abspath_working_folder +sample_dict["sample_name"] +"_aftermath_wiki_syntax.txt",
+            input_pathstring_json_output = abspath_working_folder +sample_dict["sample_name"] +"_analysis_results.json",
+            input_pathstrings_spectrum_plot = [abspath_working_folder +sample_dict["sample_name"] +"_spectrum" +ext for ext in [".png", ".pdf"]])
+    return
+
+campaign_stage_functions = {
+    "spectra" : run_campaign_stage_spectra,
+    "analysis" : run_campaign_stage_analysis,
+    "aftermath" : run_campaign_stage_aftermath}
+
+
+# This function is used to execute a campaign job within a worker process.
+# The stdout and stderr of the worker process (including the output of Moritz' executables) are redirected into the log file of the job.
+def execute_campaign_job(stage, sample_dict, pathstring_log):
+    os.makedirs(sample_dict["abspath_working_folder"], exist_ok=True)
+    sys_stdout_fd, sys_stderr_fd = os.dup(1), os.dup(2)
+    with open(pathstring_log, "a") as log_file:
+        log_file.write(f"\n# {datetime.datetime.now()}: starting stage '{stage}' of sample '{sample_dict['sample_name']}'\n")
+        log_file.flush()
+        os.dup2(log_file.fileno(), 1)
+        os.dup2(log_file.fileno(), 2)
+        try:
+            campaign_stage_functions[stage](sample_dict)
+        finally:
+            print("", flush=True)
+            os.dup2(sys_stdout_fd, 1)
+            os.dup2(sys_stderr_fd, 2)
+            os.close(sys_stdout_fd)
+            os.close(sys_stderr_fd)
+    return
+
+
+# This function is used to retrieve the jobs of a campaign (as a list of dictionaries).
+def get_campaign_jobs(pathstring_campaign_database):
+    connection = open_campaign_database(pathstring_campaign_database)
+    jobs = [dict(row) for row in connection.execute("SELECT * FROM jobs ORDER BY job_id")]
+    connection.close()
+    return jobs
+
+
+# This function is used to print the state of all jobs of a campaign.
+def print_campaign_status(pathstring_campaign_database):
+    jobs = get_campaign_jobs(pathstring_campaign_database)
+    print(f"{'sample':<30} {'stage':<10} {'state':<10} {'attempts':>8}  {'finished':<26} error")
+    for job in jobs:
+        print(f"{job['sample_name']:<30} {job['stage']:<10} {job['state']:<10} {job['attempts']:>8}  {str(job['finished'] or ''):<26} {(job['error'] or '').splitlines()[-1] if job['error'] else ''}")
+    states = [job["state"] for job in jobs]
+    print(f"{len(jobs)} jobs: " +", ".join([f"{states.count(state)} {state}" for state in ["done", "running", "pending", "failed"]]))
+    return
+
+
+# This function is used to run (or resume) a measurement campaign defined by 'pathstring_campaign_manifest' (see above).
+# The jobs are executed by a pool of worker processes, a job is only started if its preceding stage is done and if its estimated resources fit into the remaining CPU and memory budget.
+# Failed jobs (and the subsequent stages of the same sample) are skipped, the remaining samples are analyzed nevertheless. Failed jobs are retried on the next call if 'flag_retry_failed' is set.
+# It returns the list of job dictionaries (see 'get_campaign_jobs').
+def run_campaign(
+    pathstring_campaign_manifest, # pathstring referring to the campaign manifest
+    max_cpus = 0, # CPU budget (0 corresponds to 'os.cpu_count()')
+    max_memory_gb = 0, # memory budget (0 corresponds to 80% of the physical memory)
+    flag_retry_failed = False): # flag indicating whether previously failed jobs are supposed to be retried
+
+    # initial definitions
+    fname = "run_campaign"
+    max_cpus = os.cpu_count() if max_cpus == 0 else max_cpus
+    max_memory_gb = 0.8*os.sysconf("SC_PAGE_SIZE")*os.sysconf("SC_PHYS_PAGES")/2**30 if max_memory_gb == 0 else max_memory_gb
+    pathstring_campaign_database = init_campaign(pathstring_campaign_manifest)
+    connection = open_campaign_database(pathstring_campaign_database)
+    if flag_retry_failed == True:
+        with connection:
+            connection.execute("UPDATE jobs SET state='pending', error=NULL WHERE state='failed'")
+    print(f"{fname}(): running campaign '{pathstring_campaign_database}' with {max_cpus} CPUs and {max_memory_gb:.1f} GB")
+
+    # scheduling the jobs
+    running = {} # future ---> job
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, int(max_cpus))) as executor:
+        try:
+            while True:
+                # submitting all ready jobs that fit into the remaining budget
+                cpus_used = sum([job["cpus"] for job in running.values()])
+                memory_gb_used = sum([job["memory_gb"] for job in running.values()])
+                ready_jobs = connection.execute("""SELECT j.* FROM jobs j LEFT JOIN jobs d ON j.depends_on = d.job_id
+                    WHERE j.state = 'pending' AND (j.depends_on IS NULL OR d.state = 'done') ORDER BY j.job_id""").fetchall()
+                for job in [dict(row) for row in ready_jobs]:
+                    # a job exceeding the entire budget is only started if nothing else is running
+                    if len(running) > 0 and (cpus_used +job["cpus"] > max_cpus or memory_gb_used +job["memory_gb"] > max_memory_gb):
+                        continue
+                    with connection:
+                        connection.execute("UPDATE jobs SET state='running', attempts=attempts+1, started=?, finished=NULL, error=NULL WHERE job_id=?", (datetime.datetime.now().isoformat(), job["job_id"]))
+                    print(f"{fname}(): starting '{job['stage']}' of '{job['sample_name']}' (log: '{job['pathstring_log']}')")
+                    running[executor.submit(execute_campaign_job, job["stage"], json.loads(job["sample_json"]), job["pathstring_log"])] = job
+                    cpus_used += job["cpus"]
+                    memory_gb_used += job["memory_gb"]
+                if len(running) == 0:
+                    break
+                # waiting for (at least) one job to finish
+                done, not_done = concurrent.futures.wait(list(running.keys()), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    error = None if future.exception() == None else f"{type(future.exception()).__name__}: {future.exception()}"
+                    with connection:
+                        connection.execute("UPDATE jobs SET state=?, finished=?, error=? WHERE job_id=?", ("done" if error == None else "failed", datetime.datetime.now().isoformat(), error, job["job_id"]))
+                    print(f"{fname}(): '{job['stage']}' of '{job['sample_name']}' " +("finished" if error == None else f"failed ({error})"))
+        finally:
+            # jobs interrupted here remain 'running' within the database and are reset to 'pending' by the next 'init_campaign' call
+            connection.close()
+
+    # end
+    print_campaign_status(pathstring_campaign_database)
+    return get_campaign_jobs(pathstring_campaign_database)
+
+
+
+
+
 ###############################################################
 ### software-based veto investigation
 ###############################################################
 
 
+# These are the bits of the 'status' field of 'timestamp_data_mc2_dtype' (an event with status 0 is valid).
+status_vetoed = 1 # event was vetoed by the veto channel
+status_cut_extra = 2 # event was cut due to the 'extra' flag (8 < extra < 16)
+status_cut_pulse_height_overflow = 4 # event was cut due to pulse_height_adc > 17000
+status_cut_pulse_height_negative = 8 # event was cut due to pulse_height_adc < 0 (e.g., the -32768 marker events)
+status_cut = status_cut_extra | status_cut_pulse_height_overflow | status_cut_pulse_height_negative # any cut (bits 16 to 128 are still available for further cut categories)
+
+
 # This is the dtype used for raw data extracted from MC2Analyzer.
 timestamp_data_mc2_dtype = np.dtype([
     ("timestamp_10ns", np.uint64), # timestamp in 10ns
     ("pulse_height_adc", np.int64), # max adc channel is ~16000, np.int16 ranges from -32768 to 32767
     ("extra", np.int32), # 
-    ("validity", np.unicode_, 16), # 
+    ("status", np.uint8), # bitfield, see 'status_*' definitions above
 ])
 
 
+# This is the former dtype storing the event status as a string label ("valid", "cut", "vetoed" or "cut_and_vetoed").
+# It requires 64 bytes per event for the 'validity' field alone and is only kept for older notebooks (see 'conv_timestamp_data_to_legacy_dtype').
+timestamp_data_mc2_legacy_dtype = np.dtype([
+    ("timestamp_10ns", np.uint64), # timestamp in 10ns
+    ("pulse_height_adc", np.int64), # max adc channel is ~16000, np.int16 ranges from -32768 to 32767
+    ("extra", np.int32), # 
+    ("validity", np.str_, 16), # 
+])
+
+
+# This function is used to convert a 'status' bitfield array into the former string labels ("valid", "cut", "vetoed" or "cut_and_vetoed").
+def conv_status_to_validity_labels(status):
+    status = np.asarray(status)
+    labels = np.array(["valid", "cut", "vetoed", "cut_and_vetoed"], np.str_)
+    return labels[(status & status_cut != 0).astype(np.int8) +2*(status & status_vetoed != 0).astype(np.int8)]
+
+
+# This function is used to convert an array of the former string labels into a 'status' bitfield array.
+# Since the labels do not specify the cut category, "cut" is mapped onto all cut bits.
+def conv_validity_labels_to_status(validity):
+    validity = np.asarray(validity)
+    status = np.zeros(validity.shape, np.uint8)
+    status[(validity=="cut") | (validity=="cut_and_vetoed")] |= status_cut
+    status[(validity=="vetoed") | (validity=="cut_and_vetoed")] |= status_vetoed
+    return status
+
+
+# This function is used to convert a structured array of dtype 'timestamp_data_mc2_dtype' into the former 'timestamp_data_mc2_legacy_dtype' (and vice versa).
+def conv_timestamp_data_to_legacy_dtype(timestamp_data):
+    legacy_data = np.zeros(len(timestamp_data), timestamp_data_mc2_legacy_dtype)
+    for key in ["timestamp_10ns", "pulse_height_adc", "extra"]:
+        legacy_data[key] = timestamp_data[key]
+    legacy_data["validity"] = conv_status_to_validity_labels(timestamp_data["status"])
+    return legacy_data
+def conv_legacy_dtype_to_timestamp_data(legacy_data):
+    timestamp_data = np.zeros(len(legacy_data), timestamp_data_mc2_dtype)
+    for key in ["timestamp_10ns", "pulse_height_adc", "extra"]:
+        timestamp_data[key] = legacy_data[key]
+    timestamp_data["status"] = conv_validity_labels_to_status(legacy_data["validity"])
+    return timestamp_data
+
+
+# number of bytes read from a list file at once (the body of the list file is parsed in chunks of this size)
+list_file_chunk_bytes = 2**24
+
+
+# This function is used to read the 'HEADERn:<value>' block at the beginning of a list file generated by the MCA.
+# The input file has to be opened in binary mode, after the function call the file position is set to the first line of the list file body.
+def read_list_file_header(input_file):
+    header_list = []
+    while True:
+        pos = input_file.tell()
+        line = input_file.readline()
+        if not line.startswith(b"HEADER"):
+            input_file.seek(pos)
+            break
+        header_list.append(int(line.split(b":")[1]))
+    return header_list
+
+
+# This function is used to check whether every line of a chunk of the list file body consists of exactly 'n_fields' whitespace-separated fields (without splitting the chunk into Python objects).
+# Since the field starts are sorted, it suffices to check that their total number matches and that the first and the last field of every group of 'n_fields' fields lie between the newlines enclosing the corresponding line.
+def check_line_field_counts(chunk, ctr_lines, n_fields=3):
+    buffer = np.frombuffer(chunk, np.uint8)
+    if ctr_lines == 0:
+        return len(buffer) == 0
+    mask_whitespace = buffer <= ord(" ") # space, tab, carriage return and newline (as well as further control characters)
+    field_starts = np.flatnonzero(mask_whitespace[:-1] > mask_whitespace[1:]) +1
+    if mask_whitespace[0] == False:
+        field_starts = np.concatenate([[0], field_starts])
+    if len(field_starts) != n_fields*ctr_lines:
+        return False
+    newlines = np.flatnonzero(buffer == ord("\n"))
+    line_begins = np.concatenate([[-1], newlines])[:ctr_lines] # position of the newline preceding every line
+    line_ends = np.concatenate([newlines, [len(buffer)]])[:ctr_lines] # position of the newline terminating every line
+    field_starts = field_starts.reshape(ctr_lines, n_fields)
+    return bool(np.all(field_starts[:,0] > line_begins) and np.all(field_starts[:,-1] < line_ends))
+
+
+# This function is used to parse a chunk of the list file body (i.e., a bytes object consisting of complete lines) into an (n,3) int64 array.
+# The fast path parses the whole chunk at once via 'np.fromstring' and is only accepted if every line consists of exactly three fields (see 'check_line_field_counts') which have all been parsed.
+# Otherwise (i.e., the chunk contains malformed lines) the chunk is parsed line by line to identify the bad lines.
+# The returned 'bad_line_indices' are given relative to the first line of the chunk.
+def parse_list_file_chunk(chunk):
+    ctr_lines = chunk.count(b"\n") +(0 if chunk.endswith(b"\n") or len(chunk)==0 else 1)
+    try:
+        with warnings.catch_warnings():
+            # 'np.fromstring' warns if it could not parse the chunk to its end (future NumPy versions raise a ValueError instead), e.g., since it stopped within a malformed token such as '6.9' or '0x10'
+            # the warning is turned into an error since the values parsed so far may nevertheless add up to '3*ctr_lines'
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(chunk, dtype=np.int64, sep=" ") if ctr_lines > 0 else np.zeros(0, np.int64)
+    except (ValueError, DeprecationWarning):
+        values = np.zeros(0, np.int64)
+    if values.size == 3*ctr_lines and check_line_field_counts(chunk, ctr_lines):
+        return values.reshape(-1,3), []
+    # slow path: a line is considered valid if its first three entries can be interpreted as integers (just as before)
+    values_list = []
+    bad_line_indices = []
+    for i, line in enumerate(chunk.splitlines()):
+        line_list = line.split()
+        try:
+            values_list.append((int(line_list[0]), int(line_list[1]), int(line_list[2])))
+        except (IndexError, ValueError):
+            bad_line_indices.append(i)
+    return np.array(values_list, np.int64).reshape(-1,3), bad_line_indices
+
+
+# This generator is used to read the body of a list file (opened in binary mode and positioned after the header) in chunks of complete lines.
+# It yields tuples of the chunk (bytes) and the index of the first line of the chunk within the list file.
+def iter_list_file_line_chunks(input_file, input_line_offset=0, input_chunk_bytes=list_file_chunk_bytes):
+    line_offset = input_line_offset
+    remainder = b""
+    while True:
+        chunk = input_file.read(input_chunk_bytes)
+        if chunk == b"":
+            chunk, remainder = remainder, b""
+        else:
+            chunk = remainder +chunk
+            cut = chunk.rfind(b"\n") +1
+            chunk, remainder = chunk[:cut], chunk[cut:]
+            if chunk == b"":
+                continue
+        if chunk == b"":
+            break
+        yield chunk, line_offset
+        line_offset += chunk.count(b"\n") +(0 if chunk.endswith(b"\n") else 1)
+
+
+# list file cache: parsed list files are stored as binary sidecar files (.npy + .json) within this folder
+abspath_list_file_cache = os.path.expanduser("~") +"/.cache/gemseana/list_file_cache/"
+list_file_cache_max_bytes = 20*2**30 # if the cache folder exceeds this size the least recently used sidecar files are deleted
+list_file_cache_hash_bytes = 2**20 # number of bytes at both the beginning and the end of the list file that are hashed to detect content changes
+
+
+# This function is used to determine the fingerprint of a list file which is used to validate the corresponding cache sidecar files.
+# Hashing the entire multi-GB file would take about as long as parsing it, therefore only the first and last 'list_file_cache_hash_bytes' bytes are hashed (together with file size and mtime).
+def get_list_file_fingerprint(pathstring_data):
+    stat = os.stat(pathstring_data)
+    h = hashlib.sha1()
+    with open(pathstring_data, "rb") as input_file:
+        h.update(input_file.read(list_file_cache_hash_bytes))
+        input_file.seek(max(0, stat.st_size -list_file_cache_hash_bytes))
+        h.update(input_file.read(list_file_cache_hash_bytes))
+    return {
+        "size_bytes" : stat.st_size,
+        "mtime_ns" : stat.st_mtime_ns,
+        "content_hash" : h.hexdigest()}
+
+
+# This function is used to retrieve the pathstrings of the cache sidecar files (.npy array file and .json metadata file) corresponding to a list file.
+def get_list_file_cache_pathstrings(pathstring_data, input_abspath_cache=abspath_list_file_cache):
+    abspath_data = os.path.abspath(pathstring_data)
+    basename = os.path.basename(abspath_data) +"__" +hashlib.sha1(abspath_data.encode()).hexdigest()[:12]
+    return os.path.join(input_abspath_cache, basename +".npy"), os.path.join(input_abspath_cache, basename +".json")
+
+
+# This function is used to delete the least recently used sidecar files from the cache folder until its total size is below 'input_max_bytes'.
+def evict_list_file_cache(input_abspath_cache=abspath_list_file_cache, input_max_bytes=list_file_cache_max_bytes):
+    if not os.path.isdir(input_abspath_cache):
+        return
+    sidecar_list = []
+    for filename in os.listdir(input_abspath_cache):
+        if filename.endswith(".json"):
+            pathstring_json = os.path.join(input_abspath_cache, filename)
+            pathstring_npy = pathstring_json[:-5] +".npy"
+            size = os.path.getsize(pathstring_json) +(os.path.getsize(pathstring_npy) if os.path.isfile(pathstring_npy) else 0)
+            sidecar_list.append((os.path.getmtime(pathstring_json), size, pathstring_json, pathstring_npy))
+    total_bytes = sum([s[1] for s in sidecar_list])
+    for mtime, size, pathstring_json, pathstring_npy in sorted(sidecar_list):
+        if total_bytes <= input_max_bytes:
+            break
+        for pathstring in [pathstring_json, pathstring_npy]:
+            if os.path.isfile(pathstring):
+                os.remove(pathstring)
+        total_bytes -= size
+        print(f"evict_list_file_cache(): deleted '{pathstring_npy}'")
+    return
+
+
+# This function is used to load a parsed list file from the cache folder.
+# The array is memory-mapped copy-on-write (i.e., not loaded into RAM and writable just as a parsed array, but modifications are never written back to the sidecar). If there is no valid sidecar file 'None' is returned.
+def load_list_file_from_cache(pathstring_data, input_abspath_cache=abspath_list_file_cache):
+    pathstring_npy, pathstring_json = get_list_file_cache_pathstrings(pathstring_data, input_abspath_cache)
+    if not (os.path.isfile(pathstring_npy) and os.path.isfile(pathstring_json)):
+        return None
+    with open(pathstring_json, "r") as json_input_file:
+        cache_metadata = json.load(json_input_file)
+    if cache_metadata["fingerprint"] != get_list_file_fingerprint(pathstring_data):
+        return None
+    timestamp_data = np.load(pathstring_npy, mmap_mode="c")
+    if timestamp_data.dtype != timestamp_data_mc2_dtype: # sidecar written with a former dtype
+        return None
+    os.utime(pathstring_json) # marking the sidecar as recently used
+    return timestamp_data, cache_metadata["header_list"], cache_metadata["bad_line_indices"]
+
+
+# This function is used to save a parsed list file to the cache folder (and to subsequently evict old sidecar files if the cache has become too large).
+def save_list_file_to_cache(pathstring_data, timestamp_data, header_list, bad_line_indices, input_abspath_cache=abspath_list_file_cache, input_max_bytes=list_file_cache_max_bytes):
+    os.makedirs(input_abspath_cache, exist_ok=True)
+    pathstring_npy, pathstring_json = get_list_file_cache_pathstrings(pathstring_data, input_abspath_cache)
+    # writing to temporary files first such that an interrupted write never leaves a seemingly valid sidecar
+    with open(pathstring_npy +".tmp", "wb") as npy_output_file:
+        np.save(npy_output_file, timestamp_data)
+    with open(pathstring_json +".tmp", "w") as json_output_file:
+        json.dump({
+            "pathstring_data" : os.path.abspath(pathstring_data),
+            "fingerprint" : get_list_file_fingerprint(pathstring_data),
+            "header_list" : header_list,
+            "bad_line_indices" : bad_line_indices}, json_output_file, indent=4)
+    os.replace(pathstring_npy +".tmp", pathstring_npy)
+    os.replace(pathstring_json +".tmp", pathstring_json)
+    print(f"save_list_file_to_cache(): saved '{pathstring_npy}'")
+    evict_list_file_cache(input_abspath_cache, input_max_bytes)
+    return pathstring_npy
+
+
 # This function is used to load the list file generated by the MCA.
-def get_timestamp_data_as_ndarray(pathstring_data = ""):
-    timestamp_data_tuplelist = []
+# The body of the list file is read in chunks of 'list_file_chunk_bytes' bytes which are parsed vectorized and written into a preallocated structured array.
+# Malformed lines are skipped and reported (line indices refer to the list file, starting with 0 for the first line).
+# If 'flag_use_cache' is set the parsed array is stored as a binary sidecar file within 'input_abspath_cache' and on subsequent calls memory-mapped (copy-on-write) instead of parsed again.
+@traced_stage
+def get_timestamp_data_as_ndarray(
+    pathstring_data = "",
+    input_chunk_bytes = list_file_chunk_bytes, # number of bytes parsed at once
+    flag_return_header_and_bad_lines = False, # flag indicating whether the header list and the bad line indices are supposed to be returned as well
+    flag_use_cache = False, # flag indicating whether the binary sidecar cache is supposed to be used
+    input_abspath_cache = abspath_list_file_cache, # cache folder
+    input_cache_max_bytes = list_file_cache_max_bytes): # maximum size of the cache folder
+
     fname = "get_timestamp_data_as_ndarray"
-    with open(pathstring_data) as input_file:
-        for line in input_file:
-            if not line.startswith("HEADER"):
-                line_list = list(line.split())
-                try:
-                    timestamp_10ns = np.uint64(line_list[0])
-                    pulse_height_adc = np.int64(line_list[1])
-                    extra = np.int32(line_list[2])
-                    timestamp_data_tuplelist.append((
-                        timestamp_10ns,
-                        pulse_height_adc,
-                        extra,
-                        "valid"))
-                except:
-                    print(fname, ": exception: ", line_list)
-    return np.array(timestamp_data_tuplelist, timestamp_data_mc2_dtype)
+
+    # binary list files are simply memory-mapped
+    binary_list_file = load_binary_list_file(pathstring_data)
+    if binary_list_file != None:
+        return (binary_list_file[1], binary_list_file[0], []) if flag_return_header_and_bad_lines == True else binary_list_file[1]
+
+    # trying to load the list file from the cache
+    if flag_use_cache == True:
+        cached = load_list_file_from_cache(pathstring_data, input_abspath_cache)
+        if cached != None:
+            print(f"{fname}(): loaded '{pathstring_data}' from cache")
+            return cached if flag_return_header_and_bad_lines == True else cached[0]
+
+    # counting the lines to preallocate the output array
+    ctr_newlines = 0
+    with open(pathstring_data, "rb") as input_file:
+        for chunk in iter(lambda: input_file.read(input_chunk_bytes), b""):
+            ctr_newlines += chunk.count(b"\n")
+    timestamp_data = np.zeros(ctr_newlines +1, timestamp_data_mc2_dtype)
+
+    # reading the header and parsing the body chunk by chunk
+    bad_line_indices = []
+    n = 0
+    with open(pathstring_data, "rb") as input_file:
+        header_list = read_list_file_header(input_file)
+        for chunk, line_offset in iter_list_file_line_chunks(input_file, len(header_list), input_chunk_bytes):
+            values, chunk_bad_line_indices = parse_list_file_chunk(chunk)
+            timestamp_data["timestamp_10ns"][n:n+len(values)] = values[:,0]
+            timestamp_data["pulse_height_adc"][n:n+len(values)] = values[:,1]
+            timestamp_data["extra"][n:n+len(values)] = values[:,2]
+            bad_line_indices += [line_offset +i for i in chunk_bad_line_indices]
+            n += len(values)
+    timestamp_data = timestamp_data[:n]
+
+    # reporting bad lines
+    if len(bad_line_indices) > 0:
+        print(f"{fname}(): skipped {len(bad_line_indices)} bad lines in '{pathstring_data}' (line indices: {bad_line_indices[:10]}{' ...' if len(bad_line_indices)>10 else ''})")
+
+    # saving the parsed list file to the cache
+    if flag_use_cache == True:
+        save_list_file_to_cache(pathstring_data, timestamp_data, header_list, bad_line_indices, input_abspath_cache, input_cache_max_bytes)
+
+    if flag_return_header_and_bad_lines == True:
+        return timestamp_data, header_list, bad_line_indices
+    return timestamp_data
+
+
+# This generator is used to process a list file out-of-core, i.e., without loading it into the RAM in its entirety.
+# It yields tuples of the header list and a structured array (dtype 'timestamp_data_mc2_dtype') containing 'chunk_events' events (apart from the last chunk).
+# Each chunk can be passed on to the functions below (e.g., 'get_cut_information') just as the array returned by 'get_timestamp_data_as_ndarray'.
+# If 'flag_use_cache' is set and a valid sidecar file exists, the chunks are sliced from the memory-mapped sidecar instead.
+def iter_list_file_chunks(
+    pathstring_data,
+    chunk_events = 10**6, # number of events per yielded chunk
+    input_chunk_bytes = list_file_chunk_bytes, # number of bytes parsed at once
+    flag_use_cache = False, # flag indicating whether the binary sidecar cache is supposed to be used (if available)
+    input_abspath_cache = abspath_list_file_cache): # cache folder
+
+    fname = "iter_list_file_chunks"
+
+    # case 1: slicing the memory-mapped binary list file
+    binary_list_file = load_binary_list_file(pathstring_data)
+    if binary_list_file != None:
+        header_list, timestamp_data = binary_list_file
+        for i in range(0, len(timestamp_data), chunk_events):
+            yield header_list, np.array(timestamp_data[i:i+chunk_events])
+        return
+
+    # case 2: slicing the memory-mapped sidecar
+    if flag_use_cache == True:
+        cached = load_list_file_from_cache(pathstring_data, input_abspath_cache)
+        if cached != None:
+            timestamp_data, header_list, bad_line_indices = cached
+            for i in range(0, len(timestamp_data), chunk_events):
+                yield header_list, np.array(timestamp_data[i:i+chunk_events])
+            return
+
+    # case 3: parsing the list file
+    ctr_bad_lines = 0
+    with open(pathstring_data, "rb") as input_file:
+        header_list = read_list_file_header(input_file)
+        chunk_data = np.zeros(chunk_events, timestamp_data_mc2_dtype)
+        n = 0
+        for chunk, line_offset in iter_list_file_line_chunks(input_file, len(header_list), input_chunk_bytes):
+            values, chunk_bad_line_indices = parse_list_file_chunk(chunk)
+            ctr_bad_lines += len(chunk_bad_line_indices)
+            i = 0
+            while i < len(values):
+                k = min(chunk_events -n, len(values) -i)
+                chunk_data["timestamp_10ns"][n:n+k] = values[i:i+k,0]
+                chunk_data["pulse_height_adc"][n:n+k] = values[i:i+k,1]
+                chunk_data["extra"][n:n+k] = values[i:i+k,2]
+                n += k
+                i += k
+                if n == chunk_events:
+                    yield header_list, chunk_data
+                    chunk_data = np.zeros(chunk_events, timestamp_data_mc2_dtype)
+                    n = 0
+        if n > 0:
+            chunk_data = chunk_data[:n]
+            yield header_list, chunk_data
+
+    # reporting bad lines
+    if ctr_bad_lines > 0:
+        print(f"{fname}(): skipped {ctr_bad_lines} bad lines in '{pathstring_data}'")
+    return
+
+
+# This function is used to determine which events of a signal file are vetoed by a (chunk of) veto timestamps.
+# A signal event with timestamp t_s is vetoed if there is a veto timestamp t_v with t_v +o < t_s <= t_v +o +v (timestamps, offset and window in units of 10ns).
+# Since all veto windows have the same width it suffices to check the latest veto timestamp satisfying t_v < t_s -o, which is found via 'np.searchsorted'.
+# Accordingly overlapping veto windows and negative offsets are handled correctly and the signal timestamps do not need to be sorted.
+def get_veto_mask(
+    signal_timestamps_10ns, # signal timestamps (any order)
+    veto_timestamps_10ns, # veto timestamps (sorted in ascending order)
+    o, # timing offset in 10ns
+    v): # veto window in 10ns
+
+    signal_timestamps = np.asarray(signal_timestamps_10ns).astype(np.int64)
+    veto_timestamps = np.asarray(veto_timestamps_10ns).astype(np.int64)
+    if len(veto_timestamps) == 0:
+        return np.zeros(len(signal_timestamps), bool)
+    k = np.searchsorted(veto_timestamps, signal_timestamps -o, side="left") -1
+    return (k >= 0) & (signal_timestamps <= veto_timestamps[np.maximum(k,0)] +o +v)
 
 
 # This function is used to compare both the signal and veto file generated by the MCA.
-# According to the veto file the entries in the signal file are then either marked as "vetoed" or "not_vetoed".
+# According to the veto file the 'status_vetoed' bit of the vetoed entries in the signal file is then set.
+# The veto data is processed in chunks of 'chunk_events' events (note that therefore the veto file does not have to be loaded into the RAM in its entirety).
+# Instead of a pathstring one can also pass an array of veto data (e.g., the memory-mapped array returned by 'get_timestamp_data_as_ndarray(flag_use_cache=True)').
+@traced_stage
 def get_veto_information(
     input_signal_file,
-    pathstring_vetodata,
+    pathstring_vetodata, # pathstring referring to the veto list file or structured array containing the veto data
     timingoffset = 10, # in us
-    vetowindow = 10):# in us
+    vetowindow = 10, # in us
+    chunk_events = 10**7, # number of veto events processed at once
+    flag_use_cache = False, # flag indicating whether the binary sidecar cache of the veto list file is supposed to be used (if available)
+    input_abspath_cache = abspath_list_file_cache): # cache folder
 
     # initial definitions
     signal_file = input_signal_file.copy()
-    exception_list = []
     fname = "get_veto_information"
     t_i = datetime.datetime.now()
-    print(fname, " : started: ", t_i)
-    print(fname, " : input veto file: ", pathstring_vetodata)
-    l = len(signal_file)
-    o = timingoffset*100 # the timestamp recorded by the MCA corresponds to clock cycles, i.e. 10ns
-    v = vetowindow*100 # accordingly one must convert us to 10ns
-    j = 0 # index of the current signal file entry to be checked
-
-    # accessing and looping over the veto file line by line (note that therefore the file does not have to be loaded into the RAM in its entirety)
-    with open(pathstring_vetodata) as input_file:
-        for line in input_file:
-            if not line.startswith("HEADER"):
-                line_list = list(line.split())
-                try:
-                    timestamp_10ns = np.uint64(line_list[0])
-                    pulse_height_adc = np.int64(line_list[1])
-                    # go to the next veto entry if the current signal entry timestamp is larger than the current veto entry timestamp
-                    if signal_file[j]["timestamp_10ns"] > timestamp_10ns +o +v:
-                        continue
-                    # if the veto entry timestamp is larger than the current signal entry, check whether the signal entry timestamp lies within the interval [timestamp_10ns +o, timestamp_10ns +o +w] and therefore needs to be vetoed, otherwiese bring up the next signal entry until their timestamp is greater than timestamp_10ns +o +w (and one would again have to skip lines until a smaller signal entry timestamp is once again found)
-                    else:
-                        while signal_file[j]["timestamp_10ns"] <= timestamp_10ns +o +v and j<l:
-                            if signal_file[j]["timestamp_10ns"] > timestamp_10ns +o:
-                                if signal_file[j]["validity"] == "cut":
-                                    signal_file[j]["validity"] = "cut_and_vetoed"
-                                    print(fname, " : vetoed already cut entry: ", signal_file[j])
-                                else:
-                                    signal_file[j]["validity"] = "vetoed"
-                                    print(fname, " : vetoed: ", signal_file[j])
-                                j +=1
-                            else:
-                                j +=1
-                except:
-                    exception_list.append(line_list)
-            if j % 10000 == 0:
-                print(fname, ": ", f"checked {j} of {l} entries, already running for {datetime.datetime.now()-t_i}" )
+    print(f"{fname}(): started: {t_i}")
+    o = int(round(timingoffset*100)) # the timestamp recorded by the MCA corresponds to clock cycles, i.e. 10ns
+    v = int(round(vetowindow*100)) # accordingly one must convert us to 10ns
+    mask_vetoed = np.zeros(len(signal_file), bool)
+
+    # looping over the veto data chunk by chunk
+    if type(pathstring_vetodata) == str:
+        print(f"{fname}(): input veto file: {pathstring_vetodata}")
+        veto_chunks = (chunk for header_list, chunk in iter_list_file_chunks(pathstring_vetodata, chunk_events=chunk_events, flag_use_cache=flag_use_cache, input_abspath_cache=input_abspath_cache))
+    else:
+        veto_chunks = (pathstring_vetodata[i:i+chunk_events] for i in range(0, len(pathstring_vetodata), chunk_events))
+    ctr_veto_events = 0
+    for veto_chunk in veto_chunks:
+        veto_timestamps = np.asarray(veto_chunk["timestamp_10ns"])
+        if np.any(veto_timestamps[1:] < veto_timestamps[:-1]):
+            veto_timestamps = np.sort(veto_timestamps)
+        mask_vetoed |= get_veto_mask(signal_file["timestamp_10ns"], veto_timestamps, o, v)
+        ctr_veto_events += len(veto_timestamps)
+
+    # marking the vetoed entries
+    signal_file["status"][mask_vetoed] |= status_vetoed
     t_f = datetime.datetime.now()
-    print(fname, ": ", "encountered exceptions:")
-    for i in range(len(exception_list)):
-        print(exception_list[i])
-    print(fname, ": ", "finished: ", t_f)
-    print(fname, ": ", "duration: ", t_f-t_i)
+    print(f"{fname}(): checked {len(signal_file)} signal entries against {ctr_veto_events} veto entries, vetoed {np.count_nonzero(mask_vetoed)}")
+    print(f"{fname}(): finished: {t_f}")
+    print(f"{fname}(): duration: {t_f-t_i}")
 
     return signal_file
 
 
 # This function is used to cut data from the input signal file.
+# The cut categories are stored as separate bits of the 'status' field (see 'status_*' definitions above).
+@traced_stage
 def get_cut_information(input_signal_file):
 
     signal_file = input_signal_file.copy()
-    for i in range(len(signal_file)):
-        if (signal_file[i]["extra"]>8 and signal_file[i]["extra"]<16) or signal_file[i]["pulse_height_adc"]>17000 or signal_file[i]["pulse_height_adc"]<0:
-            if signal_file[i]["validity"] == "vetoed":
-                signal_file[i]["validity"] = "cut_and_vetoed"
-            else:
-                signal_file[i]["validity"] = "cut"
+    extra = signal_file["extra"]
+    pulse_height_adc = signal_file["pulse_height_adc"]
+    signal_file["status"][(extra>8) & (extra<16)] |= status_cut_extra
+    signal_file["status"][pulse_height_adc>17000] |= status_cut_pulse_height_overflow
+    signal_file["status"][pulse_height_adc<0] |= status_cut_pulse_height_negative
     return signal_file
 
 
+# This function is used to retrieve the event numbers of a signal file (the input can be a single array or an iterable of chunks, e.g., 'iter_list_file_chunks').
+def get_signal_file_statistics(signal_file):
+    statistics_dict = {"events" : 0, "valid" : 0, "vetoed" : 0, "cut" : 0, "cutveto" : 0}
+    chunks = [signal_file] if isinstance(signal_file, np.ndarray) else (c[1] if isinstance(c, tuple) else c for c in signal_file)
+    for chunk in chunks:
+        mask_veto = chunk["status"] & status_vetoed != 0
+        mask_cut = chunk["status"] & status_cut != 0
+        statistics_dict["events"] += len(chunk)
+        statistics_dict["valid"] += np.count_nonzero(chunk["status"]==0)
+        statistics_dict["vetoed"] += np.count_nonzero(mask_veto)
+        statistics_dict["cut"] += np.count_nonzero(mask_cut)
+        statistics_dict["cutveto"] += np.count_nonzero(mask_veto & mask_cut)
+    return statistics_dict
+
+
 # This function is used to display an overview of the signal file
 def display_signal_file_properties(signal_file):
-    l = len(signal_file)
-    l_valid = len(signal_file[(signal_file["validity"]=="valid")])
-    l_veto = len(signal_file[(signal_file["validity"]=="vetoed")|(signal_file["validity"]=="cut_and_vetoed")])
-    l_cut = len(signal_file[(signal_file["validity"]=="cut")|(signal_file["validity"]=="cut_and_vetoed")])
-    l_cutveto = len(signal_file[(signal_file["validity"]=="cut_and_vetoed")])
+    statistics_dict = get_signal_file_statistics(signal_file)
+    l = statistics_dict["events"]
     print(f"signal file properties:")
     print(f"    number of events: {l}")
-    print(f"    valid: {l_valid} ({l_valid/l*100}%)")
-    print(f"    vetoed: {l_veto} ({l_veto/l*100}%)")
-    print(f"    cut: {l_cut} ({l_cut/l*100}%)")
-    print(f"    cutveto: {l_cutveto} ({l_cutveto/l*100}%)")
+    for key in ["valid", "vetoed", "cut", "cutveto"]:
+        print(f"    {key}: {statistics_dict[key]} ({statistics_dict[key]/l*100}%)")
     return
 
 
@@ -654,6 +2533,1161 @@ def display_signal_file_properties(signal_file):
 
 
 
+###############################################################
+### NumPy-based spectrum building
+###############################################################
+
+
+# number of ADC channels of the MCA (pulse heights range from 0 to 16383)
+n_adc_channels = 16384
+
+
+# This function is used to convert pulse heights (in ADC channels) into energies (in keV).
+# The calibration function root file generated by Moritz' scripts only contains a TCanvas that cannot be read without ROOT, therefore the calibration is passed on either as a function or as a list of polynomial coefficients [c0, c1, c2, ...] (i.e., E = c0 +c1*adc +c2*adc^2 +...).
+def calibrate_pulse_heights(pulse_height_adc, input_calibration):
+    if callable(input_calibration):
+        return input_calibration(np.asarray(pulse_height_adc, np.float64))
+    return np.polynomial.polynomial.polyval(np.asarray(pulse_height_adc, np.float64), input_calibration)
+
+
+# This function is used to determine the index range [i_min, i_max) of the events within a time window (in seconds since the start of the data taking, '[0,0]' means no time cut).
+# The timestamps are expected to be sorted in ascending order, i.e., as written by the MCA.
+def get_time_window_indices(timestamps_10ns, time_window):
+    if time_window == [0,0]:
+        return 0, len(timestamps_10ns)
+    i_min = np.searchsorted(timestamps_10ns, np.uint64(round(time_window[0]*10**8)), side="left")
+    i_max = np.searchsorted(timestamps_10ns, np.uint64(round(time_window[1]*10**8)), side="right")
+    return int(i_min), int(i_max)
+
+
+# This function is used to build an energy spectrum from the events of a list file (e.g., as returned by 'get_timestamp_data_as_ndarray') within a time window.
+# It is meant as a fast alternative to the 'make_rootfile_list' ---> 'make_spectrum_list' round-trip, e.g., for interactive time cut studies.
+# By default the spectrum is binned in ADC channels (i.e., the bin edges are the calibrated channel edges), alternatively equidistant energy bin edges can be passed on.
+# The live time is given by the length of the time window (clipped to the timestamps of the first and last event).
+# Instead of a single array one can also pass an iterable of chunks (e.g., 'iter_list_file_chunks') which are histogrammed one after another, i.e., without loading the list file into the RAM.
+# In this case the live time spans from the first event of the first chunk to the last event of the last chunk (i.e., including the gaps between consecutive chunks).
+@traced_stage
+def get_energy_spectrum(
+    timestamp_data, # structured array of dtype 'timestamp_data_mc2_dtype' (sorted timestamps) or an iterable of such arrays (e.g., 'iter_list_file_chunks')
+    input_calibration, # calibration function or polynomial coefficients (see 'calibrate_pulse_heights')
+    input_time_window = [0,0], # time window in seconds, [0,0] means no time cut
+    input_bin_edges = [], # equidistant energy bin edges in keV ([] means one bin per ADC channel)
+    flag_exclude_cut_and_vetoed = True): # flag indicating whether only valid events (i.e., 'status' 0) are supposed to be taken into account
+
+    # definitions
+    if len(input_bin_edges) == 0:
+        bin_edges = calibrate_pulse_heights(np.arange(n_adc_channels +1) -0.5, input_calibration)
+    else:
+        bin_edges = np.asarray(input_bin_edges, np.float64)
+        binwidth = bin_edges[1] -bin_edges[0]
+    counts = np.zeros(len(bin_edges)-1, np.float64)
+    boundary_events = [] # first and last event of every chunk, these determine the live time
+
+    # histogramming chunk by chunk
+    chunks = [timestamp_data] if isinstance(timestamp_data, np.ndarray) else (c[1] if isinstance(c, tuple) else c for c in timestamp_data)
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        boundary_events.append(chunk[[0,-1]])
+        # selecting the time window
+        i_min, i_max = get_time_window_indices(chunk["timestamp_10ns"], input_time_window)
+        data = chunk[i_min:i_max]
+        pulse_height_adc = data["pulse_height_adc"][get_spectrum_event_mask(data, flag_exclude_cut_and_vetoed)]
+        if len(input_bin_edges) == 0:
+            counts += np.bincount(pulse_height_adc, minlength=n_adc_channels)
+        else:
+            energies = calibrate_pulse_heights(pulse_height_adc, input_calibration)
+            bin_indices = np.floor((energies -bin_edges[0])/binwidth).astype(np.int64)
+            bin_indices = bin_indices[(bin_indices>=0) & (bin_indices<len(bin_edges)-1)]
+            counts += np.bincount(bin_indices, minlength=len(bin_edges)-1)
+
+    t_live_s = get_live_time(np.concatenate(boundary_events), input_time_window) if len(boundary_events) > 0 else 0.0
+    return gen_spectrum_dict(bin_edges, counts, t_live_s, input_time_window)
+
+
+# This function is used to determine the live time (in seconds) of a time window, i.e., the length of the time window clipped to the timestamps of the first and last event.
+def get_live_time(timestamp_data, time_window):
+    if len(timestamp_data) == 0:
+        return 0.0
+    t_first_s = float(timestamp_data["timestamp_10ns"][0])*10**(-8)
+    t_last_s = float(timestamp_data["timestamp_10ns"][-1])*10**(-8)
+    t_min_s, t_max_s = (t_first_s, t_last_s) if time_window == [0,0] else (max(time_window[0], t_first_s), min(time_window[1], t_last_s))
+    return max(0.0, t_max_s -t_min_s)
+
+
+# The MCA writes a marker event (pulse height -32768, extra 10) whenever its 30 bit clock rolls over, i.e., at every multiple of 2^30 x 10ns (~10.7s).
+# These rollover markers are written regardless of the event rate and are therefore a heartbeat of the data taking.
+rollover_period_10ns = 2**30
+rollover_marker_pulse_height_adc = -32768
+rollover_marker_extra = 10
+
+
+# This is the dtype of the run segment index (see 'get_run_segments').
+run_segment_dtype = np.dtype([
+    ("run", np.int32), # run number, incremented whenever the timestamps are reset (e.g., after a DAQ restart)
+    ("i_start", np.int64), # index of the first event of the segment
+    ("i_stop", np.int64), # index after the last event of the segment
+    ("start_s", np.float64), # timestamp of the first event in seconds
+    ("stop_s", np.float64), # timestamp of the last event in seconds
+    ("live_time_s", np.float64), # stop_s -start_s
+    ("n_events", np.int64), # number of events (excluding the rollover markers)
+    ("n_rollover_markers", np.int64), # number of rollover markers
+    ("n_missing_rollover_markers", np.int64), # number of rollover markers expected within [start_s, stop_s] but not found
+])
+
+
+# This function is used to select the rollover markers of a structured array of dtype 'timestamp_data_mc2_dtype'.
+# Note that not every event with pulse height -32768 is a rollover marker, only the ones with extra 10 at multiples of the rollover period are.
+def get_rollover_marker_mask(timestamp_data):
+    return (timestamp_data["pulse_height_adc"] == rollover_marker_pulse_height_adc) & (timestamp_data["extra"] == rollover_marker_extra) & (timestamp_data["timestamp_10ns"] % np.uint64(rollover_period_10ns) == 0)
+
+
+# This function is used to split a list file into run segments of continuous data taking within a single vectorized pass over the timestamps.
+# A new segment begins after every timestamp reset (the timestamp decreases, i.e., a new run has started) and after every gap of more than 'max_gap_s' seconds without any event (not even a rollover marker).
+# It returns a NumPy record array of dtype 'run_segment_dtype', the live time of the list file is the sum of the segment live times (see 'get_list_file_live_time').
+def get_run_segments(
+    timestamp_data, # structured array of dtype 'timestamp_data_mc2_dtype' or pathstring referring to a list file
+    max_gap_s = 2*rollover_period_10ns*10**(-8), # maximum time between two subsequent events within a segment (by default two rollover periods, i.e., one missing rollover marker is tolerated)
+    flag_use_cache = False): # flag indicating whether the binary sidecar cache is supposed to be used if a pathstring is passed on (see 'get_timestamp_data_as_ndarray')
+
+    if type(timestamp_data) == str:
+        timestamp_data = get_timestamp_data_as_ndarray(timestamp_data, flag_use_cache=flag_use_cache)
+    if len(timestamp_data) == 0:
+        return np.zeros(0, run_segment_dtype)
+    timestamps = timestamp_data["timestamp_10ns"].astype(np.int64)
+    mask_marker = get_rollover_marker_mask(timestamp_data)
+
+    # segment boundaries
+    dt = np.diff(timestamps)
+    mask_reset = dt < 0
+    mask_boundary = mask_reset | (dt > max_gap_s*10**8)
+    i_starts = np.concatenate([[0], np.flatnonzero(mask_boundary) +1])
+    i_stops = np.concatenate([i_starts[1:], [len(timestamps)]])
+
+    # segment properties
+    run_segments = np.zeros(len(i_starts), run_segment_dtype)
+    run_segments["run"] = np.concatenate([[0], np.cumsum(mask_reset[i_starts[1:] -1])])
+    run_segments["i_start"] = i_starts
+    run_segments["i_stop"] = i_stops
+    run_segments["start_s"] = timestamps[i_starts]*10**(-8)
+    run_segments["stop_s"] = timestamps[i_stops -1]*10**(-8)
+    run_segments["live_time_s"] = run_segments["stop_s"] -run_segments["start_s"]
+    marker_prefix_sums = np.concatenate([[0], np.cumsum(mask_marker)])
+    run_segments["n_rollover_markers"] = marker_prefix_sums[i_stops] -marker_prefix_sums[i_starts]
+    run_segments["n_events"] = (i_stops -i_starts) -run_segments["n_rollover_markers"]
+    n_expected = timestamps[i_stops -1]//rollover_period_10ns -(timestamps[i_starts] +rollover_period_10ns -1)//rollover_period_10ns +1
+    run_segments["n_missing_rollover_markers"] = np.maximum(0, n_expected -run_segments["n_rollover_markers"])
+    return run_segments
+
+
+# This function is used to determine the live time of a list file (i.e., the sum of the live times of its run segments) without running 'make_spectrum_list'.
+# For a list file without gaps and resets this equals the live time of the uncut spectrum generated by 'make_spectrum_list' (i.e., the '<t_live>' of '.root_spectrum_calibrated_0-<t_live>s.root').
+def get_list_file_live_time(pathstring_data, max_gap_s=2*rollover_period_10ns*10**(-8), flag_use_cache=False):
+    return float(np.sum(get_run_segments(pathstring_data, max_gap_s, flag_use_cache)["live_time_s"]))
+
+
+# This function is used to convert run segments (see 'get_run_segments') into time windows, i.e., the list of time windows of a single list file within 'input_time_windows' (see 'all_in_one_gemse_analysis').
+# The time windows are given in full seconds (as required by 'make_spectrum_list') enclosing the segments. Since the time windows refer to the timestamps, the segments need to belong to a single run.
+def get_segment_time_windows(
+    run_segments, # run segment index as returned by 'get_run_segments'
+    min_live_time_s = 0): # segments with a live time below this value are omitted
+    if len(np.unique(run_segments["run"])) > 1:
+        raise Exception(f"get_segment_time_windows(): the segments belong to the runs {np.unique(run_segments['run']).tolist()}, i.e., the timestamps were reset and the time windows would be ambiguous (select the segments of a single run, e.g., 'run_segments[run_segments[\"run\"]==0]')")
+    return [[int(np.floor(segment["start_s"])), int(np.ceil(segment["stop_s"]))] for segment in run_segments if segment["live_time_s"] >= min_live_time_s]
+
+
+# This function is used to print a run segment index (see 'get_run_segments').
+def print_run_segments(run_segments):
+    print(f"{'run':>4} {'start / s':>12} {'stop / s':>12} {'live time / s':>14} {'events':>10} {'markers':>8} {'missing':>8}")
+    for segment in run_segments:
+        print(f"{segment['run']:>4} {segment['start_s']:>12.1f} {segment['stop_s']:>12.1f} {segment['live_time_s']:>14.1f} {segment['n_events']:>10} {segment['n_rollover_markers']:>8} {segment['n_missing_rollover_markers']:>8}")
+    print(f"total live time: {np.sum(run_segments['live_time_s']):.1f} s ({np.sum(run_segments['live_time_s'])/(60*60*24):.3f} d)")
+    return
+
+
+# This function is used to assemble the spectrum dictionary returned by 'get_energy_spectrum' and the other spectrum building functions below.
+def gen_spectrum_dict(bin_edges, counts, t_live_s, time_window):
+    spectrum_dict = {
+        "bin_edges" : bin_edges,
+        "bin_centers" : 0.5*(bin_edges[1:] +bin_edges[:-1]),
+        "counts" : counts,
+        "counts_errors" : np.sqrt(counts),
+        "t_live_s" : t_live_s,
+        "time_window" : time_window}
+    return spectrum_dict
+
+
+# This function is used to add several spectra (e.g., of different time windows and/or list files) just like Moritz' 'add_spectra' executable, i.e., counts and live times are summed up.
+def add_energy_spectra(spectrum_dict_list):
+    for spectrum_dict in spectrum_dict_list[1:]:
+        if not np.allclose(spectrum_dict["bin_edges"], spectrum_dict_list[0]["bin_edges"]):
+            raise Exception("add_energy_spectra(): the spectra to be added differ in binning")
+    counts = np.sum([spectrum_dict["counts"] for spectrum_dict in spectrum_dict_list], axis=0)
+    t_live_s = sum([spectrum_dict["t_live_s"] for spectrum_dict in spectrum_dict_list])
+    return gen_spectrum_dict(spectrum_dict_list[0]["bin_edges"], counts, t_live_s, [0, t_live_s])
+
+
+# default block length (in seconds) of the time index (see 'get_time_index')
+time_index_block_s = 3600
+
+
+# This function is used to generate a time index of a list file, i.e., the cumulative ADC channel histograms of all events before each block boundary (block boundaries at multiples of 'input_block_s' seconds since the start of the data taking).
+# The spectrum of an arbitrary time window is then obtained from two lookups (i.e., the difference of two cumulative histograms) and the histograms of the events within the two partially covered blocks (see 'get_energy_spectrum_from_time_index').
+# The time index requires (number of blocks +1)*16384*4 bytes (uint32 cumulative histograms), e.g., 22 MB for a measurement of two weeks and one hour blocks.
+# While it is generated the per-block histograms returned by 'np.bincount' are int64 (8 bytes per entry, summed up in place), i.e., the peak memory is about three times the size of the time index.
+@traced_stage
+def get_time_index(
+    timestamp_data, # structured array of dtype 'timestamp_data_mc2_dtype' (sorted timestamps)
+    input_block_s = time_index_block_s, # block length in seconds
+    flag_exclude_cut_and_vetoed = True): # flag indicating whether only valid events (i.e., 'status' 0) are supposed to be taken into account
+
+    timestamps_10ns = timestamp_data["timestamp_10ns"]
+    n_blocks = int(np.ceil(float(timestamps_10ns[-1])*10**(-8)/input_block_s)) +1 if len(timestamp_data) > 0 else 1
+    block_boundaries_10ns = (np.arange(n_blocks +1, dtype=np.uint64)*np.uint64(round(input_block_s*10**8)))
+    block_event_indices = np.searchsorted(timestamps_10ns, block_boundaries_10ns, side="left")
+    mask = get_spectrum_event_mask(timestamp_data, flag_exclude_cut_and_vetoed)
+    block_ids = (np.searchsorted(block_boundaries_10ns, timestamps_10ns[mask], side="right") -1).astype(np.int64)
+    counts_per_block = np.bincount(block_ids*n_adc_channels +timestamp_data["pulse_height_adc"][mask], minlength=n_blocks*n_adc_channels).reshape(n_blocks, n_adc_channels)
+    cumulative_counts = np.zeros((n_blocks +1, n_adc_channels), np.uint32)
+    cumulative_counts[1:] = np.cumsum(counts_per_block, axis=0, out=counts_per_block)
+
+    time_index = {
+        "key" : get_time_index_key(timestamp_data, input_block_s, flag_exclude_cut_and_vetoed),
+        "block_s" : float(input_block_s),
+        "block_event_indices" : block_event_indices, # index of the first event at or after each block boundary
+        "cumulative_counts" : cumulative_counts, # cumulative_counts[b] is the ADC channel histogram of all events before block boundary b
+        "flag_exclude_cut_and_vetoed" : flag_exclude_cut_and_vetoed}
+    return time_index
+
+
+# This function is used to compute the key a time index is valid for, i.e., the block length, the event selection and the digest of the 'status' field.
+# The 'status' field depends on the applied cuts and veto parameters (see 'get_cut_information' and 'get_veto_information'), it is only taken into account if cut and vetoed events are excluded.
+def get_time_index_key(timestamp_data, input_block_s=time_index_block_s, flag_exclude_cut_and_vetoed=True):
+    return {
+        "block_s" : float(input_block_s),
+        "flag_exclude_cut_and_vetoed" : bool(flag_exclude_cut_and_vetoed),
+        "status_digest" : hashlib.sha1(np.ascontiguousarray(timestamp_data["status"]).tobytes()).hexdigest() if flag_exclude_cut_and_vetoed == True else None}
+
+
+# This function is used to select the events that are taken into account for the spectra (optionally only valid events, always only pulse heights within the ADC range).
+def get_spectrum_event_mask(timestamp_data, flag_exclude_cut_and_vetoed=True):
+    pulse_height_adc = timestamp_data["pulse_height_adc"]
+    mask = (pulse_height_adc>=0) & (pulse_height_adc<n_adc_channels)
+    if flag_exclude_cut_and_vetoed == True:
+        mask &= timestamp_data["status"]==0
+    return mask
+
+
+# This function is used to retrieve the ADC channel histogram of a (small) slice of events, e.g., the events within a partially covered block of the time index.
+def get_adc_channel_histogram(timestamp_data, flag_exclude_cut_and_vetoed=True):
+    mask = get_spectrum_event_mask(timestamp_data, flag_exclude_cut_and_vetoed)
+    return np.bincount(timestamp_data["pulse_height_adc"][mask], minlength=n_adc_channels)
+
+
+# This function is used to compute the energy spectrum of a time window from the time index generated by 'get_time_index'.
+# Only the events of the two partially covered blocks are histogrammed, the 'timestamp_data' can therefore also be the memory-mapped array returned by 'get_timestamp_data_as_ndarray(flag_use_cache=True)'.
+@traced_stage
+def get_energy_spectrum_from_time_index(
+    time_index, # time index generated by 'get_time_index'
+    timestamp_data, # structured array the time index was generated from
+    input_calibration, # calibration function or polynomial coefficients (see 'calibrate_pulse_heights')
+    input_time_window = [0,0]): # time window in seconds, [0,0] means no time cut
+
+    block_s = time_index["block_s"]
+    cumulative_counts = time_index["cumulative_counts"]
+    block_event_indices = time_index["block_event_indices"]
+    flag_exclude_cut_and_vetoed = time_index["flag_exclude_cut_and_vetoed"]
+    n_boundaries = len(block_event_indices)
+    i_min, i_max = get_time_window_indices(timestamp_data["timestamp_10ns"], input_time_window)
+    if input_time_window == [0,0]:
+        b_lo, b_hi = 0, n_boundaries -1
+    else:
+        b_lo = min(int(np.ceil(input_time_window[0]/block_s)), n_boundaries -1) # first block boundary within the time window
+        b_hi = min(int(np.floor(input_time_window[1]/block_s)), n_boundaries -1) # last block boundary within the time window
+    # case 1: the time window covers at least one block boundary
+    if b_lo <= b_hi:
+        counts = cumulative_counts[b_hi].astype(np.int64) -cumulative_counts[b_lo]
+        counts += get_adc_channel_histogram(timestamp_data[i_min:max(i_min, block_event_indices[b_lo])], flag_exclude_cut_and_vetoed)
+        counts += get_adc_channel_histogram(timestamp_data[min(i_max, block_event_indices[b_hi]):i_max], flag_exclude_cut_and_vetoed)
+    # case 2: the time window lies within a single block
+    else:
+        counts = get_adc_channel_histogram(timestamp_data[i_min:i_max], flag_exclude_cut_and_vetoed)
+    bin_edges = calibrate_pulse_heights(np.arange(n_adc_channels +1) -0.5, input_calibration)
+
+    return gen_spectrum_dict(bin_edges, counts.astype(np.float64), get_live_time(timestamp_data, input_time_window), input_time_window)
+
+
+# This function is used to save the time index next to the list file it was generated from (the fingerprint of the list file is saved as well, see 'load_time_index').
+def save_time_index(time_index, pathstring_data):
+    pathstring_output = pathstring_data +".time_index.npz"
+    with open(pathstring_output, "wb") as output_file:
+        np.savez(output_file,
+            block_s = time_index["block_s"],
+            block_event_indices = time_index["block_event_indices"],
+            cumulative_counts = time_index["cumulative_counts"],
+            flag_exclude_cut_and_vetoed = time_index["flag_exclude_cut_and_vetoed"],
+            key = json.dumps(time_index["key"]),
+            fingerprint = json.dumps(get_list_file_fingerprint(pathstring_data)))
+    print(f"save_time_index(): saved '{pathstring_output}'")
+    return pathstring_output
+
+
+# This function is used to load the time index saved next to a list file. If there is none, the list file has changed since or the time index was generated for a different key (see 'get_time_index_key'), 'None' is returned.
+def load_time_index(pathstring_data, time_index_key=None):
+    pathstring_input = pathstring_data +".time_index.npz"
+    if not os.path.isfile(pathstring_input):
+        return None
+    with np.load(pathstring_input) as npz:
+        if json.loads(str(npz["fingerprint"])) != get_list_file_fingerprint(pathstring_data):
+            return None
+        if "key" not in npz.files or (time_index_key != None and json.loads(str(npz["key"])) != time_index_key):
+            return None
+        time_index = {
+            "key" : json.loads(str(npz["key"])),
+            "block_s" : float(npz["block_s"]),
+            "block_event_indices" : npz["block_event_indices"],
+            "cumulative_counts" : npz["cumulative_counts"],
+            "flag_exclude_cut_and_vetoed" : bool(npz["flag_exclude_cut_and_vetoed"])}
+    return time_index
+
+
+# This function is used to compute the added spectrum of several list files and time windows (i.e., the NumPy equivalent of 'all_in_one_gemse_analysis' up to 'final_calibrated_added_spectrum.root').
+# The time indices are loaded from (or, if not available, saved to) the list file folders.
+def get_added_energy_spectrum_from_time_indices(
+    input_pathstrings_mca_list_files, # list of pathstrings referring to the raw mca list files
+    input_time_windows, # list of time windows corresponding to the entries of 'input_pathstrings_mca_list_files'
+    input_calibration, # calibration function or polynomial coefficients (see 'calibrate_pulse_heights')
+    input_block_s = time_index_block_s, # block length in seconds
+    flag_use_cache = True, # flag indicating whether the binary sidecar cache is supposed to be used for loading the list files
+    flag_exclude_cut_and_vetoed = True): # flag indicating whether only valid events (i.e., 'status' 0) are supposed to be taken into account
+
+    spectrum_dict_list = []
+    for i in range(len(input_pathstrings_mca_list_files)):
+        timestamp_data = get_timestamp_data_as_ndarray(input_pathstrings_mca_list_files[i], flag_use_cache=flag_use_cache)
+        time_index = load_time_index(input_pathstrings_mca_list_files[i], get_time_index_key(timestamp_data, input_block_s, flag_exclude_cut_and_vetoed))
+        if time_index == None:
+            time_index = get_time_index(timestamp_data, input_block_s, flag_exclude_cut_and_vetoed)
+            save_time_index(time_index, input_pathstrings_mca_list_files[i])
+        for time_window in input_time_windows[i]:
+            spectrum_dict_list.append(get_energy_spectrum_from_time_index(time_index, timestamp_data, input_calibration, time_window))
+
+    return add_energy_spectra(spectrum_dict_list)
+
+
+# This function is used to compute rate curves (i.e., the number of events per time bin) for several pulse height or energy ranges in a single pass over the data.
+# Each event is assigned to an elementary interval of the sorted range boundaries, the events are then histogrammed in (time bin, elementary interval) via one 'np.bincount'.
+# The counts of every (possibly overlapping) range are finally obtained from the cumulative sum over the elementary intervals, the runtime therefore hardly depends on the number of ranges.
+# Ranges are inclusive, i.e., [range_min, range_max]. The time bins start at the beginning of the data taking (timestamp 0) and all binwidths need to be integer multiples of the smallest one.
+@traced_stage
+def get_rate_curves(
+    timestamp_data, # structured array of dtype 'timestamp_data_mc2_dtype' or an iterable of such arrays (e.g., 'iter_list_file_chunks')
+    input_ranges = [[0,16383]], # list of pulse height (or, if 'input_calibration' is given, energy) ranges
+    input_binwidths = [1], # list of binwidths in seconds (one per range or a single binwidth for all ranges)
+    input_calibration = None, # calibration function or polynomial coefficients (see 'calibrate_pulse_heights'), None means that the ranges are given in ADC channels
+    flag_exclude_cut_and_vetoed = False): # flag indicating whether only valid events (i.e., 'status' 0) are supposed to be taken into account
+
+    # definitions
+    binwidths = list(input_binwidths) if len(input_binwidths) == len(input_ranges) else [input_binwidths[0]]*len(input_ranges)
+    base_binwidth_s = min(binwidths)
+    rebin_factors = [int(round(bw/base_binwidth_s)) for bw in binwidths]
+    if any([abs(f*base_binwidth_s -bw) > 1e-9*bw for f, bw in zip(rebin_factors, binwidths)]):
+        raise Exception(f"get_rate_curves(): all binwidths need to be integer multiples of the smallest binwidth ({base_binwidth_s} s)")
+    range_edges = np.unique(np.concatenate([[r[0] for r in input_ranges], [np.nextafter(float(r[1]), np.inf) for r in input_ranges]]))
+    n_intervals = len(range_edges) +1 # elementary intervals including the ones below and above all ranges
+    base_binwidth_10ns = base_binwidth_s*10**8
+
+    # histogramming all events in (time bin, elementary interval)
+    counts = np.zeros((0, n_intervals), np.int64)
+    chunks = [timestamp_data] if isinstance(timestamp_data, np.ndarray) else (c[1] if isinstance(c, tuple) else c for c in timestamp_data)
+    for chunk in chunks:
+        if flag_exclude_cut_and_vetoed == True:
+            chunk = chunk[chunk["status"]==0]
+        values = chunk["pulse_height_adc"] if input_calibration is None else calibrate_pulse_heights(chunk["pulse_height_adc"], input_calibration)
+        interval_ids = np.searchsorted(range_edges, values, side="right")
+        time_bin_ids = (chunk["timestamp_10ns"]//np.uint64(base_binwidth_10ns) if float(base_binwidth_10ns).is_integer() else np.floor(chunk["timestamp_10ns"]/base_binwidth_10ns)).astype(np.int64)
+        n_time_bins = int(time_bin_ids.max()) +1 if len(time_bin_ids) > 0 else 0
+        if n_time_bins > len(counts):
+            counts = np.concatenate([counts, np.zeros((n_time_bins -len(counts), n_intervals), np.int64)])
+        counts[:n_time_bins] += np.bincount(time_bin_ids*n_intervals +interval_ids, minlength=n_time_bins*n_intervals).reshape(n_time_bins, n_intervals)
+
+    # summing up the elementary intervals of each range and rebinning
+    cumulative_counts = np.concatenate([np.zeros((len(counts),1), np.int64), np.cumsum(counts, axis=1)], axis=1)
+    rate_dict_list = []
+    for r, f, bw in zip(input_ranges, rebin_factors, binwidths):
+        i_lo = np.searchsorted(range_edges, r[0], side="right")
+        i_hi = np.searchsorted(range_edges, np.nextafter(float(r[1]), np.inf), side="right")
+        range_counts = cumulative_counts[:,i_hi] -cumulative_counts[:,i_lo]
+        n_bins = int(np.ceil(len(range_counts)/f))
+        range_counts = np.concatenate([range_counts, np.zeros(n_bins*f -len(range_counts), np.int64)]).reshape(n_bins, f).sum(axis=1)
+        rate_dict_list.append({
+            "range" : r,
+            "binwidth_s" : bw,
+            "bin_centers_s" : (np.arange(n_bins) +0.5)*bw,
+            "counts" : range_counts,
+            "rates_per_s" : range_counts/bw,
+            "rates_errors_per_s" : np.sqrt(range_counts)/bw})
+
+    return rate_dict_list
+
+
+# This function is used to plot the rate curves computed by 'get_rate_curves' (i.e., the NumPy equivalent of Moritz' 'plot_rate').
+def plot_rate_curves(
+    rate_dict_list, # list of rate dictionaries returned by 'get_rate_curves'
+    input_pathstrings_output = [], # list of pathstrings according to which the plot is supposed to be saved
+    flag_energy = False): # flag indicating whether the ranges are given in keV (rather than in ADC channels)
+
+    fig, ax1 = plt.subplots(figsize=(10,5), dpi=150)
+    for rate_dict in rate_dict_list:
+        ax1.errorbar(
+            rate_dict["bin_centers_s"]/(60*60*24),
+            rate_dict["rates_per_s"],
+            yerr = rate_dict["rates_errors_per_s"],
+            drawstyle = "steps-mid",
+            linewidth = 0.5,
+            label = f"[{rate_dict['range'][0]}, {rate_dict['range'][1]}]" +(r"$\,\mathrm{keV}$" if flag_energy == True else r"$\,\mathrm{ADC}$") +f" ({rate_dict['binwidth_s']}" +r"$\,\mathrm{s}$ bins)")
+    ax1.set_xlabel(r"time since start of data taking / $\mathrm{d}$")
+    ax1.set_ylabel(r"rate / $\mathrm{s^{-1}}$")
+    ax1.legend()
+    for pathstring_output in input_pathstrings_output:
+        fig.savefig(pathstring_output)
+        print(f"plot_rate_curves(): saved '{pathstring_output}'")
+    return fig, ax1
+
+
+# This function is used to load a spectrum root file (e.g., 'final_calibrated_added_spectrum.root') as a dictionary of NumPy arrays ('bin_edges', 'bin_centers', 'counts' and 'counts_errors').
+# The live time is stored as 't_live_s' if the file contains the 't_live' vector written by 'make_spectrum_list' and 'add_spectra' (NaN otherwise).
+# The spectra are memoized (keyed on pathstring and modification time), i.e., repeatedly loading the same unchanged file does not reopen it. The returned arrays are therefore read-only.
+def load_root_spectrum(pathstring_root_spectrum):
+    abspath_root_spectrum = os.path.abspath(pathstring_root_spectrum)
+    return load_root_spectrum_memoized(abspath_root_spectrum, os.stat(abspath_root_spectrum).st_mtime_ns)
+
+@functools.lru_cache(maxsize=32)
+def load_root_spectrum_memoized(abspath_root_spectrum, mtime_ns):
+    import uproot # uproot is only required for reading root files
+    root_file = uproot.open(abspath_root_spectrum)
+    hist = root_file["hist"]
+    bin_edges = np.asarray(hist.axis().edges(), dtype=np.float64)
+    spectrum_dict = {
+        "bin_edges" : bin_edges,
+        "bin_centers" : 0.5*(bin_edges[1:] +bin_edges[:-1]),
+        "counts" : np.asarray(hist.values(), dtype=np.float64),
+        "counts_errors" : np.asarray(hist.errors(), dtype=np.float64)}
+    for array in spectrum_dict.values():
+        array.setflags(write=False)
+    spectrum_dict["t_live_s"] = float(root_file["t_live"].member("fElements")[0]) if "t_live" in root_file else np.nan
+    return spectrum_dict
+
+
+# This function is used to generate a multi-resolution pyramid of a spectrum dictionary (see 'load_root_spectrum').
+# Every level sums up pairs of adjacent bins of the previous one (an odd last bin is carried over unchanged) and propagates the errors in quadrature.
+# The pyramid is a list of dictionaries ('bin_edges', 'counts', 'counts_errors'), level 0 corresponds to the original binning.
+def gen_spectrum_pyramid(
+    spectrum_dict, # spectrum dictionary, e.g., as returned by 'load_root_spectrum'
+    min_bins = 64): # no further level is generated once a level features less than 'min_bins' bins
+    pyramid = [{
+        "bin_edges" : np.asarray(spectrum_dict["bin_edges"], dtype=np.float64),
+        "counts" : np.asarray(spectrum_dict["counts"], dtype=np.float64),
+        "counts_errors" : np.asarray(spectrum_dict["counts_errors"], dtype=np.float64)}]
+    while len(pyramid[-1]["counts"]) >= 2*min_bins:
+        level = pyramid[-1]
+        pair_indices = np.arange(0, len(level["counts"]), 2)
+        bin_edges = level["bin_edges"][::2]
+        if bin_edges[-1] != level["bin_edges"][-1]:
+            bin_edges = np.append(bin_edges, level["bin_edges"][-1])
+        pyramid.append({
+            "bin_edges" : bin_edges,
+            "counts" : np.add.reduceat(level["counts"], pair_indices),
+            "counts_errors" : np.sqrt(np.add.reduceat(level["counts_errors"]**2, pair_indices))})
+    for level in pyramid:
+        for array in level.values():
+            array.setflags(write=False)
+    return pyramid
+
+
+# This function is used to load the multi-resolution pyramid (see 'gen_spectrum_pyramid') of a spectrum root file, the pyramid is memoized alongside the spectrum.
+def load_root_spectrum_pyramid(pathstring_root_spectrum):
+    abspath_root_spectrum = os.path.abspath(pathstring_root_spectrum)
+    return load_root_spectrum_pyramid_memoized(abspath_root_spectrum, os.stat(abspath_root_spectrum).st_mtime_ns)
+
+@functools.lru_cache(maxsize=32)
+def load_root_spectrum_pyramid_memoized(abspath_root_spectrum, mtime_ns):
+    return gen_spectrum_pyramid(load_root_spectrum_memoized(abspath_root_spectrum, mtime_ns))
+
+
+# This function is used to select the coarsest pyramid level that still resolves the x-range 'x_lim' at an output width of 'pixel_width' pixels, i.e., one bin is at most 'pixels_per_bin' pixels wide.
+def select_spectrum_pyramid_level(
+    pyramid, # multi-resolution pyramid, see 'gen_spectrum_pyramid'
+    x_lim, # visible x-range, e.g., [0, 3000]
+    pixel_width, # output width in pixels, e.g., 'fig.get_figwidth()*fig.dpi'
+    pixels_per_bin = 1): # maximum number of pixels per bin
+    max_binwidth = pixels_per_bin*abs(x_lim[1]-x_lim[0])/pixel_width
+    selected_level = pyramid[0]
+    for level in pyramid:
+        if np.max(np.diff(level["bin_edges"])) > max_binwidth:
+            break
+        selected_level = level
+    return selected_level
+
+
+# This function is used to plot a spectrum pyramid into 'ax' as a step line with an error band, using the coarsest level resolving the current x-range of 'ax' (see 'select_spectrum_pyramid_level').
+# If 'flag_follow_xlim' is set to True, the plot is redrawn at the appropriate level whenever the x-range changes (e.g., when zooming in an interactive notebook).
+def plot_spectrum_pyramid(
+    ax, # matplotlib axes the spectrum is plotted into
+    pyramid, # multi-resolution pyramid, see 'gen_spectrum_pyramid'
+    pixel_width = 0, # output width in pixels, 0 corresponds to the width of 'ax'
+    linewidth = 0.2, # line width of the step line
+    linecolor = "black", # color of the step line
+    bandcolor = gemse_mint, # color of the error band
+    flag_follow_xlim = False): # flag indicating whether the plotted level follows changes of the x-range
+    artists = []
+    def draw_level(ax):
+        x_lim = ax.get_xlim()
+        width = pixel_width if pixel_width != 0 else ax.get_window_extent().width
+        level = select_spectrum_pyramid_level(pyramid, x_lim, width)
+        if artists != [] and len(artists[0].get_xdata()) == len(level["bin_edges"]):
+            return level
+        for artist in artists:
+            artist.remove()
+        # the last value is repeated such that the step of the last bin is drawn up to the upper bin edge
+        counts = np.append(level["counts"], level["counts"][-1])
+        counts_errors = np.append(level["counts_errors"], level["counts_errors"][-1])
+        artists[:] = ax.plot(level["bin_edges"], counts, drawstyle="steps-post", linewidth=linewidth, color=linecolor, linestyle="-", zorder=1)
+        artists.append(ax.fill_between(level["bin_edges"], counts-counts_errors, counts+counts_errors, step="post", color=bandcolor, alpha=1, zorder=0, linewidth=0))
+        ax.set_xlim(x_lim, emit=False) # plotting must not alter the x-range (or trigger 'draw_level' again)
+        return level
+    level = draw_level(ax)
+    if flag_follow_xlim == True:
+        ax.callbacks.connect("xlim_changed", draw_level)
+    return level
+
+
+# This function is used to compute the counts within the energy intervals [lower_kev[i], upper_kev[i]] of a spectrum all at once via prefix sums (bins are attributed via their bin centers).
+def get_interval_counts(spectrum_dict, lower_kev, upper_kev):
+    prefix_sums = np.concatenate([[0], np.cumsum(spectrum_dict["counts"])])
+    return prefix_sums[np.searchsorted(spectrum_dict["bin_centers"], upper_kev, side="right")] -prefix_sums[np.searchsorted(spectrum_dict["bin_centers"], lower_kev, side="left")]
+
+
+# This function is used to pre-screen a sample spectrum against the background spectrum within the fit ranges of all peaks of the isotopes (see 'load_isotope_parameter_registry'), e.g., prior to the time-consuming MCMC of 'GeMSE_analysis'.
+# For every peak the background counts are scaled to the live time of the sample. The significance is the net count divided by its standard deviation under the background-only hypothesis,
+# i.e., the Poisson fluctuation of the expected background plus the statistical uncertainty of the background measurement.
+# It returns a NumPy record array with one entry per peak, sorted by decreasing significance.
+def screen_peak_regions(
+    input_pathstring_sample_spectrum, # pathstring referring to the sample spectrum root file (e.g., 'final_calibrated_added_spectrum.root')
+    input_pathstring_background_spectrum, # pathstring referring to the background spectrum root file (e.g., 'background_combined.root')
+    input_abspath_isotope_parameters_folder, # isotope parameters folder providing the fit ranges
+    input_isotopes = [], # isotopes to be screened, all isotopes of the registry are screened if an empty list is passed on
+    input_t_live_sample_s = 0, # live time of the sample measurement, 0 corresponds to the 't_live' stored within the sample spectrum file
+    input_t_live_background_s = 0): # live time of the background measurement, 0 corresponds to the 't_live' stored within the background spectrum file
+    # loading the spectra and peaks
+    sample_spectrum_dict = load_root_spectrum(input_pathstring_sample_spectrum)
+    background_spectrum_dict = load_root_spectrum(input_pathstring_background_spectrum)
+    t_live_sample_s = input_t_live_sample_s if input_t_live_sample_s != 0 else sample_spectrum_dict["t_live_s"]
+    t_live_background_s = input_t_live_background_s if input_t_live_background_s != 0 else background_spectrum_dict["t_live_s"]
+    if not (t_live_sample_s > 0 and t_live_background_s > 0):
+        raise Exception(f"screen_peak_regions(): no valid live times (sample: {t_live_sample_s}, background: {t_live_background_s}), pass them on via 'input_t_live_sample_s' and 'input_t_live_background_s'")
+    if input_isotopes != []:
+        validate_isotopes(input_abspath_isotope_parameters_folder, input_isotopes)
+        peaks = get_isotope_peaks(input_abspath_isotope_parameters_folder, input_isotopes) # commented-out isotopes (e.g., "#Mn54") are skipped
+    else:
+        peaks = load_isotope_parameter_registry(input_abspath_isotope_parameters_folder)["peaks"]
+    # counting within all fit ranges at once
+    sample_counts = get_interval_counts(sample_spectrum_dict, peaks["fit_range_lower_kev"], peaks["fit_range_upper_kev"])
+    background_counts = get_interval_counts(background_spectrum_dict, peaks["fit_range_lower_kev"], peaks["fit_range_upper_kev"])
+    scaling = t_live_sample_s/t_live_background_s
+    expected_background_counts = scaling*background_counts
+    net_counts = sample_counts -expected_background_counts
+    sigma = np.sqrt(np.maximum(expected_background_counts +scaling**2*background_counts, 1))
+    # assembling the output
+    screening = np.zeros(shape=len(peaks), dtype=np.dtype(peaks.dtype.descr +[
+        ("sample_counts", np.float64),
+        ("expected_background_counts", np.float64),
+        ("net_counts", np.float64),
+        ("net_rate_hz", np.float64),
+        ("significance", np.float64)]))
+    for field in peaks.dtype.names:
+        screening[field] = peaks[field]
+    screening["sample_counts"] = sample_counts
+    screening["expected_background_counts"] = expected_background_counts
+    screening["net_counts"] = net_counts
+    screening["net_rate_hz"] = net_counts/t_live_sample_s
+    screening["significance"] = net_counts/sigma
+    return screening[np.argsort(-screening["significance"], kind="stable")]
+
+
+# This function is used to rank the isotopes of a pre-screening (see 'screen_peak_regions') by the maximum significance of their peaks.
+# It returns a list of (isotope, maximum significance) tuples, sorted by decreasing significance.
+def rank_screened_isotopes(screening):
+    isotopes = []
+    for isotope in screening["isotope"]:
+        if isotope not in isotopes:
+            isotopes.append(isotope) # 'screening' is sorted by decreasing significance, i.e., the first occurence of every isotope holds its maximum significance
+    return [(isotope, float(np.max(screening["significance"][screening["isotope"] == isotope]))) for isotope in isotopes]
+
+
+# This function is used to drop the clearly empty isotopes (i.e., the ones without any peak exceeding 'min_significance') from 'list_isotopes_to_analyze'.
+# Note that 'GeMSE_analysis' no longer computes activity limits for the dropped isotopes.
+def select_screened_isotopes(screening, list_isotopes_to_analyze, min_significance=1.0):
+    max_significances = dict(rank_screened_isotopes(screening))
+    return [isotope for isotope in list_isotopes_to_analyze if isotope not in max_significances or max_significances[isotope] >= min_significance]
+
+
+# This function is used to print a pre-screening (see 'screen_peak_regions').
+def print_peak_region_screening(screening):
+    print(f"{'isotope':<8} {'peak':>4} {'energy / keV':>12} {'fit range / keV':>20} {'sample':>10} {'background':>12} {'net':>10} {'significance':>12}")
+    for peak in screening:
+        print(f"{peak['isotope']:<8} {peak['peak']:>4} {peak['energy_kev']:>12.1f} {peak['fit_range_lower_kev']:>9.1f} - {peak['fit_range_upper_kev']:>8.1f} {peak['sample_counts']:>10.0f} {peak['expected_background_counts']:>12.1f} {peak['net_counts']:>10.1f} {peak['significance']:>12.2f}")
+    return
+
+
+# This function is used to save a spectrum generated by 'get_energy_spectrum' as a root file containing the 'hist' histogram (as read by 'gemse_analysis_aftermath').
+# Note that uproot cannot write the 't_live' and 't_real' TVectorT objects contained within the spectra generated by 'make_spectrum_list', accordingly the live time is only appended to the file name.
+def save_energy_spectrum_as_root_file(spectrum_dict, pathstring_output_without_extension):
+    import uproot # uproot is only required for writing root files
+    pathstring_output = pathstring_output_without_extension +f"_calibrated_{str(int(spectrum_dict['time_window'][0]))}-{str(int(round(spectrum_dict['time_window'][0] +spectrum_dict['t_live_s'])))}s.root"
+    with uproot.recreate(pathstring_output) as output_file:
+        output_file["hist"] = (spectrum_dict["counts"], spectrum_dict["bin_edges"])
+    print(f"save_energy_spectrum_as_root_file(): saved '{pathstring_output}'")
+    return pathstring_output
+
+
+
+
+
+###############################################################
+### live monitoring of growing list files
+###############################################################
+
+
+# The MCA appends to the list files for weeks, the functions below follow a growing list file (and optionally the corresponding veto list file) while the measurement is still running.
+# Every update only parses the complete lines appended since the last update (starting from the saved byte offsets), i.e., its runtime is proportional to the new data rather than to the file size.
+# The incrementally updated quantities (ADC channel histogram, rate curves, event counters and the data-taking state) are stored within a live state dictionary (see 'init_live_state').
+# A timestamp decreasing with respect to its predecessor (e.g., since the DAQ was restarted and the file was overwritten) is recorded as an anomaly and unwrapped,
+# i.e., the subsequent timestamps are shifted by the last timestamp before the reset such that the time axis of the rate curves continues monotonically.
+
+
+# number of bytes at the beginning of a followed list file that are hashed to detect whether the file was replaced (see 'load_live_checkpoint')
+live_checkpoint_hash_bytes = 2**20
+
+
+# This function is used to initialize the live state of a list file to be followed (see 'update_live_state').
+def init_live_state(
+    pathstring_data, # pathstring referring to the (growing) signal list file
+    pathstring_vetodata = "", # pathstring referring to the (growing) veto list file, an empty string means that no veto is applied
+    timingoffset = 10, # in us, see 'get_veto_information'
+    vetowindow = 10, # in us, see 'get_veto_information'
+    input_ranges = [[0,16383]], # list of pulse height (or, if 'input_calibration' is given, energy) ranges of the rate curves (inclusive)
+    input_binwidth_s = 60, # binwidth of the rate curves in seconds
+    input_calibration = None, # polynomial coefficients (see 'calibrate_pulse_heights'), None means that the ranges are given in ADC channels
+    flag_exclude_cut_and_vetoed = False): # flag indicating whether only valid events (i.e., 'status' 0) are supposed to be taken into account for the rate curves
+    live_state = {
+        "pathstrings" : {"data" : os.path.abspath(pathstring_data), "veto" : os.path.abspath(pathstring_vetodata) if pathstring_vetodata != "" else ""},
+        "settings" : {
+            "timingoffset" : timingoffset,
+            "vetowindow" : vetowindow,
+            "ranges" : [list(r) for r in input_ranges],
+            "binwidth_s" : input_binwidth_s,
+            "calibration" : list(input_calibration) if input_calibration is not None else None,
+            "flag_exclude_cut_and_vetoed" : flag_exclude_cut_and_vetoed},
+        "byte_offsets" : {"data" : 0, "veto" : 0}, # position of the first unparsed byte of the list files
+        "header_lists" : {"data" : [], "veto" : []},
+        "raw_t_last_10ns" : {"data" : 0, "veto" : 0}, # last timestamp as written by the MCA (used to detect timestamp resets)
+        "timestamp_offsets_10ns" : {"data" : 0, "veto" : 0}, # offsets added to the timestamps after resets
+        "counters" : {"events" : 0, "valid" : 0, "vetoed" : 0, "cut" : 0, "cutveto" : 0, "bad_lines" : 0, "veto_events" : 0},
+        "t_first_10ns" : -1, # timestamp of the first processed signal event (-1 if there is none)
+        "t_last_10ns" : -1, # timestamp of the last processed signal event (-1 if there is none)
+        "veto_t_last_10ns" : -1, # timestamp of the last veto event read (-1 if there is none)
+        "data_taking" : {
+            "state" : "starting", # "starting", "running" or "stalled"
+            "wall_time_last_event" : time.time(), # wall time (seconds since the epoch) at which the last new signal event was read
+            "veto_state" : "starting", # "starting", "running" or "stalled" (only updated if a veto file is followed)
+            "wall_time_last_veto_event" : time.time(), # wall time (seconds since the epoch) at which the last new veto event was read
+            "anomalies" : []}, # list of dictionaries recording timestamp resets, truncated files and stalls
+        "adc_histogram" : np.zeros(n_adc_channels, np.int64), # ADC channel histogram of the valid events
+        "rate_counts" : np.zeros((0, len(input_ranges)), np.int64), # events per (time bin, range), the array grows in powers of two
+        "n_time_bins" : 0, # number of time bins of 'rate_counts' actually in use
+        "pending_signal" : np.zeros(0, timestamp_data_mc2_dtype), # signal events whose veto decision is not yet possible (i.e., the veto file has not advanced far enough)
+        "veto_timestamps" : np.zeros(0, np.int64)} # veto timestamps still required for the veto decision of future signal events
+    return live_state
+
+
+# This function is used to append an anomaly record to the live state (and to print it).
+def add_live_anomaly(live_state, anomaly_type, **kwargs):
+    anomaly = {"type" : anomaly_type, "wall_time" : datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **kwargs}
+    live_state["data_taking"]["anomalies"].append(anomaly)
+    print(f"update_live_state(): {anomaly}")
+    return anomaly
+
+
+# This function is used to read and parse the complete lines appended to a list file since 'live_state["byte_offsets"][key]' (at most 'input_max_bytes' bytes at once).
+# It returns the parsed (n,3) int64 array, the byte offsets of the parsed lines are advanced within 'live_state'.
+def read_appended_list_file_lines(live_state, key, input_max_bytes=list_file_chunk_bytes):
+    pathstring = live_state["pathstrings"][key]
+    if not os.path.isfile(pathstring):
+        return np.zeros((0,3), np.int64)
+    if os.path.getsize(pathstring) < live_state["byte_offsets"][key]:
+        add_live_anomaly(live_state, "truncated", file=key, byte_offset=live_state["byte_offsets"][key])
+        live_state["byte_offsets"][key] = 0
+    with open(pathstring, "rb") as input_file:
+        if live_state["byte_offsets"][key] == 0:
+            live_state["header_lists"][key] = read_list_file_header(input_file)
+            live_state["byte_offsets"][key] = input_file.tell()
+        input_file.seek(live_state["byte_offsets"][key])
+        chunk = input_file.read(input_max_bytes)
+    chunk = chunk[:chunk.rfind(b"\n") +1] # only complete lines are parsed, the incomplete last line is read again by the next update
+    live_state["byte_offsets"][key] += len(chunk)
+    values, bad_line_indices = parse_list_file_chunk(chunk)
+    live_state["counters"]["bad_lines"] += len(bad_line_indices)
+    return values
+
+
+# This function is used to convert the raw timestamps read from a list file into monotonic timestamps, i.e., every reset of the timestamps is recorded and unwrapped.
+def unwrap_live_timestamps(live_state, key, raw_timestamps_10ns):
+    if len(raw_timestamps_10ns) == 0:
+        return raw_timestamps_10ns.astype(np.int64)
+    raw_timestamps = raw_timestamps_10ns.astype(np.int64)
+    previous_timestamps = np.concatenate([[live_state["raw_t_last_10ns"][key]], raw_timestamps[:-1]])
+    mask_reset = raw_timestamps < previous_timestamps
+    offsets = live_state["timestamp_offsets_10ns"][key] +np.cumsum(np.where(mask_reset, previous_timestamps, 0))
+    for i in np.flatnonzero(mask_reset):
+        add_live_anomaly(live_state, "timestamp_reset", file=key, timestamp_before_10ns=int(previous_timestamps[i]), timestamp_after_10ns=int(raw_timestamps[i]))
+    live_state["raw_t_last_10ns"][key] = int(raw_timestamps[-1])
+    live_state["timestamp_offsets_10ns"][key] = int(offsets[-1])
+    return raw_timestamps +offsets
+
+
+# This function is used to add finalized signal events (i.e., with known veto decision) to the histogram, rate curves and counters of the live state.
+def add_events_to_live_state(live_state, events):
+    if len(events) == 0:
+        return
+    settings = live_state["settings"]
+    # counters
+    mask_veto = events["status"] & status_vetoed != 0
+    mask_cut = events["status"] & status_cut != 0
+    counters = live_state["counters"]
+    counters["events"] += len(events)
+    counters["valid"] += np.count_nonzero(events["status"]==0)
+    counters["vetoed"] += np.count_nonzero(mask_veto)
+    counters["cut"] += np.count_nonzero(mask_cut)
+    counters["cutveto"] += np.count_nonzero(mask_veto & mask_cut)
+    if live_state["t_first_10ns"] == -1:
+        live_state["t_first_10ns"] = int(events["timestamp_10ns"][0])
+    live_state["t_last_10ns"] = int(events["timestamp_10ns"][-1])
+    # ADC channel histogram
+    live_state["adc_histogram"] += get_adc_channel_histogram(events, flag_exclude_cut_and_vetoed=True)
+    # rate curves (only the time bins covered by the new events are touched)
+    if settings["flag_exclude_cut_and_vetoed"] == True:
+        events = events[events["status"]==0]
+    if len(events) == 0:
+        return
+    values = events["pulse_height_adc"] if settings["calibration"] is None else calibrate_pulse_heights(events["pulse_height_adc"], settings["calibration"])
+    time_bin_ids = (events["timestamp_10ns"].astype(np.float64)/(settings["binwidth_s"]*10**8)).astype(np.int64)
+    bin_min, bin_max = int(time_bin_ids.min()), int(time_bin_ids.max())
+    if bin_max >= len(live_state["rate_counts"]):
+        rate_counts = np.zeros((max(2*len(live_state["rate_counts"]), bin_max +1), len(settings["ranges"])), np.int64)
+        rate_counts[:len(live_state["rate_counts"])] = live_state["rate_counts"]
+        live_state["rate_counts"] = rate_counts
+    for j, r in enumerate(settings["ranges"]):
+        mask_range = (values >= r[0]) & (values <= r[1])
+        live_state["rate_counts"][bin_min:bin_max+1, j] += np.bincount(time_bin_ids[mask_range] -bin_min, minlength=bin_max -bin_min +1)
+    live_state["n_time_bins"] = max(live_state["n_time_bins"], bin_max +1)
+    return
+
+
+# This function is used to update the live state by the data appended to the list file(s) since the last update.
+# Signal events are only finalized (i.e., cut, vetoed and added to the histogram, rate curves and counters) once the veto file has advanced far enough to decide whether they are vetoed.
+# If no new signal events arrived for more than 'stall_timeout_s' seconds the data taking is considered stalled.
+# Likewise the veto file is considered stalled if no new veto events arrived for more than 'stall_timeout_s' seconds while signal events are waiting for their veto decision.
+# It returns the number of finalized signal events.
+def update_live_state(
+    live_state, # live state generated by 'init_live_state' (or loaded by 'load_live_checkpoint')
+    stall_timeout_s = 600, # number of seconds without new signal events after which the data taking is considered stalled
+    input_max_bytes = list_file_chunk_bytes, # maximum number of bytes read per list file and update
+    flag_flush = False): # flag indicating whether all pending signal events are supposed to be finalized (e.g., once the measurement has ended)
+
+    settings = live_state["settings"]
+    o = int(round(settings["timingoffset"]*100))
+    v = int(round(settings["vetowindow"]*100))
+    flag_veto = live_state["pathstrings"]["veto"] != ""
+
+    # reading the new veto events
+    n_new_veto_events = 0
+    if flag_veto == True:
+        values = read_appended_list_file_lines(live_state, "veto", input_max_bytes)
+        n_new_veto_events = len(values)
+        if len(values) > 0:
+            veto_timestamps = unwrap_live_timestamps(live_state, "veto", values[:,0])
+            live_state["veto_timestamps"] = np.concatenate([live_state["veto_timestamps"], veto_timestamps])
+            live_state["veto_t_last_10ns"] = int(veto_timestamps[-1])
+            live_state["counters"]["veto_events"] += len(veto_timestamps)
+
+    # reading the new signal events
+    values = read_appended_list_file_lines(live_state, "data", input_max_bytes)
+    new_events = np.zeros(len(values), timestamp_data_mc2_dtype)
+    new_events["timestamp_10ns"] = unwrap_live_timestamps(live_state, "data", values[:,0])
+    new_events["pulse_height_adc"] = values[:,1]
+    new_events["extra"] = values[:,2]
+    pending_signal = get_cut_information(np.concatenate([live_state["pending_signal"], new_events]))
+
+    # finalizing the signal events whose veto decision is possible
+    if flag_veto == True and flag_flush == False:
+        n_final = int(np.searchsorted(pending_signal["timestamp_10ns"].astype(np.int64) -o, live_state["veto_t_last_10ns"], side="right"))
+    else:
+        n_final = len(pending_signal)
+    events = pending_signal[:n_final]
+    if flag_veto == True and n_final > 0:
+        events["status"][get_veto_mask(events["timestamp_10ns"], live_state["veto_timestamps"], o, v)] |= status_vetoed
+    add_events_to_live_state(live_state, events)
+    live_state["pending_signal"] = pending_signal[n_final:]
+    if flag_veto == True and live_state["t_last_10ns"] != -1:
+        # veto events preceding the latest finalized signal event by more than the veto window are no longer required
+        live_state["veto_timestamps"] = live_state["veto_timestamps"][np.searchsorted(live_state["veto_timestamps"], live_state["t_last_10ns"] -o -v, side="left"):]
+
+    # data-taking state
+    data_taking = live_state["data_taking"]
+    if len(new_events) > 0:
+        if data_taking["state"] == "stalled":
+            add_live_anomaly(live_state, "resumed", stalled_s=round(time.time() -data_taking["wall_time_last_event"]))
+        data_taking["state"] = "running"
+        data_taking["wall_time_last_event"] = time.time()
+    elif time.time() -data_taking["wall_time_last_event"] > stall_timeout_s and data_taking["state"] != "stalled":
+        data_taking["state"] = "stalled"
+        add_live_anomaly(live_state, "stalled", t_last_10ns=live_state["t_last_10ns"], byte_offset=live_state["byte_offsets"]["data"])
+    if flag_veto == True:
+        if n_new_veto_events > 0:
+            if data_taking["veto_state"] == "stalled":
+                add_live_anomaly(live_state, "veto_resumed", stalled_s=round(time.time() -data_taking["wall_time_last_veto_event"]))
+            data_taking["veto_state"] = "running"
+            data_taking["wall_time_last_veto_event"] = time.time()
+        elif len(live_state["pending_signal"]) > 0 and time.time() -data_taking["wall_time_last_veto_event"] > stall_timeout_s and data_taking["veto_state"] != "stalled":
+            data_taking["veto_state"] = "stalled"
+            add_live_anomaly(live_state, "veto_stalled", veto_t_last_10ns=live_state["veto_t_last_10ns"], n_pending=len(live_state["pending_signal"]), byte_offset=live_state["byte_offsets"]["veto"])
+
+    return n_final
+
+
+# This function is used to retrieve the current energy spectrum of the live state (see 'gen_spectrum_dict').
+def get_live_energy_spectrum(live_state, input_calibration):
+    bin_edges = calibrate_pulse_heights(np.arange(n_adc_channels +1) -0.5, input_calibration)
+    t_live_s = max(0.0, (live_state["t_last_10ns"] -live_state["t_first_10ns"])*10**(-8)) if live_state["t_first_10ns"] != -1 else 0.0
+    return gen_spectrum_dict(bin_edges, live_state["adc_histogram"].astype(np.float64), t_live_s, [0,0])
+
+
+# This function is used to retrieve the current rate curves of the live state in the format returned by 'get_rate_curves' (e.g., to be plotted via 'plot_rate_curves').
+def get_live_rate_curves(live_state):
+    binwidth_s = live_state["settings"]["binwidth_s"]
+    rate_dict_list = []
+    for j, r in enumerate(live_state["settings"]["ranges"]):
+        counts = live_state["rate_counts"][:live_state["n_time_bins"], j].copy()
+        rate_dict_list.append({
+            "range" : r,
+            "binwidth_s" : binwidth_s,
+            "bin_centers_s" : (np.arange(len(counts)) +0.5)*binwidth_s,
+            "counts" : counts,
+            "rates_per_s" : counts/binwidth_s,
+            "rates_errors_per_s" : np.sqrt(counts)/binwidth_s})
+    return rate_dict_list
+
+
+# This function is used to determine the hash of the first bytes of a followed list file (which change if the file is replaced, e.g., after a DAQ restart).
+def get_list_file_prefix_hash(pathstring_data, n_bytes):
+    with open(pathstring_data, "rb") as input_file:
+        return hashlib.sha1(input_file.read(n_bytes)).hexdigest()
+
+
+# This function is used to save the live state next to the followed list file, i.e., to '<pathstring_data>.live_checkpoint.npz'.
+# The checkpoint is first written to a temporary file such that an interrupted write never corrupts the previous checkpoint.
+def save_live_checkpoint(live_state):
+    pathstring_data = live_state["pathstrings"]["data"]
+    pathstring_output = pathstring_data +".live_checkpoint.npz"
+    metadata = {key : value for key, value in live_state.items() if key not in ["adc_histogram", "rate_counts", "pending_signal", "veto_timestamps"]}
+    metadata["prefix_hashes"] = {key : get_list_file_prefix_hash(pathstring, min(live_state["byte_offsets"][key], live_checkpoint_hash_bytes)) for key, pathstring in live_state["pathstrings"].items() if pathstring != ""}
+    with open(pathstring_output +".tmp", "wb") as output_file:
+        np.savez(output_file,
+            adc_histogram = live_state["adc_histogram"],
+            rate_counts = live_state["rate_counts"][:live_state["n_time_bins"]],
+            pending_signal = live_state["pending_signal"],
+            veto_timestamps = live_state["veto_timestamps"],
+            metadata = json.dumps(metadata))
+    os.replace(pathstring_output +".tmp", pathstring_output)
+    return pathstring_output
+
+
+# This function is used to load the live state saved next to a followed list file. If there is none or the list file(s) have been replaced since, 'None' is returned.
+def load_live_checkpoint(pathstring_data):
+    pathstring_input = os.path.abspath(pathstring_data) +".live_checkpoint.npz"
+    if not os.path.isfile(pathstring_input):
+        return None
+    with np.load(pathstring_input) as npz:
+        live_state = json.loads(str(npz["metadata"]))
+        for key, pathstring in live_state["pathstrings"].items():
+            if pathstring == "":
+                continue
+            if not os.path.isfile(pathstring) or os.path.getsize(pathstring) < live_state["byte_offsets"][key]:
+                return None
+            if get_list_file_prefix_hash(pathstring, min(live_state["byte_offsets"][key], live_checkpoint_hash_bytes)) != live_state["prefix_hashes"][key]:
+                return None
+        live_state.pop("prefix_hashes")
+        live_state["adc_histogram"] = npz["adc_histogram"]
+        live_state["rate_counts"] = npz["rate_counts"]
+        live_state["pending_signal"] = npz["pending_signal"]
+        live_state["veto_timestamps"] = npz["veto_timestamps"]
+    live_state["data_taking"]["wall_time_last_event"] = time.time() # the stall detection restarts with the resumed follow mode
+    live_state["data_taking"]["wall_time_last_veto_event"] = time.time()
+    return live_state
+
+
+# This function is used to print a one-line status of the live state.
+def print_live_state(live_state):
+    counters = live_state["counters"]
+    t_s = (live_state["t_last_10ns"]*10**(-8)) if live_state["t_last_10ns"] != -1 else 0
+    print(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {live_state['data_taking']['state']:<8} {'veto ' +live_state['data_taking']['veto_state'] +', ' if live_state['pathstrings']['veto'] != '' else ''}t={t_s/(60*60*24):.3f}d, events={counters['events']}, valid={counters['valid']}, vetoed={counters['vetoed']}, cut={counters['cut']}, pending={len(live_state['pending_signal'])}, bad lines={counters['bad_lines']}, anomalies={len(live_state['data_taking']['anomalies'])}")
+    return
+
+
+# This function is used to follow a growing list file (and optionally its veto list file), i.e., to repeatedly update the live state (see 'update_live_state') until interrupted.
+# If a valid checkpoint exists, the follow mode resumes from it instead of reading the list file(s) again. The checkpoint is saved every 'checkpoint_interval_s' seconds and on interruption.
+# The 'callback' (if given) is called with the live state after every update, e.g., to refresh a plot in a notebook.
+def follow_list_file(
+    pathstring_data, # pathstring referring to the (growing) signal list file
+    pathstring_vetodata = "", # pathstring referring to the (growing) veto list file
+    poll_interval_s = 10, # number of seconds between two updates (if the previous update did not exhaust 'input_max_bytes')
+    stall_timeout_s = 600, # see 'update_live_state'
+    checkpoint_interval_s = 300, # number of seconds between two checkpoints
+    max_updates = 0, # number of updates after which the function returns (0 means no limit)
+    callback = None, # function called with the live state after every update
+    flag_resume = True, # flag indicating whether the follow mode is supposed to resume from an existing checkpoint
+    input_max_bytes = list_file_chunk_bytes, # see 'update_live_state'
+    **kwargs): # keywords passed on to 'init_live_state' (e.g., 'input_ranges', 'timingoffset')
+
+    fname = "follow_list_file"
+    live_state = load_live_checkpoint(pathstring_data) if flag_resume == True else None
+    if live_state != None:
+        print(f"{fname}(): resuming '{pathstring_data}' from byte {live_state['byte_offsets']['data']}")
+    else:
+        live_state = init_live_state(pathstring_data, pathstring_vetodata, **kwargs)
+    t_checkpoint = time.time()
+    ctr_updates = 0
+    try:
+        while max_updates == 0 or ctr_updates < max_updates:
+            byte_offsets = dict(live_state["byte_offsets"])
+            update_live_state(live_state, stall_timeout_s, input_max_bytes)
+            ctr_updates += 1
+            print_live_state(live_state)
+            if callback != None:
+                callback(live_state)
+            if time.time() -t_checkpoint > checkpoint_interval_s:
+                save_live_checkpoint(live_state)
+                t_checkpoint = time.time()
+            # catching up with a large backlog without waiting
+            if all([live_state["byte_offsets"][key] -byte_offsets[key] < input_max_bytes//2 for key in byte_offsets]):
+                if max_updates == 0 or ctr_updates < max_updates:
+                    time.sleep(poll_interval_s)
+    except KeyboardInterrupt:
+        print(f"{fname}(): interrupted")
+    print(f"{fname}(): saved checkpoint '{save_live_checkpoint(live_state)}'")
+    return live_state
+
+
+
+
+
+###############################################################
+### analysis results database
+###############################################################
+
+
+# The analysis results dictionaries (as saved by 'gemse_analysis_aftermath') of many samples can be collected within a SQLite database, e.g., to compare the limits of a specific isotope across all screened samples.
+# Every analysis is identified by its sample ID and analysis timestamp, i.e., re-ingesting an analysis updates the corresponding entries while a newer analysis of the same sample is stored alongside the older one.
+# Usage:
+#     gemseana.ingest_analysis_results("results.sqlite", glob.glob("/path/to/*/*_analysis_results.json"))
+#     th228 = gemseana.query_isotope_results("results.sqlite", input_isotopes=["Th228"], max_upper_limit_bq_per_kg=1e-3)
+#     print(th228["sample_id"], th228["upper_limit_bq_per_kg"])
+
+
+# columns of the 'analyses' and 'isotope_results' tables (keys of the analysis results dictionary) and their SQLite types
+results_database_analysis_columns = {
+    "sample_id" : "TEXT",
+    "datetimestamp" : "TEXT",
+    "analysis_datetime" : "TEXT", # ISO representation of 'datetimestamp' (sortable)
+    "sample_mass_kg" : "REAL",
+    "measurement_time_s" : "REAL",
+    "measurement_time_d" : "REAL",
+    "measurement_time_background_sec" : "REAL",
+    "sample_spectrum" : "TEXT",
+    "background_spectrum" : "TEXT",
+    "simulated_efficiencies" : "TEXT",
+    "energy_resolution" : "TEXT",
+    "calibration_function" : "TEXT",
+    "fractional_uncertainty_efficiencies" : "REAL",
+    "bf_threshold_for_signal" : "REAL",
+    "cl_for_activity_limit" : "REAL",
+    "mca_list_files" : "TEXT", # JSON
+    "mca_list_files_time_windows" : "TEXT"} # JSON
+results_database_isotope_columns = {
+    "isotope" : "TEXT",
+    "bayes_factor" : "REAL",
+    "upper_limit_bq" : "REAL",
+    "activity_bq" : "REAL",
+    "activity_bq_lower" : "REAL",
+    "activity_bq_upper" : "REAL",
+    "upper_limit_bq_per_kg" : "REAL",
+    "activity_bq_per_kg" : "REAL",
+    "activity_bq_lower_per_kg" : "REAL",
+    "activity_bq_upper_per_kg" : "REAL"}
+
+
+# This function is used to open (and if required create) an analysis results database.
+def open_results_database(pathstring_results_database):
+    connection = sqlite3.connect(pathstring_results_database)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute(f"""CREATE TABLE IF NOT EXISTS analyses (
+        analysis_id INTEGER PRIMARY KEY,
+        {", ".join([f"{key} {sqltype}" for key, sqltype in results_database_analysis_columns.items()])},
+        pathstring_source TEXT,
+        source_mtime_ns INTEGER,
+        ingested TEXT,
+        UNIQUE(sample_id, datetimestamp))""")
+    connection.execute(f"""CREATE TABLE IF NOT EXISTS isotope_results (
+        analysis_id INTEGER NOT NULL REFERENCES analyses(analysis_id) ON DELETE CASCADE,
+        {", ".join([f"{key} {sqltype}" for key, sqltype in results_database_isotope_columns.items()])},
+        PRIMARY KEY (analysis_id, isotope))""")
+    connection.execute("CREATE INDEX IF NOT EXISTS analyses_sample_id ON analyses (sample_id, analysis_datetime)")
+    connection.execute("CREATE INDEX IF NOT EXISTS isotope_results_limit ON isotope_results (isotope, upper_limit_bq_per_kg)")
+    connection.execute("CREATE INDEX IF NOT EXISTS isotope_results_activity ON isotope_results (isotope, activity_bq_per_kg)")
+    connection.commit()
+    return connection
+
+
+# This function is used to convert an entry of the analysis results dictionary into the value stored in the database (the dictionary mostly contains strings and uses "" for missing values).
+def conv_analysis_results_value(value, sqltype):
+    if value == "" or value == None:
+        return None
+    if sqltype == "REAL":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if type(value) in [list, dict]:
+        return json.dumps(value)
+    return str(value)
+
+
+# This function is used to ingest analysis results dictionaries (or the pathstrings of the '.json' files they are saved in) into the database.
+# Analyses already contained in the database (same sample ID and analysis timestamp) are updated, '.json' files that did not change since their last ingestion are skipped (unless 'flag_force' is set).
+# It returns the number of ingested analyses.
+def ingest_analysis_results(
+    pathstring_results_database, # pathstring referring to the SQLite database
+    input_analysis_results, # list of analysis results dictionaries and/or pathstrings referring to '.json' files
+    flag_force = False): # flag indicating whether unchanged '.json' files are supposed to be ingested nevertheless
+
+    fname = "ingest_analysis_results"
+    connection = open_results_database(pathstring_results_database)
+    n_ingested = 0
+    with connection:
+        for analysis_results in input_analysis_results:
+            # loading the analysis results dictionary
+            pathstring_source = None
+            source_mtime_ns = None
+            if type(analysis_results) == str:
+                pathstring_source = os.path.abspath(analysis_results)
+                source_mtime_ns = os.stat(pathstring_source).st_mtime_ns
+                if flag_force == False and connection.execute("SELECT 1 FROM analyses WHERE pathstring_source=? AND source_mtime_ns=?", (pathstring_source, source_mtime_ns)).fetchone() != None:
+                    continue
+                with open(pathstring_source, "r") as json_input_file:
+                    analysis_results = json.load(json_input_file)
+            # upserting the analysis
+            analysis_values = {key : conv_analysis_results_value(analysis_results.get(key, ""), sqltype) for key, sqltype in results_database_analysis_columns.items()}
+            try:
+                analysis_values["analysis_datetime"] = datetime.datetime.strptime(analysis_results["datetimestamp"], "%d-%m-%Y %H:%M:%S").isoformat()
+            except (KeyError, ValueError):
+                analysis_values["analysis_datetime"] = analysis_values["datetimestamp"]
+            analysis_values.update({"pathstring_source" : pathstring_source, "source_mtime_ns" : source_mtime_ns, "ingested" : datetime.datetime.now().isoformat()})
+            row = connection.execute("SELECT analysis_id FROM analyses WHERE sample_id=? AND datetimestamp=?", (analysis_values["sample_id"], analysis_values["datetimestamp"])).fetchone()
+            if row == None:
+                analysis_id = connection.execute(f"INSERT INTO analyses ({', '.join(analysis_values.keys())}) VALUES ({', '.join(['?']*len(analysis_values))})", list(analysis_values.values())).lastrowid
+            else:
+                analysis_id = row[0]
+                connection.execute(f"UPDATE analyses SET {', '.join([key +'=?' for key in analysis_values.keys()])} WHERE analysis_id=?", list(analysis_values.values()) +[analysis_id])
+                connection.execute("DELETE FROM isotope_results WHERE analysis_id=?", (analysis_id,))
+            # inserting the isotope results
+            for isotope, isotope_data in analysis_results.get("isotope_data", {}).items():
+                isotope_values = {key : conv_analysis_results_value(isotope_data.get(key, ""), sqltype) for key, sqltype in results_database_isotope_columns.items() if key != "isotope"}
+                connection.execute(
+                    f"INSERT INTO isotope_results (analysis_id, isotope, {', '.join(isotope_values.keys())}) VALUES (?, ?, {', '.join(['?']*len(isotope_values))})",
+                    [analysis_id, isotope] +list(isotope_values.values()))
+            n_ingested += 1
+    connection.close()
+    print(f"{fname}(): ingested {n_ingested} analyses into '{pathstring_results_database}'")
+    return n_ingested
+
+
+# This function is used to execute an arbitrary SELECT statement on the database, the result is returned as a NumPy record array (NULL values of numeric columns are converted to NaN).
+def query_results_database(pathstring_results_database, query_string, query_parameters=()):
+    connection = open_results_database(pathstring_results_database)
+    cursor = connection.execute(query_string, query_parameters)
+    names = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+    connection.close()
+    sqltypes = {**results_database_analysis_columns, **results_database_isotope_columns}
+    dtype = []
+    for i, name in enumerate(names):
+        if sqltypes.get(name) == "REAL":
+            dtype.append((name, np.float64))
+        elif name in ["analysis_id", "source_mtime_ns"]:
+            dtype.append((name, np.int64))
+        else:
+            dtype.append((name, np.str_, max([1] +[len(str(row[i])) for row in rows if row[i] != None])))
+    records = [tuple([(np.nan if dtype[i][1] == np.float64 else "") if value == None else value for i, value in enumerate(row)]) for row in rows]
+    return np.rec.array(np.array(records, dtype=dtype))
+
+
+# This function is used to query the isotope results of the database, e.g., 'query_isotope_results(db, input_isotopes=["Th228"], max_upper_limit_bq_per_kg=1e-3)' returns all samples with a Th228 upper limit below 1 mBq/kg.
+# It returns a NumPy record array with one entry per analysis and isotope containing the analysis metadata and the isotope results.
+def query_isotope_results(
+    pathstring_results_database, # pathstring referring to the SQLite database
+    input_isotopes = [], # isotopes of interest (all isotopes by default)
+    input_sample_ids = [], # sample IDs of interest (all samples by default)
+    max_upper_limit_bq_per_kg = None, # only upper limits below this value are returned (detected activities are excluded)
+    min_activity_bq_per_kg = None, # only detected activities above this value are returned (upper limits are excluded)
+    flag_detected_only = False, # flag indicating whether only detected activities (i.e., no upper limits) are supposed to be returned
+    flag_latest_only = True): # flag indicating whether only the most recent analysis of every sample is supposed to be returned
+
+    conditions = []
+    query_parameters = []
+    if input_isotopes != []:
+        conditions.append(f"i.isotope IN ({', '.join(['?']*len(input_isotopes))})")
+        query_parameters += list(input_isotopes)
+    if input_sample_ids != []:
+        conditions.append(f"a.sample_id IN ({', '.join(['?']*len(input_sample_ids))})")
+        query_parameters += list(input_sample_ids)
+    if max_upper_limit_bq_per_kg != None:
+        conditions.append("i.upper_limit_bq_per_kg < ?")
+        query_parameters.append(max_upper_limit_bq_per_kg)
+    if min_activity_bq_per_kg != None:
+        conditions.append("i.activity_bq_per_kg > ?")
+        query_parameters.append(min_activity_bq_per_kg)
+    if flag_detected_only == True:
+        conditions.append("i.activity_bq IS NOT NULL")
+    if flag_latest_only == True:
+        conditions.append("a.analysis_datetime = (SELECT MAX(b.analysis_datetime) FROM analyses b WHERE b.sample_id = a.sample_id)")
+    query_string = f"""SELECT a.analysis_id, a.sample_id, a.datetimestamp, a.sample_mass_kg, a.measurement_time_s, a.cl_for_activity_limit, {', '.join(['i.' +key for key in results_database_isotope_columns.keys()])}
+        FROM isotope_results i JOIN analyses a ON i.analysis_id = a.analysis_id
+        {"WHERE " +" AND ".join(conditions) if conditions != [] else ""}
+        ORDER BY a.sample_id, a.analysis_datetime, i.isotope"""
+    return query_results_database(pathstring_results_database, query_string, query_parameters)
+
+
+# This function is used to retrieve the analyses (i.e., the sample metadata) stored in the database as a NumPy record array.
+def query_analyses(pathstring_results_database, flag_latest_only=True):
+    query_string = f"SELECT analysis_id, {', '.join(results_database_analysis_columns.keys())}, pathstring_source FROM analyses a"
+    if flag_latest_only == True:
+        query_string += " WHERE a.analysis_datetime = (SELECT MAX(b.analysis_datetime) FROM analyses b WHERE b.sample_id = a.sample_id)"
+    return query_results_database(pathstring_results_database, query_string +" ORDER BY a.sample_id, a.analysis_datetime")
+
+
+
+
+
 ###############################################################
 ### PTFEsc-specific analysis stuff
 ###############################################################
@@ -682,7 +3716,10 @@ if getpass.getuser() == "daniel":
         input_pathstring_json_output, # pathstring referring to the output .json file
         input_pathstrings_spectrum_plot, # pathstrings referring to the output commented spectrum plot
         flag_config = ["default"][0],
-        input_ylim = ""): # keywords passed on to the 'ax1.set_ylim()' function call
+        input_ylim = "", # keywords passed on to the 'ax1.set_ylim()' function call
+        input_pathstring_results_database = "", # pathstring referring to the analysis results database the results are ingested into (see 'ingest_analysis_results'), an empty string disables the ingestion
+        max_workers = 1, # number of worker processes rendering the figure variants (1 renders them within this process)
+        input_figure_tasks = None): # if a list is passed on, the figure tasks are appended to it instead of being rendered (see 'gemse_analysis_aftermath_batch')
 
         """
         This function is used to provide a all-in-one function call automatically generating an elaborate summarizing output of the GeMSE analysis of a specific sample.
@@ -690,74 +3727,18 @@ if getpass.getuser() == "daniel":
         """
         
         ### storing the information from the analysis summary file in a dictionary
-        analysis_dictionary = {
-            "mca_list_files" : input_filenames,
-            "mca_list_files_time_windows" : input_time_windows,
-            "sample_mass_kg" : input_sample_mass,
-            "calibration_function" : list(input_pathstring_calibration_function.split("/"))[-1],
-            "isotope_data" : {}}
-        with open(input_pathstring_gemse_analysis_summary, 'r') as gemse_analysis_summary_file:
-            flag_isotope_results = False
-            for i, line in enumerate(gemse_analysis_summary_file, start=1):
-                line_list = list(line.split())
-                # extracting parameters
-                if i==2:
-                    analysis_dictionary.update({"datetimestamp" : line_list[0] +" " +line_list[1]})
-                elif "sample name" in line:
-                    analysis_dictionary.update({"sample_id" : list(line_list[2].split("/"))[-1]})
-                elif "sample spectrum" in line:
-                    analysis_dictionary.update({"sample_spectrum" : list(line_list[2].split("/"))[-1]})
-                elif "background spectrum" in line:
-                    analysis_dictionary.update({"background_spectrum" : list(line_list[2].split("/"))[-1]})
-                elif "simulated efficiencies" in line:
-                    analysis_dictionary.update({"simulated_efficiencies" : list(line_list[2].split("/"))[-1]})
-                elif "fractional uncertainty efficiencies" in line:
-                    analysis_dictionary.update({"fractional_uncertainty_efficiencies" : line_list[3]})
-                elif "energy resolution" in line:
-                    analysis_dictionary.update({"energy_resolution" : list(line_list[2].split("/"))[-1]})
-                elif "measurement time sample" in line:
-                    analysis_dictionary.update({"measurement_time_s" : line_list[3]})
-                    analysis_dictionary.update({"measurement_time_d" : float(line_list[3]) / (60*60*24)})
-                elif "measurement time background" in line:
-                    analysis_dictionary.update({"measurement_time_background_sec" : line_list[3]})
-                elif "BF threshold for signal" in line:
-                    analysis_dictionary.update({"bf_threshold_for_signal" : line_list[4]})
-                elif "CL for activity limit" in line:
-                    analysis_dictionary.update({"cl_for_activity_limit" : line_list[4]})
-                # extracting isotope limits/activities
-                elif flag_isotope_results == True:
-                    isotope = line_list[0]
-                    analysis_dictionary["isotope_data"].update({
-                        isotope : {
-                            "bayes_factor" : line_list[-1],
-                            "upper_limit_bq" : "",
-                            "activity_bq" : "",
-                            "activity_bq_lower" : "",
-                            "activity_bq_upper" : "",
-                            "upper_limit_bq_per_kg" : "",
-                            "activity_bq_per_kg" : "",
-                            "activity_bq_lower_per_kg" : "",
-                            "activity_bq_upper_per_kg" : ""}})
-                    if len(line_list) == 4 and "<" in line_list:
-                        analysis_dictionary["isotope_data"][isotope]["upper_limit_bq"] = float(line_list[2])
-                        analysis_dictionary["isotope_data"][isotope]["upper_limit_bq_per_kg"] = float(line_list[2]) / analysis_dictionary["sample_mass_kg"]
-                    elif len(line_list) == 7 and "-" in line_list and "+" in line_list:
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq"] = line_list[1]
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq_lower"] = line_list[3]
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq_upper"] = line_list[5]
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq_per_kg"] = float(line_list[1]) / analysis_dictionary["sample_mass_kg"]
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq_lower_per_kg"] = float(line_list[3]) / analysis_dictionary["sample_mass_kg"]
-                        analysis_dictionary["isotope_data"][isotope]["activity_bq_upper_per_kg"] = float(line_list[5]) / analysis_dictionary["sample_mass_kg"]
-                    else:
-                        raise Exception(f"something went wrong: {line_list}")
-                elif "Isotope" in line and "Activity (Bq)" in line and "Bayes Factor" in line:
-                    flag_isotope_results = True
-                else:
-                    continue
+        analysis_dictionary = gen_analysis_results_dictionary(
+            summary_record = parse_activities_summary(input_pathstring_gemse_analysis_summary),
+            input_filenames = input_filenames,
+            input_time_windows = input_time_windows,
+            input_sample_mass = input_sample_mass,
+            input_pathstring_calibration_function = input_pathstring_calibration_function)
 
         ### saving the analysis results dictionary as a .json file
         with open(input_pathstring_json_output, "w") as json_output_file:
             json.dump(analysis_dictionary, json_output_file, indent=4)
+        if input_pathstring_results_database != "":
+            ingest_analysis_results(input_pathstring_results_database, [input_pathstring_json_output])
 
         ### generating the wiki syntax output file
         with open(input_pathstring_wiki_syntax_output, 'w+') as output_file:
@@ -792,91 +3773,112 @@ if getpass.getuser() == "daniel":
             output_file.write(f"| ::: | {write_string_isotopes[:-4]} | {write_string_activity[:-4]} | {write_string_bayes_factor[:-4]} |\n\n")
         print(f"gemse_analysis_aftermath(): saved {input_pathstring_wiki_syntax_output}")
 
-        ### generating the commented spectrum output plot
-        for flag_plot in ["plain","commented_summary"]:#, "commented_internal"]:
-            # extracting the data from the added spectrum root file
-            added_root_spectrum = uproot.open(input_pathstring_added_root_spectrum)
-            hist = added_root_spectrum["hist"]
-            bin_edges = hist.axis().edges() # aequidistant engergy bin edges
-            bin_centers = [bin_edges[i] +0.5*(bin_edges[i+1]-bin_edges[i]) for i in range(len(bin_edges)-1)]
-            counts = list(hist.values()) # number of counts per energy bin
-            counts_errors = list(hist.errors()) # 
-            # figure formatting
-            fig, ax1 = plt.subplots(figsize=miscfig.image_format_dict["talk"]["figsize"], dpi=150)
-            #y_lim = [0, 1.1*(max(counts) +max(counts_errors))]
-            x_lim = [bin_edges[0], bin_edges[-1]]
-            ax1.set_xlim(x_lim)
-            ax1.set_yscale('log')
-            if input_ylim != "":
-                ax1.set_ylim(input_ylim)
-            ax1.yaxis.set_ticklabels([], minor=True)
-            ax1.set_xlabel("energy deposition / $\mathrm{keV}$")
-            binwidth = float(bin_centers[2]-bin_centers[1])
-            ax1.set_ylabel("entries per " +f"${binwidth:.1f}" +r"\,\mathrm{keV}$")
-            # plotting the stepized histogram
-            bin_centers, counts, counts_errors_lower, counts_errors_upper, bin_centers_mod, counts_mod = monxeana.stepize_histogram_data(
-                bincenters = bin_centers,
-                counts = counts,
-                counts_errors_lower = counts_errors,
-                counts_errors_upper = counts_errors,
-                flag_addfirstandlaststep = True)
-            plt.plot(
-                bin_centers_mod,
-                counts_mod,
-                linewidth = 0.2,
-                color = "black",
-                linestyle='-',
-                zorder=1,
-                label="jfk")
-            plt.fill_between(
-                bin_centers,
-                counts-counts_errors_lower,
-                counts+counts_errors_upper,
-                color = gemse_mint,
-                alpha = 1,
-                zorder = 0,
-                interpolate = True)
-            # annotations
-            if flag_plot == "commented_summary":
-                comment_list_sample = [r"\texttt{" +analysis_dictionary['sample_id'].replace("_","\_") +r"} ($" +f"{analysis_dictionary['sample_mass_kg']:.1f}" +r"\,\mathrm{kg},\," +f"{analysis_dictionary['measurement_time_d']:.1f}" +r"\,\mathrm{d}" +"$)"]
-                comment_list_files = [r"   \texttt{" +f.replace("_","\_") +r"}" for i,f in enumerate(input_filenames)]
-                comment_list_results = [
-                    r"$" +conv_isotope_string_to_latex_syntax(key) +r"$: $<" +conv_scifloat_string_to_latex_syntax(format((float(analysis_dictionary['isotope_data'][key]["upper_limit_bq"])/input_sample_mass), ".2e")) +r"\,\mathrm{Bq/kg}$" 
-                    if analysis_dictionary['isotope_data'][key]["upper_limit_bq"] != "" 
-#                    else "" 
-                    else r"$" +conv_isotope_string_to_latex_syntax(key) +r"$: $(" +f"{match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[0][0]}" +r"^{+" +f"{match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[1][0]}" +r"}" +r"_{-" +f"{match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[2][0]}" +r"})\cdot 10^{" +f"{match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[0][1]}" +"}" +r"\,\mathrm{Bq/kg}$" 
-                    for i,key in enumerate(analysis_dictionary['isotope_data'].keys())]
-#mean base: match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[0][0]
-#mean expo: match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[0][1]
-#upper base: match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[1][0]
-#lower base: match_exponents_and_precision_to_mean(analysis_dictionary['isotope_data'][key]['activity_bq_per_kg'], 2, [analysis_dictionary['isotope_data'][key]['activity_bq_upper_per_kg'], analysis_dictionary['isotope_data'][key]['activity_bq_lower_per_kg']])[2][0]
-                monxeana.annotate_comments(
-                    comment_ax = ax1,
-                    comment_list = comment_list_sample,
-                    comment_textpos = [0.025, 0.930],
-                    comment_textcolor = "black",
-                    comment_linesep = 0.1,
-                    comment_fontsize = 11)
-                monxeana.annotate_comments(
-                    comment_ax = ax1,
-                    comment_list = comment_list_results,
-                    comment_textpos = [0.970, 0.930],
-                    comment_textcolor = "black",
-                    comment_linesep = 0.083,
-                    comment_fontsize = 9)
-            elif flag_plot == "commented_internal":
-                comment_list_sample = [r"\texttt{" +input_sample_id.replace("_","\_") +r"}"]
-                comment_list_results = ["yey"]
-            # saving the output plot
-            for i in input_pathstrings_spectrum_plot:
-                if i != "":
-                    savepathstring = i[:-4] +"__" +flag_plot +i[-4:]
-                    fig.savefig(savepathstring)
-                    print(f"gemse_analysis_aftermath(): saved {savepathstring}")
+        ### generating the commented spectrum output plots
+        comment_list_sample, comment_list_results = gen_aftermath_annotations(analysis_dictionary, input_sample_mass)
+        figure_tasks = [(flag_plot, input_pathstring_added_root_spectrum, comment_list_sample, comment_list_results, input_ylim, input_pathstrings_spectrum_plot) for flag_plot in ["plain","commented_summary"]]
+        if input_figure_tasks != None:
+            input_figure_tasks += figure_tasks
+        else:
+            render_aftermath_figures(figure_tasks, max_workers)
 
         return input_pathstring_json_output
 
 
+    # This function is used to generate the annotations of the commented spectrum plot, every isotope result is formatted exactly once.
+    def gen_aftermath_annotations(analysis_dictionary, input_sample_mass):
+        comment_list_sample = [r"\texttt{" +analysis_dictionary['sample_id'].replace("_","\_") +r"} ($" +f"{analysis_dictionary['sample_mass_kg']:.1f}" +r"\,\mathrm{kg},\," +f"{analysis_dictionary['measurement_time_d']:.1f}" +r"\,\mathrm{d}" +"$)"]
+        comment_list_results = []
+        for key, isotope_data in analysis_dictionary['isotope_data'].items():
+            if isotope_data["upper_limit_bq"] != "":
+                comment_list_results.append(r"$" +conv_isotope_string_to_latex_syntax(key) +r"$: $<" +conv_scifloat_string_to_latex_syntax(format((float(isotope_data["upper_limit_bq"])/input_sample_mass), ".2e")) +r"\,\mathrm{Bq/kg}$")
+            else:
+                # [[mean base, mean exponent], [upper base, mean exponent], [lower base, mean exponent]]
+                matched = match_exponents_and_precision_to_mean(isotope_data['activity_bq_per_kg'], 2, [isotope_data['activity_bq_upper_per_kg'], isotope_data['activity_bq_lower_per_kg']])
+                comment_list_results.append(r"$" +conv_isotope_string_to_latex_syntax(key) +r"$: $(" +f"{matched[0][0]}" +r"^{+" +f"{matched[1][0]}" +r"}" +r"_{-" +f"{matched[2][0]}" +r"})\cdot 10^{" +f"{matched[0][1]}" +"}" +r"\,\mathrm{Bq/kg}$")
+        return comment_list_sample, comment_list_results
+
+
+    # This function is used to render one variant ('flag_plot') of the (commented) spectrum plot of 'gemse_analysis_aftermath'.
+    # The spectrum is loaded via the memoized 'load_root_spectrum_pyramid', i.e., the root file is opened only once per process, and plotted at the coarsest resolution still resolved at the output pixel width.
+    def render_aftermath_figure(flag_plot, input_pathstring_added_root_spectrum, comment_list_sample, comment_list_results, input_ylim, input_pathstrings_spectrum_plot):
+        # extracting the data from the added spectrum root file
+        pyramid = load_root_spectrum_pyramid(input_pathstring_added_root_spectrum)
+        bin_edges = pyramid[0]["bin_edges"] # aequidistant engergy bin edges
+        # figure formatting
+        fig, ax1 = plt.subplots(figsize=miscfig.image_format_dict["talk"]["figsize"], dpi=150)
+        x_lim = [bin_edges[0], bin_edges[-1]]
+        ax1.set_xlim(x_lim)
+        ax1.set_yscale('log')
+        if input_ylim != "":
+            ax1.set_ylim(input_ylim)
+        ax1.yaxis.set_ticklabels([], minor=True)
+        ax1.set_xlabel("energy deposition / $\mathrm{keV}$")
+        # plotting the coarsest pyramid level still resolved at the output pixel width
+        level = plot_spectrum_pyramid(
+            ax = ax1,
+            pyramid = pyramid,
+            pixel_width = fig.get_figwidth()*fig.dpi,
+            linewidth = 0.2,
+            linecolor = "black",
+            bandcolor = gemse_mint)
+        binwidth = float(level["bin_edges"][2]-level["bin_edges"][1])
+        ax1.set_ylabel("entries per " +f"${binwidth:.1f}" +r"\,\mathrm{keV}$")
+        # annotations
+        if flag_plot == "commented_summary":
+            monxeana.annotate_comments(
+                comment_ax = ax1,
+                comment_list = comment_list_sample,
+                comment_textpos = [0.025, 0.930],
+                comment_textcolor = "black",
+                comment_linesep = 0.1,
+                comment_fontsize = 11)
+            monxeana.annotate_comments(
+                comment_ax = ax1,
+                comment_list = comment_list_results,
+                comment_textpos = [0.970, 0.930],
+                comment_textcolor = "black",
+                comment_linesep = 0.083,
+                comment_fontsize = 9)
+        # saving the output plot
+        savepathstrings = []
+        for i in input_pathstrings_spectrum_plot:
+            if i != "":
+                savepathstring = i[:-4] +"__" +flag_plot +i[-4:]
+                fig.savefig(savepathstring)
+                savepathstrings.append(savepathstring)
+                print(f"gemse_analysis_aftermath(): saved {savepathstring}")
+        plt.close(fig)
+        return savepathstrings
+
+
+    # This function is used to render a figure task within a worker process (using the non-interactive Agg backend).
+    def render_aftermath_figure_with_agg(figure_task):
+        plt.switch_backend("Agg")
+        return render_aftermath_figure(*figure_task)
+
+
+    # This function is used to render figure tasks (i.e., argument tuples of 'render_aftermath_figure'), either within this process or (if 'max_workers' differs from 1) by a pool of worker processes.
+    def render_aftermath_figures(figure_tasks, max_workers=1):
+        if max_workers == 1 or len(figure_tasks) < 2:
+            return [render_aftermath_figure(*figure_task) for figure_task in figure_tasks]
+        max_workers = os.cpu_count() if max_workers == 0 else max_workers
+        # the figure tasks are sorted by spectrum such that the memoized spectra are reused within the worker processes
+        figure_tasks = sorted(figure_tasks, key=lambda figure_task: figure_task[1])
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(render_aftermath_figure_with_agg, figure_tasks, chunksize=max(1, len(figure_tasks)//(2*max_workers))))
+
+
+    # This function is used to generate the aftermath of many samples at once (e.g., all samples of a measurement campaign).
+    # The text outputs (.json, wiki syntax) are generated sequentially (they are cheap), the figures of all samples are then rendered by a pool of 'max_workers' worker processes.
+    def gemse_analysis_aftermath_batch(
+        input_aftermath_kwargs_list, # list of keyword dictionaries, one per sample, passed on to 'gemse_analysis_aftermath'
+        max_workers = 0): # number of worker processes (0 corresponds to 'os.cpu_count()')
+        figure_tasks = []
+        pathstrings_json_output = [gemse_analysis_aftermath(**aftermath_kwargs, input_figure_tasks=figure_tasks) for aftermath_kwargs in input_aftermath_kwargs_list]
+        render_aftermath_figures(figure_tasks, max_workers)
+        return pathstrings_json_output
+
+
     # This function is used to nicely print the analysis results stored in the .json referred to by 'pathstring_analysis_results_dictionary'
     def print_analysis_results_nicely(pathstring_analysis_results_json_pathstring):
 
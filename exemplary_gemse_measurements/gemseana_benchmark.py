@@ -0,0 +1,344 @@
+
+# This Python3 library contains the benchmark suite of 'gemseana', i.e., a generator of synthetic MCA list files and the timing of the loader, veto, cut and spectrum functions.
+# Usage (from within this folder):
+#     python3 gemseana_benchmark.py --n_events 100000 1000000 10000000 --abspath_output_folder /tmp/gemseana_benchmark/
+# Each run is saved as a JSON file; two runs can be compared via 'compare_benchmark_results'.
+
+
+
+###############################################################
+### Imports
+###############################################################
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import gemseana
+
+
+
+
+
+###############################################################
+### Generic Definitions
+###############################################################
+
+
+# header lines as written by the MCA (see the example list file in '2020-12-10_cuboid_04_lanza/')
+synthetic_list_file_header = ["HEADER0:1281", "HEADER1:1792", "HEADER2:513", "HEADER3:1282", "HEADER4:32772"]
+
+# the MCA writes a marker line ('<timestamp> -32768 10') every 2**30 clock cycles (i.e., approximately every 10.7s)
+marker_period_10ns = 2**30
+marker_pulse_height_adc = -32768
+marker_extra = 10
+
+# pulse height distribution of the synthetic signal channel
+synthetic_peak_channels = [1773, 2920, 5300, 7310, 12010] # ADC channels of the synthetic gamma lines
+synthetic_peak_sigma_adc = 6 # width of the synthetic gamma lines
+synthetic_peak_fraction = 0.15 # fraction of events within the gamma lines
+synthetic_negative_fraction = 0.05 # fraction of events with negative pulse height
+synthetic_overflow_fraction = 0.01 # fraction of events with overflowing pulse height (written by the MCA as '32767 16')
+
+# the correlated veto events precede their signal event by 1001 to 2000 clock cycles, i.e., they are vetoed with the default 'get_veto_information' settings (timingoffset=10us, vetowindow=10us)
+synthetic_veto_delay_min_10ns = 1001
+synthetic_veto_delay_max_10ns = 2000
+
+# polynomial energy calibration (keV) utilized for the spectrum benchmarks
+synthetic_calibration = [0.5, 0.2]
+
+
+
+
+
+###############################################################
+### Synthetic MCA List Files
+###############################################################
+
+
+# This function is used to write a structured array (see 'gemseana.timestamp_data_mc2_dtype') to an open list file in the MCA text format ('<timestamp> <pulse height> <extra> \r\n').
+def write_list_file_block(output_file, block):
+    if len(block) == 0:
+        return
+    output_file.write((("%d %d %d \r\n"*len(block)) % tuple(np.column_stack((block["timestamp_10ns"].astype(np.int64), block["pulse_height_adc"], block["extra"])).ravel().tolist())).encode())
+    return
+
+
+# This function is used to generate the marker lines within the timestamp interval [t_min, t_max].
+def gen_marker_block(t_min, t_max):
+    k_min = -(-int(t_min)//marker_period_10ns)
+    k_max = int(t_max)//marker_period_10ns
+    block = np.zeros(shape=max(0, k_max -k_min +1), dtype=gemseana.timestamp_data_mc2_dtype)
+    block["timestamp_10ns"] = np.arange(k_min, k_max +1, dtype=np.uint64)*marker_period_10ns
+    block["pulse_height_adc"] = marker_pulse_height_adc
+    block["extra"] = marker_extra
+    return block
+
+
+# This function is used to merge (physics) events and marker lines according to their timestamps.
+def merge_blocks(block_a, block_b):
+    block = np.concatenate((block_a, block_b))
+    return block[np.argsort(block["timestamp_10ns"], kind="stable")]
+
+
+# This function is used to draw the pulse heights and 'extra' flags of 'n' synthetic signal events.
+def gen_synthetic_pulse_heights(rng, n):
+    pulse_height_adc = np.minimum(rng.exponential(2500, n), 16383).astype(np.int64)
+    extra = np.zeros(n, dtype=np.int32)
+    category = rng.random(n)
+    mask_peak = category < synthetic_peak_fraction
+    pulse_height_adc[mask_peak] = np.clip(np.rint(rng.normal(rng.choice(synthetic_peak_channels, np.count_nonzero(mask_peak)), synthetic_peak_sigma_adc)), 0, 16383)
+    mask_negative = (category >= synthetic_peak_fraction) & (category < synthetic_peak_fraction +synthetic_negative_fraction)
+    pulse_height_adc[mask_negative] = -rng.integers(1, 2000, np.count_nonzero(mask_negative))
+    mask_overflow = category >= 1 -synthetic_overflow_fraction
+    pulse_height_adc[mask_overflow] = 32767
+    extra[mask_overflow] = 16
+    return pulse_height_adc, extra
+
+
+# This function is used to generate a synthetic signal list file and a correlated veto list file in the MCA format.
+# The signal events follow a Poisson process with rate 'input_rate_signal_hz', a fraction 'input_correlated_fraction' of them is preceded by a veto event (see 'synthetic_veto_delay_*'), in addition uncorrelated veto events are generated with rate 'input_rate_veto_hz'.
+# The events are generated and written in chunks of 'input_chunk_events' events, i.e., also files with 1e9 events can be generated without loading them into the RAM.
+# Note that 'n_events' refers to the physics events of the signal file, the marker lines are added on top.
+def gen_synthetic_list_files(
+    pathstring_signal_file, # pathstring of the generated signal list file
+    pathstring_veto_file, # pathstring of the generated veto list file
+    n_events, # number of signal events
+    input_seed = 0, # seed of the random number generator (the generated files are reproducible)
+    input_rate_signal_hz = 1000, # rate of the signal events
+    input_rate_veto_hz = 200, # rate of the uncorrelated veto events
+    input_correlated_fraction = 0.1, # fraction of signal events preceded by a veto event
+    input_chunk_events = 10**6): # number of signal events generated at once
+
+    # initial definitions
+    fname = "gen_synthetic_list_files"
+    t_i = time.perf_counter()
+    rng = np.random.default_rng(input_seed)
+    statistics_dict = {
+        "pathstring_signal_file" : pathstring_signal_file,
+        "pathstring_veto_file" : pathstring_veto_file,
+        "seed" : input_seed,
+        "n_events" : n_events,
+        "n_markers" : 0,
+        "n_veto_events" : 0,
+        "n_correlated" : 0}
+    t_last = 0 # timestamp of the last generated signal event
+    t_marker_signal = 1 # timestamp from which on the next marker lines of the signal file are generated
+    t_marker_veto = 1 # same for the veto file
+    veto_carry = np.zeros(shape=0, dtype=gemseana.timestamp_data_mc2_dtype) # veto events that might still be preceded by veto events of the next chunk
+
+    # generating the events chunk by chunk
+    with open(pathstring_signal_file, "wb") as signal_file, open(pathstring_veto_file, "wb") as veto_file:
+        for output_file in [signal_file, veto_file]:
+            output_file.write(("\r\n".join(synthetic_list_file_header) +"\r\n").encode())
+        for i_start in range(0, n_events, input_chunk_events):
+            n = min(input_chunk_events, n_events -i_start)
+            flag_last_chunk = i_start +n == n_events
+
+            # signal events
+            signal_chunk = np.zeros(shape=n, dtype=gemseana.timestamp_data_mc2_dtype)
+            signal_chunk["timestamp_10ns"] = t_last +np.cumsum(np.maximum(1, rng.exponential(10**8/input_rate_signal_hz, n)).astype(np.uint64))
+            signal_chunk["pulse_height_adc"], signal_chunk["extra"] = gen_synthetic_pulse_heights(rng, n)
+            t_previous, t_last = t_last, int(signal_chunk["timestamp_10ns"][-1])
+            marker_chunk = gen_marker_block(t_marker_signal, t_last)
+            t_marker_signal = t_last +1
+            write_list_file_block(signal_file, merge_blocks(signal_chunk, marker_chunk))
+            statistics_dict["n_markers"] += len(marker_chunk)
+
+            # veto events (correlated and uncorrelated)
+            delays = rng.integers(synthetic_veto_delay_min_10ns, synthetic_veto_delay_max_10ns +1, n).astype(np.uint64)
+            mask_correlated = (rng.random(n) < input_correlated_fraction) & (signal_chunk["timestamp_10ns"] > delays)
+            t_uncorrelated_min = t_previous +1
+            n_uncorrelated = rng.poisson(input_rate_veto_hz*(t_last -t_previous)/10**8)
+            veto_chunk = np.zeros(shape=np.count_nonzero(mask_correlated) +n_uncorrelated, dtype=gemseana.timestamp_data_mc2_dtype)
+            veto_chunk["timestamp_10ns"] = np.concatenate((signal_chunk["timestamp_10ns"][mask_correlated] -delays[mask_correlated], rng.integers(t_uncorrelated_min, t_last +1, n_uncorrelated).astype(np.uint64)))
+            veto_chunk["pulse_height_adc"] = rng.integers(100, 16384, len(veto_chunk))
+            veto_chunk = merge_blocks(veto_carry, veto_chunk)
+            statistics_dict["n_correlated"] += int(np.count_nonzero(mask_correlated))
+            # veto events later than 't_last -synthetic_veto_delay_max_10ns' might be preceded by the veto events of the next chunk and are therefore written afterwards
+            t_veto_written = t_last if flag_last_chunk == True else t_last -synthetic_veto_delay_max_10ns
+            i_split = np.searchsorted(veto_chunk["timestamp_10ns"], np.uint64(max(t_veto_written, 0)), side="right")
+            veto_carry = veto_chunk[i_split:]
+            marker_chunk = gen_marker_block(t_marker_veto, t_veto_written)
+            t_marker_veto = max(t_marker_veto, t_veto_written +1)
+            write_list_file_block(veto_file, merge_blocks(veto_chunk[:i_split], marker_chunk))
+            statistics_dict["n_veto_events"] += int(i_split)
+
+    # end
+    statistics_dict["signal_file_bytes"] = os.path.getsize(pathstring_signal_file)
+    statistics_dict["veto_file_bytes"] = os.path.getsize(pathstring_veto_file)
+    statistics_dict["wall_s"] = time.perf_counter() -t_i
+    print(f"{fname}(): generated {n_events} signal events ({statistics_dict['n_markers']} marker lines) and {statistics_dict['n_veto_events']} veto events ({statistics_dict['n_correlated']} correlated) in {statistics_dict['wall_s']:.1f}s")
+    return statistics_dict
+
+
+
+
+
+###############################################################
+### Benchmarks
+###############################################################
+
+
+# This function is used to time 'stage_function' (the best of 'n_repeats' runs is reported) and to determine its peak memory (i.e., the peak of the memory allocated during an additional run traced via 'tracemalloc').
+# It returns the result of the last run along with the benchmark dictionary.
+def time_stage(stage_name, stage_function, n_events, n_repeats=3, flag_measure_memory=True):
+    wall_s_list = []
+    for i in range(n_repeats):
+        t_i = time.perf_counter()
+        result = stage_function()
+        wall_s_list.append(time.perf_counter() -t_i)
+    peak_mb = None
+    if flag_measure_memory == True:
+        tracemalloc.start()
+        result = stage_function()
+        peak_mb = tracemalloc.get_traced_memory()[1]/2**20
+        tracemalloc.stop()
+    benchmark_dict = {
+        "stage" : stage_name,
+        "n_events" : n_events,
+        "wall_s" : min(wall_s_list),
+        "wall_s_list" : wall_s_list,
+        "events_per_s" : n_events/min(wall_s_list) if min(wall_s_list) > 0 else None,
+        "peak_mb" : peak_mb}
+    return result, benchmark_dict
+
+
+# This function is used to retrieve the metadata of a benchmark run (i.e., everything required to judge whether two runs are comparable).
+def get_benchmark_metadata():
+    try:
+        git_commit = subprocess.run(["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        git_commit = ""
+    return {
+        "datetime" : datetime.datetime.now().isoformat(),
+        "git_commit" : git_commit,
+        "hostname" : platform.node(),
+        "platform" : platform.platform(),
+        "processor" : platform.processor(),
+        "cpu_count" : os.cpu_count(),
+        "python_version" : platform.python_version(),
+        "numpy_version" : np.__version__}
+
+
+# This function is used to run the benchmark suite for all file sizes within 'input_n_events_list'.
+# For every size a synthetic signal and veto list file are generated (or reused if they already exist) and the loader, veto, cut, display and spectrum functions of 'gemseana' are timed.
+# The results are saved as a JSON file ('pathstring_results') and returned as a dictionary.
+# Note that the loader holds the entire signal file in the RAM (approximately 24 bytes per event), i.e., 1e9 events require a machine with more than 50GB of RAM.
+def run_benchmarks(
+    input_n_events_list = [10**5, 10**6], # numbers of signal events of the benchmarked files
+    abspath_output_folder = "./gemseana_benchmark/", # folder containing the synthetic list files, the list file cache and the results
+    pathstring_results = "", # pathstring of the results file, by default 'abspath_output_folder +gemseana_benchmark_<datetime>.json'
+    n_repeats = 3, # number of timed runs per stage (the fastest one is reported)
+    input_seed = 0, # seed of the synthetic list files
+    flag_measure_memory = True, # flag indicating whether the peak memory of every stage is supposed to be measured (requires one additional run per stage)
+    flag_keep_files = True): # flag indicating whether the synthetic list files are kept (and reused by subsequent runs)
+
+    # initial definitions
+    fname = "run_benchmarks"
+    os.makedirs(abspath_output_folder, exist_ok=True)
+    abspath_cache = abspath_output_folder +"list_file_cache/"
+    if pathstring_results == "":
+        pathstring_results = abspath_output_folder +"gemseana_benchmark_" +datetime.datetime.now().strftime("%Y%m%d_%H%M%S") +".json"
+    results_dict = {"metadata" : get_benchmark_metadata(), "files" : [], "benchmarks" : []}
+
+    # looping over the file sizes
+    for n_events in input_n_events_list:
+        print(f"{fname}(): benchmarking {n_events} events")
+        pathstring_signal_file = abspath_output_folder +f"synthetic_signal_{n_events}_seed{input_seed}.txt"
+        pathstring_veto_file = abspath_output_folder +f"synthetic_veto_{n_events}_seed{input_seed}.txt"
+        if flag_keep_files == True and os.path.isfile(pathstring_signal_file) and os.path.isfile(pathstring_veto_file):
+            print(f"{fname}(): reusing '{pathstring_signal_file}'")
+            results_dict["files"].append({"pathstring_signal_file" : pathstring_signal_file, "pathstring_veto_file" : pathstring_veto_file, "n_events" : n_events, "seed" : input_seed})
+        else:
+            results_dict["files"].append(gen_synthetic_list_files(pathstring_signal_file, pathstring_veto_file, n_events, input_seed))
+
+        # timing the stages
+        benchmarks = []
+        signal_data, b = time_stage("get_timestamp_data_as_ndarray", lambda: gemseana.get_timestamp_data_as_ndarray(pathstring_signal_file), n_events, n_repeats, flag_measure_memory)
+        benchmarks.append(b)
+        veto_data = gemseana.get_timestamp_data_as_ndarray(pathstring_veto_file, flag_use_cache=True, input_abspath_cache=abspath_cache)
+        gemseana.get_timestamp_data_as_ndarray(pathstring_signal_file, flag_use_cache=True, input_abspath_cache=abspath_cache)
+        benchmarks.append(time_stage("get_timestamp_data_as_ndarray (cached)", lambda: gemseana.get_timestamp_data_as_ndarray(pathstring_signal_file, flag_use_cache=True, input_abspath_cache=abspath_cache), n_events, n_repeats, flag_measure_memory)[1])
+        signal_data, b = time_stage("get_veto_information", lambda: gemseana.get_veto_information(signal_data, veto_data), n_events, n_repeats, flag_measure_memory)
+        benchmarks.append(b)
+        signal_data, b = time_stage("get_cut_information", lambda: gemseana.get_cut_information(signal_data), n_events, n_repeats, flag_measure_memory)
+        benchmarks.append(b)
+        benchmarks.append(time_stage("display_signal_file_properties", lambda: gemseana.display_signal_file_properties(signal_data), n_events, n_repeats, flag_measure_memory)[1])
+        benchmarks.append(time_stage("get_energy_spectrum", lambda: gemseana.get_energy_spectrum(signal_data, synthetic_calibration), n_events, n_repeats, flag_measure_memory)[1])
+        benchmarks.append(time_stage("get_time_index", lambda: gemseana.get_time_index(signal_data), n_events, n_repeats, flag_measure_memory)[1])
+        vetoed = gemseana.get_signal_file_statistics(signal_data)["vetoed"]
+        if vetoed < results_dict["files"][-1].get("n_correlated", 0):
+            raise Exception(f"{fname}(): only {vetoed} events were vetoed although {results_dict['files'][-1]['n_correlated']} correlated veto events were generated")
+        for b in benchmarks:
+            print(f"{fname}(): {b['stage']:<40} {b['wall_s']:>8.3f}s {b['events_per_s']:>14.3e} events/s" +(f" {b['peak_mb']:>10.1f} MB" if b["peak_mb"] != None else ""))
+        results_dict["benchmarks"] += benchmarks
+        del signal_data, veto_data
+        if flag_keep_files == False:
+            for pathstring in [pathstring_signal_file, pathstring_veto_file]:
+                os.remove(pathstring)
+
+    # saving the results
+    results_dict["metadata"]["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024
+    with open(pathstring_results, "w") as results_file:
+        json.dump(results_dict, results_file, indent=4)
+    print(f"{fname}(): saved results in '{pathstring_results}'")
+    return results_dict
+
+
+# This function is used to compare two benchmark runs (e.g., before and after a change), i.e., the throughputs of all stages and file sizes contained in both results files are printed along with their ratio.
+def compare_benchmark_results(pathstring_results_old, pathstring_results_new):
+    with open(pathstring_results_old) as results_file:
+        results_old = json.load(results_file)
+    with open(pathstring_results_new) as results_file:
+        results_new = json.load(results_file)
+    benchmarks_old = {(b["stage"], b["n_events"]) : b for b in results_old["benchmarks"]}
+    comparison_list = []
+    print(f"{'stage':<40} {'events':>12} {'old / events/s':>15} {'new / events/s':>15} {'new/old':>8}")
+    for b in results_new["benchmarks"]:
+        if (b["stage"], b["n_events"]) not in benchmarks_old:
+            continue
+        b_old = benchmarks_old[(b["stage"], b["n_events"])]
+        ratio = b["events_per_s"]/b_old["events_per_s"] if b["events_per_s"] != None and b_old["events_per_s"] != None else None
+        comparison_list.append({"stage" : b["stage"], "n_events" : b["n_events"], "events_per_s_old" : b_old["events_per_s"], "events_per_s_new" : b["events_per_s"], "ratio" : ratio})
+        print(f"{b['stage']:<40} {b['n_events']:>12} {b_old['events_per_s']:>15.3e} {b['events_per_s']:>15.3e} {ratio:>8.2f}")
+    return comparison_list
+
+
+
+
+
+###############################################################
+### Command Line Interface
+###############################################################
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="gemseana benchmark suite")
+    parser.add_argument("--n_events", type=int, nargs="+", default=[10**5, 10**6], help="numbers of signal events of the benchmarked files")
+    parser.add_argument("--abspath_output_folder", default="./gemseana_benchmark/", help="folder containing the synthetic list files and the results")
+    parser.add_argument("--pathstring_results", default="", help="pathstring of the results file")
+    parser.add_argument("--n_repeats", type=int, default=3, help="number of timed runs per stage")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic list files")
+    parser.add_argument("--no_memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--remove_files", action="store_true", help="remove the synthetic list files afterwards")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files instead of running the benchmarks")
+    args = parser.parse_args()
+    if args.compare != None:
+        compare_benchmark_results(*args.compare)
+        sys.exit(0)
+    run_benchmarks(
+        input_n_events_list = args.n_events,
+        abspath_output_folder = args.abspath_output_folder if args.abspath_output_folder.endswith("/") else args.abspath_output_folder +"/",
+        pathstring_results = args.pathstring_results,
+        n_repeats = args.n_repeats,
+        input_seed = args.seed,
+        flag_measure_memory = not args.no_memory,
+        flag_keep_files = not args.remove_files)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 'gemseana' is not an installed package, it is imported from the folder of the exemplary measurements (just as within the notebook)
+abspath_gemseana = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exemplary_gemse_measurements")
+sys.path.insert(0, abspath_gemseana)
@@ -0,0 +1,86 @@
+import numpy as np
+
+import gemseana
+
+
+header_list = [1, 2, 3, 4, 5, 6, 7, 8]
+
+
+def write_list_file(pathstring, n_events=2000, seed=0):
+    rng = np.random.RandomState(seed)
+    timestamp_data = np.zeros(n_events, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = np.cumsum(rng.randint(1, 10**6, n_events))
+    timestamp_data["pulse_height_adc"] = rng.randint(1000, 9999, n_events)
+    gemseana.gen_pseudo_list_file(pathstring, header_list, timestamp_data)
+    return timestamp_data
+
+
+def replace_bytes(pathstring, old, new):
+    with open(pathstring, "rb") as input_file:
+        body = input_file.read()
+    assert body.count(old) == 1
+    with open(pathstring, "wb") as output_file:
+        output_file.write(body.replace(old, new))
+
+
+def test_identical_files(tmp_path):
+    write_list_file(str(tmp_path / "a.txt"))
+    write_list_file(str(tmp_path / "b.txt"))
+    summary_dict = gemseana.compare_list_files(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"), block_bytes=4096)
+    assert summary_dict["identical"] == True
+    assert summary_dict["method"] == "block_hashes"
+    assert summary_dict["n_events_a"] == summary_dict["n_events_b"] == 2000
+
+
+def test_mismatching_blocks_are_compared(tmp_path):
+    timestamp_data = write_list_file(str(tmp_path / "a.txt"))
+    write_list_file(str(tmp_path / "b.txt"))
+    for i in [3, 1500]:
+        old = f"\n{timestamp_data['timestamp_10ns'][i]} {timestamp_data['pulse_height_adc'][i]} 0 ".encode()
+        replace_bytes(str(tmp_path / "b.txt"), old, old.replace(f" {timestamp_data['pulse_height_adc'][i]} ".encode(), b" 1234 "))
+    summary_dict = gemseana.compare_list_files(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"), block_bytes=4096)
+    assert summary_dict["method"] == "block_hashes"
+    assert summary_dict["n_mismatching_blocks"] == 2
+    assert summary_dict["n_events_a"] == summary_dict["n_events_b"] == 2000
+    assert summary_dict["n_different_events"] == summary_dict["n_different_pulse_height_adc"] == 2
+    assert [d["line_index"] for d in summary_dict["first_differences"]] == [len(header_list) +3, len(header_list) +1500]
+    assert [d["b"][1] for d in summary_dict["first_differences"]] == [1234, 1234]
+    assert summary_dict["identical"] == False
+
+
+def test_shifted_events_are_compared_entirely(tmp_path):
+    timestamp_data = write_list_file(str(tmp_path / "a.txt"))
+    write_list_file(str(tmp_path / "b.txt"))
+    # merging two events into one line of the same size shifts all subsequent events
+    old = f" 0 \n{timestamp_data['timestamp_10ns'][10]} ".encode()
+    replace_bytes(str(tmp_path / "b.txt"), old, b" 0  " +old[4:])
+    summary_dict = gemseana.compare_list_files(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"), block_bytes=4096)
+    assert summary_dict["method"] == "numeric"
+    assert summary_dict["n_events_a"] == 2000
+    assert summary_dict["identical"] == False
+
+
+def test_difference_line_index_does_not_depend_on_block_bytes(tmp_path):
+    for name, value in [("a.txt", b"\n2 3 0 \n"), ("b.txt", b"\n2 4 0 \n")]:
+        with open(str(tmp_path / name), "wb") as f:
+            f.write(b"HEADER0:1\n0 1 0 \n\n1 2 0 " +value +b"3 4 0 ")
+    line_indices = []
+    for block_bytes in [8, 2**26]:
+        summary_dict = gemseana.compare_list_files(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"), block_bytes=block_bytes)
+        assert summary_dict["method"] == "block_hashes"
+        assert summary_dict["n_different_events"] == 1
+        line_indices.append(summary_dict["first_differences"][0]["line_index"])
+    # the differing line is the fifth line of the file
+    assert line_indices == [4, 4]
+
+
+def test_bad_line_in_one_file_is_compared_entirely(tmp_path):
+    with open(str(tmp_path / "a.txt"), "wb") as f:
+        f.write(b"HEADER0:1\n0 1 0 \n1 2 0 \n2 3 0 \n3 4 0 ")
+    with open(str(tmp_path / "b.txt"), "wb") as f:
+        f.write(b"HEADER0:1\n0 1 0 \n1 2 x \n2 3 0 \n3 4 0 ")
+    summary_dict = gemseana.compare_list_files(str(tmp_path / "a.txt"), str(tmp_path / "b.txt"))
+    assert summary_dict["method"] == "numeric"
+    assert summary_dict["n_events_a"] == 4
+    assert summary_dict["n_events_b"] == 3
+    assert summary_dict["identical"] == False
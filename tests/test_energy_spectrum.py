@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import gemseana
+
+
+def gen_timestamp_data(n_events=5000, seed=0):
+    rng = np.random.RandomState(seed)
+    timestamp_data = np.zeros(n_events, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = np.sort(rng.randint(0, 10*3600*10**8, n_events)).astype(np.uint64)
+    timestamp_data["pulse_height_adc"] = rng.randint(-100, gemseana.n_adc_channels +100, n_events)
+    return timestamp_data
+
+
+def assert_spectra_equal(spectrum_dict_a, spectrum_dict_b):
+    assert np.array_equal(spectrum_dict_a["bin_edges"], spectrum_dict_b["bin_edges"])
+    assert np.array_equal(spectrum_dict_a["counts"], spectrum_dict_b["counts"])
+    assert spectrum_dict_a["t_live_s"] == spectrum_dict_b["t_live_s"]
+
+
+@pytest.mark.parametrize("input_time_window", [[0,0], [1000., 20000.], [30000., 10**6]])
+@pytest.mark.parametrize("input_bin_edges", [[], np.linspace(0., 3000., 301)])
+def test_chunked_spectrum_matches_in_memory_spectrum(tmp_path, input_time_window, input_bin_edges):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    gemseana.gen_pseudo_list_file(pathstring_data, [1, 2, 3], gen_timestamp_data())
+    timestamp_data = gemseana.get_timestamp_data_as_ndarray(pathstring_data)
+    calibration = np.array([0.5, 0.2])
+    spectrum_dict = gemseana.get_energy_spectrum(timestamp_data, calibration, input_time_window, input_bin_edges)
+    assert spectrum_dict["t_live_s"] > 0
+    # parsing the list file chunk by chunk
+    chunks = gemseana.iter_list_file_chunks(pathstring_data, chunk_events=333, input_chunk_bytes=2**12)
+    assert_spectra_equal(gemseana.get_energy_spectrum(chunks, calibration, input_time_window, input_bin_edges), spectrum_dict)
+    # the chunks themselves, without the header lists
+    chunks = [c for h, c in gemseana.iter_list_file_chunks(pathstring_data, chunk_events=1000)]
+    assert sum([len(c) for c in chunks]) == len(timestamp_data)
+    assert_spectra_equal(gemseana.get_energy_spectrum(chunks, calibration, input_time_window, input_bin_edges), spectrum_dict)
+
+
+def test_chunked_spectrum_excludes_cut_and_vetoed_events():
+    timestamp_data = gen_timestamp_data()
+    timestamp_data["status"][::5] = gemseana.status_vetoed
+    for flag_exclude_cut_and_vetoed in [True, False]:
+        spectrum_dict = gemseana.get_energy_spectrum(timestamp_data, [0., 1.], flag_exclude_cut_and_vetoed=flag_exclude_cut_and_vetoed)
+        # including empty chunks
+        chunks = np.array_split(timestamp_data, [0, 1000, 1000, 4999])
+        assert_spectra_equal(gemseana.get_energy_spectrum(chunks, [0., 1.], flag_exclude_cut_and_vetoed=flag_exclude_cut_and_vetoed), spectrum_dict)
+
+
+def test_chunked_live_time_includes_gaps_between_chunks():
+    timestamp_data = np.zeros(4, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = [10**8, 2*10**8, 10*10**8, 12*10**8]
+    chunks = [timestamp_data[:2], timestamp_data[2:]]
+    assert gemseana.get_energy_spectrum(chunks, [0., 1.])["t_live_s"] == pytest.approx(11.)
+    assert gemseana.get_energy_spectrum(chunks, [0., 1.], [1.5, 11.])["t_live_s"] == pytest.approx(9.5)
+    assert gemseana.get_energy_spectrum([], [0., 1.])["t_live_s"] == 0.0
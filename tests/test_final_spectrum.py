@@ -0,0 +1,103 @@
+import os
+import stat
+
+import pytest
+
+import gemseana
+
+
+def write_root_script_stubs(tmp_path, add_spectra_returncode=0):
+    abspath_gemse_root_scripts = str(tmp_path / "gemse_root_scripts") +"/"
+    os.makedirs(abspath_gemse_root_scripts, exist_ok=True)
+    for script, returncode in [("make_rootfile_list", 0), ("make_spectrum_list", 0), ("add_spectra", add_spectra_returncode)]:
+        pathstring_stub = abspath_gemse_root_scripts +script
+        with open(pathstring_stub, "w") as f:
+            f.write(f"#!/bin/sh\necho stub output of {script}\nexit {returncode}\n")
+        os.chmod(pathstring_stub, os.stat(pathstring_stub).st_mode | stat.S_IEXEC)
+    return abspath_gemse_root_scripts
+
+
+def write_measurement(tmp_path, time_windows, measurement_folder="measurement"):
+    abspath_measurement_folder = str(tmp_path / measurement_folder) +"/"
+    os.makedirs(abspath_measurement_folder, exist_ok=True)
+    pathstring_mca_list_file = abspath_measurement_folder +"list_file.txt"
+    (tmp_path / measurement_folder / "list_file.txt").write_text("HEADER0:1\n")
+    (tmp_path / "calibration_function.txt").write_text("0")
+    for time_window in time_windows:
+        with open(gemseana.get_spectrum_pathstrings(pathstring_mca_list_file, time_window)[0], "w") as f:
+            f.write(f"spectrum {time_window}")
+    return abspath_measurement_folder, pathstring_mca_list_file
+
+
+def gen_final_spectrum(tmp_path, pathstring_mca_list_file, time_windows, abspath_gemse_root_scripts):
+    return gemseana.gen_final_calibrated_added_spectrum(
+        input_pathstrings_mca_list_files = [pathstring_mca_list_file],
+        input_time_windows = [time_windows],
+        input_pathstring_calibration_function = str(tmp_path / "calibration_function.txt"),
+        input_abspath_gemse_root_scripts = abspath_gemse_root_scripts,
+        input_pathstring_stage_manifest = str(tmp_path / gemseana.stage_manifest_filename))
+
+
+@pytest.mark.parametrize("measurement_folder", ["measurement", "measurement 1; touch injected"])
+def test_single_time_window_is_copied(tmp_path, measurement_folder):
+    abspath_measurement_folder, pathstring_mca_list_file = write_measurement(tmp_path, [[0, 100]], measurement_folder)
+    pathstring_final_spectrum = gen_final_spectrum(tmp_path, pathstring_mca_list_file, [[0, 100]], write_root_script_stubs(tmp_path))
+    assert pathstring_final_spectrum == abspath_measurement_folder +"final_calibrated_added_spectrum.root"
+    with open(pathstring_final_spectrum) as f:
+        assert f.read() == "spectrum [0, 100]"
+    assert not os.path.exists("injected")
+
+
+def test_failing_add_spectra_raises(tmp_path):
+    abspath_measurement_folder, pathstring_mca_list_file = write_measurement(tmp_path, [[0, 100], [200, 300]])
+    with pytest.raises(Exception, match="return code 2"):
+        gen_final_spectrum(tmp_path, pathstring_mca_list_file, [[0, 100], [200, 300]], write_root_script_stubs(tmp_path, add_spectra_returncode=2))
+    assert "final_spectrum" not in gemseana.load_stage_manifest(str(tmp_path / gemseana.stage_manifest_filename))
+
+
+def test_missing_cut_spectrum_raises(tmp_path):
+    abspath_measurement_folder, pathstring_mca_list_file = write_measurement(tmp_path, [])
+    with pytest.raises(Exception, match="failed with return code"):
+        gen_final_spectrum(tmp_path, pathstring_mca_list_file, [[0, 100]], write_root_script_stubs(tmp_path))
+
+
+def test_stage_trace_is_disabled_after_failure(tmp_path):
+    abspath_measurement_folder, pathstring_mca_list_file = write_measurement(tmp_path, [[0, 100], [200, 300]])
+    pathstring_configuration_file = gemseana.gen_analysis_configuration_file(
+        pathstring_output = str(tmp_path / "analysis_configuration_file.txt"),
+        sample_name = "sample",
+        abspath_isotope_parameters_folder = str(tmp_path),
+        abspath_sample_spectrum_root_file = abspath_measurement_folder +"final_calibrated_added_spectrum.root",
+        abspath_background_spectrum_root_file = "background.root",
+        abspath_efficiency_root_file = "efficiency.root",
+        abspath_resolution_root_file = "resolution.root",
+        abspath_results_folder = str(tmp_path) +"/",
+        list_isotopes_to_analyze = [],
+        flag_validate_isotopes = False)
+    with pytest.raises(Exception, match="return code 2"):
+        gemseana.all_in_one_gemse_analysis(
+            input_pathstrings_mca_list_files = [pathstring_mca_list_file],
+            input_time_windows = [[[0, 100], [200, 300]]],
+            input_pathstring_calibration_function = str(tmp_path / "calibration_function.txt"),
+            input_pathstring_gemse_analysis_configuration_file = pathstring_configuration_file,
+            input_abspath_gemse_root_scripts = write_root_script_stubs(tmp_path, add_spectra_returncode=2),
+            flag_trace_stages = True)
+    assert gemseana.stage_trace_dict["pathstring_trace"] == ""
+    assert os.path.isfile(str(tmp_path / "sample_stage_trace.jsonl"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_conversion_output_is_streamed_unless_concurrent(tmp_path, capfd, max_workers):
+    abspath_measurement_folder, pathstring_mca_list_file = write_measurement(tmp_path, [])
+    task_list = gemseana.run_list_file_conversions(
+        input_pathstrings_mca_list_files = [pathstring_mca_list_file],
+        input_time_windows = [[[0, 100]]],
+        input_pathstring_calibration_function = str(tmp_path / "calibration_function.txt"),
+        input_abspath_gemse_root_scripts = write_root_script_stubs(tmp_path),
+        max_workers = max_workers)
+    assert [task["returncode"] for task in task_list] == [0, 0]
+    if max_workers == 1:
+        assert [task["stdout"] for task in task_list] == [None, None]
+        assert "stub output of make_spectrum_list" in capfd.readouterr().out
+    else:
+        assert task_list[1]["stdout"] == "stub output of make_spectrum_list\n"
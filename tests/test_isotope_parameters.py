@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import gemseana
+
+
+abspath_isotope_parameters = os.path.join(os.path.dirname(gemseana.__file__), "gemse_analysis_files", "isotope_parameters") +"/"
+
+# isotope list as passed on within the exemplary notebook (commented-out isotopes are skipped by 'GeMSE_analysis')
+notebook_isotopes = ["U238", "Ra226", "Th228", "Ra228", "Co60", "K40", "Cs137", "#Mn54", "#Ti44", "#Na22", "#Al26"]
+
+
+def gen_configuration_file(tmp_path, abspath_isotope_parameters_folder, isotopes):
+    return gemseana.gen_analysis_configuration_file(
+        pathstring_output = str(tmp_path / "analysis_configuration_file.txt"),
+        sample_name = "sample",
+        abspath_isotope_parameters_folder = abspath_isotope_parameters_folder,
+        abspath_sample_spectrum_root_file = "sample.root",
+        abspath_background_spectrum_root_file = "background.root",
+        abspath_efficiency_root_file = "efficiency.root",
+        abspath_resolution_root_file = "resolution.root",
+        abspath_results_folder = str(tmp_path) +"/",
+        list_isotopes_to_analyze = isotopes)
+
+
+def test_commented_isotopes_are_skipped(tmp_path):
+    pathstring_configuration_file = gen_configuration_file(tmp_path, abspath_isotope_parameters, notebook_isotopes)
+    assert gemseana.read_analysis_configuration_file(pathstring_configuration_file)["isotopes to analyze"] == notebook_isotopes
+    assert gemseana.get_analyzed_isotopes(notebook_isotopes) == notebook_isotopes[:7]
+
+
+def test_only_requested_isotopes_are_validated(tmp_path):
+    abspath_folder = str(tmp_path / "isotope_parameters") +"/"
+    shutil.copytree(abspath_isotope_parameters, abspath_folder)
+    with open(abspath_folder +"parameters_Xx1.txt", "w") as f:
+        f.write("# Half-life (sec.)\n1.\n")
+    gen_configuration_file(tmp_path, abspath_folder, notebook_isotopes)
+    with pytest.raises(Exception, match="parameters_Xx1.txt"):
+        gen_configuration_file(tmp_path, abspath_folder, ["Co60", "Xx1"])
+    with pytest.raises(Exception, match="Yy2"):
+        gen_configuration_file(tmp_path, abspath_folder, ["Co60", "Yy2"])
+
+
+def test_isotope_peaks():
+    peaks = gemseana.get_isotope_peaks(abspath_isotope_parameters, ["Co60", "#K40"])
+    assert peaks["isotope"].tolist() == ["Co60", "Co60"]
+    assert np.allclose(peaks["energy_kev"], [1173.2, 1332.5])
+    assert np.all(peaks["fit_range_lower_kev"] < peaks["energy_kev"]) and np.all(peaks["energy_kev"] < peaks["fit_range_upper_kev"])
+    assert gemseana.find_isotope_peaks(abspath_isotope_parameters, 1173, 1174)["isotope"].tolist() == ["Co60"]
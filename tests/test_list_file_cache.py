@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+
+import gemseana
+
+
+def gen_list_file(pathstring_data, n_events=2000, seed=0):
+    rng = np.random.RandomState(seed)
+    timestamp_data = np.zeros(n_events, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = np.sort(rng.randint(0, 10**10, n_events)).astype(np.uint64)
+    timestamp_data["pulse_height_adc"] = rng.randint(0, gemseana.n_adc_channels, n_events)
+    gemseana.gen_pseudo_list_file(pathstring_data, [1, 2, 3], timestamp_data)
+    return timestamp_data
+
+
+def load(pathstring_data, tmp_path):
+    return gemseana.get_timestamp_data_as_ndarray(pathstring_data, flag_use_cache=True, input_abspath_cache=str(tmp_path / "cache"))
+
+
+def test_cached_array_is_writable_copy_on_write(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    gen_list_file(pathstring_data)
+    parsed = load(pathstring_data, tmp_path)
+    cached = load(pathstring_data, tmp_path)
+    assert isinstance(cached, np.memmap)
+    assert np.array_equal(cached, parsed)
+    # the cached array can be modified just as the parsed one ...
+    cached["status"][:10] = gemseana.status_vetoed
+    parsed["status"][:10] = gemseana.status_vetoed
+    # ... without the modifications being written back to the sidecar
+    assert np.all(load(pathstring_data, tmp_path)["status"] == 0)
+
+
+def test_cache_is_invalidated_on_size_change(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    gen_list_file(pathstring_data)
+    load(pathstring_data, tmp_path)
+    with open(pathstring_data, "a") as list_file:
+        list_file.write("\n1 2 3 ")
+    assert gemseana.load_list_file_from_cache(pathstring_data, str(tmp_path / "cache")) == None
+    assert len(load(pathstring_data, tmp_path)) == 2001
+
+
+def test_cache_is_invalidated_on_mtime_change(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    gen_list_file(pathstring_data)
+    load(pathstring_data, tmp_path)
+    stat = os.stat(pathstring_data)
+    os.utime(pathstring_data, ns=(stat.st_atime_ns, stat.st_mtime_ns +10**9))
+    assert gemseana.load_list_file_from_cache(pathstring_data, str(tmp_path / "cache")) == None
+
+
+def test_cache_is_invalidated_on_content_change(tmp_path):
+    # same size and same mtime, only the content differs
+    pathstring_data = str(tmp_path / "list_file.txt")
+    gen_list_file(pathstring_data, seed=0)
+    load(pathstring_data, tmp_path)
+    stat = os.stat(pathstring_data)
+    with open(pathstring_data, "r+b") as list_file:
+        list_file.seek(-2, os.SEEK_END)
+        digit = list_file.read(1)
+        list_file.seek(-2, os.SEEK_END)
+        list_file.write(b"1" if digit != b"1" else b"2")
+    os.utime(pathstring_data, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(pathstring_data).st_size == stat.st_size
+    assert gemseana.load_list_file_from_cache(pathstring_data, str(tmp_path / "cache")) == None
+    assert load(pathstring_data, tmp_path)["extra"][-1] in [1, 2]
+
+
+def test_least_recently_used_sidecars_are_evicted(tmp_path):
+    abspath_cache = str(tmp_path / "cache")
+    pathstring_list = [str(tmp_path / f"list_file_{i}.txt") for i in range(3)]
+    for i, pathstring_data in enumerate(pathstring_list):
+        gen_list_file(pathstring_data, seed=i)
+        gemseana.get_timestamp_data_as_ndarray(pathstring_data, flag_use_cache=True, input_abspath_cache=abspath_cache)
+        # marking the sidecars as used in order (mtime resolution may be coarse)
+        os.utime(gemseana.get_list_file_cache_pathstrings(pathstring_data, abspath_cache)[1], (i, i))
+    # using the first list file again such that the second one is the least recently used
+    assert gemseana.load_list_file_from_cache(pathstring_list[0], abspath_cache) != None
+    sidecar_bytes = sum([os.path.getsize(p) for p in gemseana.get_list_file_cache_pathstrings(pathstring_list[2], abspath_cache)])
+    gemseana.evict_list_file_cache(abspath_cache, 2*sidecar_bytes +1000)
+    assert gemseana.load_list_file_from_cache(pathstring_list[0], abspath_cache) != None
+    assert gemseana.load_list_file_from_cache(pathstring_list[1], abspath_cache) == None
+    assert gemseana.load_list_file_from_cache(pathstring_list[2], abspath_cache) != None
@@ -0,0 +1,71 @@
+import numpy as np
+
+import gemseana
+
+
+def test_valid_chunk():
+    values, bad_line_indices = gemseana.parse_list_file_chunk(b"1 2 3 \n4 5 -6 \r\n7\t8 9")
+    assert values.tolist() == [[1, 2, 3], [4, 5, -6], [7, 8, 9]]
+    assert bad_line_indices == []
+
+
+def test_misaligned_fields_are_detected():
+    # six values in two lines, but not three per line
+    values, bad_line_indices = gemseana.parse_list_file_chunk(b"1 2\n3 4 5 6\n")
+    assert values.tolist() == [[3, 4, 5]]
+    assert bad_line_indices == [0]
+
+
+def test_malformed_lines_are_reported():
+    values, bad_line_indices = gemseana.parse_list_file_chunk(b"1 2 3\n\n4 x 6\n7 8 9\n")
+    assert values.tolist() == [[1, 2, 3], [7, 8, 9]]
+    assert bad_line_indices == [1, 2]
+
+
+def test_line_field_counts():
+    assert gemseana.check_line_field_counts(b" 1 2 3 \n4 5 6\n7 8 9", 3) == True
+    assert gemseana.check_line_field_counts(b"1 2 3\n4 5 6\n", 2) == True
+    assert gemseana.check_line_field_counts(b"1 2 3 4\n5 6\n", 2) == False
+    assert gemseana.check_line_field_counts(b"1 2 3\n\n4 5 6\n", 3) == False
+    assert gemseana.check_line_field_counts(b"", 0) == True
+
+
+def test_partially_parsed_last_field_is_rejected():
+    # 'np.fromstring' stops within the malformed token, the number of parsed values nevertheless matches the number of lines
+    for chunk in [b"4 5 6.9\n", b"1 2 0x10\n", b"1 2 3.0e5\n", b"1 2 3\n16383 -5 1.5\n"]:
+        values, bad_line_indices = gemseana.parse_list_file_chunk(chunk)
+        assert bad_line_indices == [chunk.count(b"\n") -1]
+        assert len(values) == chunk.count(b"\n") -1
+
+
+def test_malformed_lines_do_not_depend_on_chunk_size(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    with open(pathstring_data, "w") as f:
+        f.write("HEADER0:1\n" +"".join([f"{i} {i%100} 0 \n" for i in range(50)]) +"16383 -5 1.5\n" +"".join([f"{i} 7 0 \n" for i in range(50, 60)]))
+    for input_chunk_bytes in [64, 97, gemseana.list_file_chunk_bytes]:
+        timestamp_data, header_list, bad_line_indices = gemseana.get_timestamp_data_as_ndarray(pathstring_data, input_chunk_bytes=input_chunk_bytes, flag_return_header_and_bad_lines=True)
+        assert len(timestamp_data) == 60
+        assert bad_line_indices == [51]
+
+
+def parse_line_by_line(chunk):
+    values_list, bad_line_indices = [], []
+    for i, line in enumerate(chunk.splitlines()):
+        try:
+            line_list = line.split()
+            values_list.append((int(line_list[0]), int(line_list[1]), int(line_list[2])))
+        except (IndexError, ValueError):
+            bad_line_indices.append(i)
+    return values_list, bad_line_indices
+
+
+def test_fast_path_matches_line_by_line_parsing():
+    rng = np.random.RandomState(1)
+    tokens = ["0", "7", "16383", "-5", "+3", "1.5", "6.9", "0x10", "3.0e5", "abc", "-", ""]
+    for k in range(300):
+        lines = [" ".join(rng.choice(tokens, rng.randint(2, 5))) for j in range(rng.randint(1, 5))]
+        chunk = ("\n".join(lines) +("\n" if rng.randint(2) == 1 else "")).encode()
+        values, bad_line_indices = gemseana.parse_list_file_chunk(chunk)
+        values_list, reference_bad_line_indices = parse_line_by_line(chunk)
+        assert values.tolist() == [list(v) for v in values_list], chunk
+        assert bad_line_indices == reference_bad_line_indices, chunk
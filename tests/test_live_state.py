@@ -0,0 +1,42 @@
+import numpy as np
+
+import gemseana
+
+
+def append_events(pathstring, timestamps_10ns, flag_header=False):
+    with open(pathstring, "a") as f:
+        if flag_header == True:
+            f.write("HEADER0:1\n")
+        f.write("".join([f"{t} 1000 0 \n" for t in timestamps_10ns]))
+
+
+def test_live_state_with_array_calibration(tmp_path):
+    pathstring_data = str(tmp_path / "signal.txt")
+    append_events(pathstring_data, [10**8, 2*10**8], flag_header=True)
+    live_state = gemseana.init_live_state(pathstring_data, input_ranges=[[0, 3000]], input_binwidth_s=1, input_calibration=np.array([0., 2.]))
+    assert live_state["settings"]["calibration"] == [0., 2.]
+    assert gemseana.update_live_state(live_state) == 2
+    assert gemseana.get_live_rate_curves(live_state)[0]["counts"].tolist() == [0, 1, 1]
+
+
+def test_veto_stall_is_detected(tmp_path):
+    pathstring_data, pathstring_vetodata = str(tmp_path / "signal.txt"), str(tmp_path / "veto.txt")
+    append_events(pathstring_data, [1000, 2000], flag_header=True)
+    append_events(pathstring_vetodata, [500, 3000], flag_header=True)
+    live_state = gemseana.init_live_state(pathstring_data, pathstring_vetodata)
+    gemseana.update_live_state(live_state, stall_timeout_s=60)
+    assert live_state["data_taking"]["veto_state"] == "running"
+    # the signal file keeps growing while the veto file does not
+    append_events(pathstring_data, [10**6, 2*10**6])
+    live_state["data_taking"]["wall_time_last_veto_event"] -= 120
+    gemseana.update_live_state(live_state, stall_timeout_s=60)
+    assert len(live_state["pending_signal"]) == 2
+    assert live_state["data_taking"]["veto_state"] == "stalled"
+    assert live_state["data_taking"]["state"] == "running"
+    assert [a["type"] for a in live_state["data_taking"]["anomalies"]] == ["veto_stalled"]
+    # the veto file resumes
+    append_events(pathstring_vetodata, [3*10**6])
+    gemseana.update_live_state(live_state, stall_timeout_s=60)
+    assert live_state["data_taking"]["veto_state"] == "running"
+    assert [a["type"] for a in live_state["data_taking"]["anomalies"]] == ["veto_stalled", "veto_resumed"]
+    assert len(live_state["pending_signal"]) == 0
@@ -0,0 +1,83 @@
+import os
+import stat
+import sys
+
+import gemseana
+
+
+abspath_isotope_parameters = os.path.join(gemseana.os.path.dirname(gemseana.__file__), "gemse_analysis_files", "isotope_parameters") +"/"
+
+
+# stub of 'GeMSE_analysis' writing a summary in the format of the real executable (the analysis of 'failing_isotope' fails)
+stub_gemse_analysis = '''#!{python}
+import sys
+sys.path.insert(0, {abspath_gemseana!r})
+import gemseana
+configuration_dict = gemseana.read_analysis_configuration_file(sys.argv[1])
+isotopes = configuration_dict["isotopes to analyze"]
+if {failing_isotope!r} in isotopes:
+    print("analysis failed", file=sys.stderr)
+    sys.exit(3)
+with open(configuration_dict["results folder"][0] +configuration_dict["sample name"][0] +"_activities_summary.txt", "w") as f:
+    f.write("#################################\\n22-01-2021 02:25:09\\nsample name: " +configuration_dict["sample name"][0] +"\\nfractional uncertainty efficiencies: 0.02\\nBF threshold for signal: 0.33\\nCL for activity limit: 0.95\\n#################################\\n\\nIsotope \\t Activity (Bq) \\t Bayes Factor\\n")
+    for isotope in isotopes:
+        f.write(isotope +"\\t< 3.92e-02\\t2.12865\\n")
+print("analyzed", isotopes)
+'''
+
+
+def write_stub(tmp_path, failing_isotope=""):
+    abspath_gemse_analysis = str(tmp_path / "gemse_analysis") +"/"
+    os.makedirs(abspath_gemse_analysis, exist_ok=True)
+    pathstring_stub = abspath_gemse_analysis +"GeMSE_analysis"
+    with open(pathstring_stub, "w") as f:
+        f.write(stub_gemse_analysis.format(python=sys.executable, abspath_gemseana=os.path.dirname(gemseana.__file__), failing_isotope=failing_isotope))
+    os.chmod(pathstring_stub, os.stat(pathstring_stub).st_mode | stat.S_IEXEC)
+    return abspath_gemse_analysis
+
+
+def write_configuration_file(tmp_path, isotopes):
+    abspath_results_folder = str(tmp_path / "results") +"/"
+    os.makedirs(abspath_results_folder, exist_ok=True)
+    return gemseana.gen_analysis_configuration_file(
+        pathstring_output = str(tmp_path / "analysis_configuration_file.txt"),
+        sample_name = "sample",
+        abspath_isotope_parameters_folder = abspath_isotope_parameters,
+        abspath_sample_spectrum_root_file = str(tmp_path / "final_calibrated_added_spectrum.root"),
+        abspath_background_spectrum_root_file = "background_combined.root",
+        abspath_efficiency_root_file = "efficiency.root",
+        abspath_resolution_root_file = "resolution.root",
+        abspath_results_folder = abspath_results_folder,
+        list_isotopes_to_analyze = isotopes), abspath_results_folder
+
+
+def run_parallel_stage(tmp_path, pathstring_configuration_file, abspath_gemse_analysis, abspath_results_folder):
+    return gemseana.run_stage(
+        stage_function = lambda: gemseana.run_parallel_gemse_analysis(pathstring_configuration_file, input_abspath_gemse_analysis=abspath_gemse_analysis, max_workers=2),
+        stage_key = "gemse_analysis",
+        input_pathstrings = [pathstring_configuration_file, abspath_gemse_analysis +"GeMSE_analysis"],
+        input_parameters = {"isotope_groups" : []},
+        output_pathstrings = [abspath_results_folder +"sample_activities_summary.txt"],
+        pathstring_stage_manifest = str(tmp_path / gemseana.stage_manifest_filename))
+
+
+def test_parallel_analysis_is_recorded_by_run_stage(tmp_path):
+    abspath_gemse_analysis = write_stub(tmp_path)
+    pathstring_configuration_file, abspath_results_folder = write_configuration_file(tmp_path, ["Co60", "K40", "Cs137", "#Mn54"])
+    result = run_parallel_stage(tmp_path, pathstring_configuration_file, abspath_gemse_analysis, abspath_results_folder)
+    assert result.returncode == 0
+    summary_record = gemseana.parse_activities_summary(abspath_results_folder +"sample_activities_summary.txt")
+    assert list(summary_record["isotope_data"].keys()) == ["Co60", "K40", "Cs137"]
+    assert not os.path.isdir(abspath_results_folder +"isotopes_#Mn54")
+    # the stage was recorded, i.e., the second run is skipped
+    assert run_parallel_stage(tmp_path, pathstring_configuration_file, abspath_gemse_analysis, abspath_results_folder) is None
+
+
+def test_parallel_analysis_failure_is_not_recorded(tmp_path):
+    abspath_gemse_analysis = write_stub(tmp_path, failing_isotope="K40")
+    pathstring_configuration_file, abspath_results_folder = write_configuration_file(tmp_path, ["Co60", "K40"])
+    result = run_parallel_stage(tmp_path, pathstring_configuration_file, abspath_gemse_analysis, abspath_results_folder)
+    assert result.returncode != 0
+    assert "analysis failed" in result.stderr
+    assert not os.path.isfile(abspath_results_folder +"sample_activities_summary.txt")
+    assert gemseana.load_stage_manifest(str(tmp_path / gemseana.stage_manifest_filename)) == {}
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+import gemseana
+
+
+abspath_isotope_parameters = os.path.join(os.path.dirname(gemseana.__file__), "gemse_analysis_files", "isotope_parameters")
+
+
+def test_interval_counts_at_bin_boundaries():
+    spectrum_dict = gemseana.gen_spectrum_dict(np.arange(11, dtype=np.float64), np.arange(10, dtype=np.float64), 1., [0, 1])
+    # bins are attributed via their centers (0.5, 1.5, ...), interval limits are inclusive
+    assert gemseana.get_interval_counts(spectrum_dict, [2.], [5.]).tolist() == [2+3+4]
+    assert gemseana.get_interval_counts(spectrum_dict, [2.5], [4.5]).tolist() == [2+3+4]
+    assert gemseana.get_interval_counts(spectrum_dict, [2.6], [4.4]).tolist() == [3]
+    assert gemseana.get_interval_counts(spectrum_dict, [-5., 9.5, 3.6, 20.], [20., 20., 3.9, 30.]).tolist() == [45, 9, 0, 0]
+
+
+def test_interval_counts_match_direct_summation():
+    rng = np.random.RandomState(0)
+    bin_edges = np.linspace(0., 3000., 3001)
+    spectrum_dict = gemseana.gen_spectrum_dict(bin_edges, rng.poisson(10, 3000).astype(np.float64), 1., [0, 1])
+    lower_kev = rng.uniform(-10, 3000, 200)
+    upper_kev = lower_kev +rng.uniform(0, 50, 200)
+    # including limits exactly at bin centers and bin edges
+    lower_kev[:20] = np.round(lower_kev[:20]) +0.5
+    upper_kev[20:40] = np.round(upper_kev[20:40])
+    interval_counts = gemseana.get_interval_counts(spectrum_dict, lower_kev, upper_kev)
+    for l, u, c in zip(lower_kev, upper_kev, interval_counts):
+        mask = (spectrum_dict["bin_centers"] >= l) & (spectrum_dict["bin_centers"] <= u)
+        assert c == np.sum(spectrum_dict["counts"][mask])
+
+
+def save_spectrum(tmp_path, name, counts):
+    bin_edges = np.linspace(0., 3000., len(counts) +1)
+    return gemseana.save_energy_spectrum_as_root_file(gemseana.gen_spectrum_dict(bin_edges, counts, 1.e5, [0, 1.e5]), str(tmp_path / name))
+
+
+def test_injected_peak_is_significant(tmp_path):
+    pytest.importorskip("uproot")
+    rng = np.random.RandomState(0)
+    # background measurement of twice the live time of the sample measurement
+    pathstring_background = save_spectrum(tmp_path, "background", rng.poisson(20, 3000).astype(np.float64))
+    counts_sample = rng.poisson(10, 3000).astype(np.float64)
+    pathstring_background_only = save_spectrum(tmp_path, "background_only", counts_sample.copy())
+    counts_sample[659:664] += 100 # Cs137 peak at 661.7 keV
+    pathstring_sample = save_spectrum(tmp_path, "sample", counts_sample)
+
+    screening = gemseana.screen_peak_regions(pathstring_sample, pathstring_background, abspath_isotope_parameters, ["Cs137", "K40"], 1.e5, 2.e5)
+    assert screening["isotope"].tolist() == ["Cs137", "K40"]
+    assert screening["significance"][0] > 10
+    assert abs(screening["significance"][1]) < 4
+    # significance: net counts over the standard deviation of sample and (scaled) background counts
+    sample_counts = gemseana.get_interval_counts(gemseana.load_root_spectrum(pathstring_sample), screening["fit_range_lower_kev"], screening["fit_range_upper_kev"])
+    background_counts = gemseana.get_interval_counts(gemseana.load_root_spectrum(pathstring_background), screening["fit_range_lower_kev"], screening["fit_range_upper_kev"])
+    assert np.allclose(screening["sample_counts"], sample_counts)
+    assert np.allclose(screening["expected_background_counts"], 0.5*background_counts)
+    assert np.allclose(screening["significance"], (sample_counts -0.5*background_counts)/np.sqrt(0.5*background_counts +0.25*background_counts))
+    assert gemseana.rank_screened_isotopes(screening)[0][0] == "Cs137"
+    assert gemseana.select_screened_isotopes(screening, ["Cs137", "K40"], min_significance=5.) == ["Cs137"]
+
+    screening = gemseana.screen_peak_regions(pathstring_background_only, pathstring_background, abspath_isotope_parameters, ["Cs137", "K40"], 1.e5, 2.e5)
+    assert np.all(np.abs(screening["significance"]) < 4)
+    assert screening["net_rate_hz"].tolist() == (screening["net_counts"]/1.e5).tolist()
@@ -0,0 +1,12 @@
+import numpy as np
+
+import gemseana
+
+
+def test_rate_curves_with_array_calibration():
+    timestamp_data = np.zeros(4, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = [0, 10**8, 10**8 +1, 3*10**8]
+    timestamp_data["pulse_height_adc"] = [100, 200, 300, 400]
+    rate_dict_list = gemseana.get_rate_curves(timestamp_data, input_ranges=[[0, 500], [350, 1000]], input_binwidths=[1], input_calibration=np.array([0., 2.]))
+    assert rate_dict_list[0]["counts"].tolist() == [1, 1, 0, 0]
+    assert rate_dict_list[1]["counts"].tolist() == [0, 2, 0, 1]
@@ -0,0 +1,109 @@
+import json
+import os
+
+import numpy as np
+
+import gemseana
+
+
+def gen_analysis_results(sample_id="cuboid_04", datetimestamp="14-01-2021 10:00:00", th228_upper_limit_bq="1.0e-3"):
+    # analysis results dictionary just as saved by 'gemse_analysis_aftermath' (mostly strings, "" for missing values)
+    return {
+        "sample_id" : sample_id,
+        "datetimestamp" : datetimestamp,
+        "sample_mass_kg" : "2.0",
+        "measurement_time_s" : "324077.5",
+        "measurement_time_d" : "3.75",
+        "sample_spectrum" : "final_calibrated_added_spectrum.root",
+        "cl_for_activity_limit" : "0.9",
+        "mca_list_files" : ["list_file_ch000.txt"],
+        "isotope_data" : {
+            "Th228" : {
+                "bayes_factor" : "3.2",
+                "upper_limit_bq" : th228_upper_limit_bq,
+                "upper_limit_bq_per_kg" : str(float(th228_upper_limit_bq)/2),
+                "activity_bq" : "",
+                "activity_bq_per_kg" : ""},
+            "K40" : {
+                "bayes_factor" : "0.01",
+                "upper_limit_bq" : "",
+                "activity_bq" : "0.5",
+                "activity_bq_lower" : "0.4",
+                "activity_bq_upper" : "0.6",
+                "activity_bq_per_kg" : "0.25",
+                "activity_bq_lower_per_kg" : "0.2",
+                "activity_bq_upper_per_kg" : "0.3"}}}
+
+
+def save_analysis_results(analysis_results, pathstring_json):
+    with open(pathstring_json, "w") as json_output_file:
+        json.dump(analysis_results, json_output_file)
+    return pathstring_json
+
+
+def test_unchanged_json_is_skipped(tmp_path):
+    pathstring_db = str(tmp_path / "results.sqlite")
+    pathstring_json = save_analysis_results(gen_analysis_results(), str(tmp_path / "cuboid_04_analysis_results.json"))
+    assert gemseana.ingest_analysis_results(pathstring_db, [pathstring_json]) == 1
+    assert gemseana.ingest_analysis_results(pathstring_db, [pathstring_json]) == 0
+    assert gemseana.ingest_analysis_results(pathstring_db, [pathstring_json], flag_force=True) == 1
+    analyses = gemseana.query_analyses(pathstring_db)
+    assert len(analyses) == 1
+    assert analyses["pathstring_source"][0] == os.path.abspath(pathstring_json)
+    assert analyses["analysis_datetime"][0] == "2021-01-14T10:00:00"
+    assert json.loads(analyses["mca_list_files"][0]) == ["list_file_ch000.txt"]
+    assert len(gemseana.query_isotope_results(pathstring_db)) == 2
+
+
+def test_analysis_is_upserted_on_sample_id_and_timestamp(tmp_path):
+    pathstring_db = str(tmp_path / "results.sqlite")
+    pathstring_json = save_analysis_results(gen_analysis_results(), str(tmp_path / "cuboid_04_analysis_results.json"))
+    gemseana.ingest_analysis_results(pathstring_db, [pathstring_json])
+    analysis_id = gemseana.query_analyses(pathstring_db)["analysis_id"][0]
+    # the same analysis re-evaluated (changed json, same sample ID and timestamp), one isotope dropped
+    analysis_results = gen_analysis_results(th228_upper_limit_bq="2.0e-3")
+    del analysis_results["isotope_data"]["K40"]
+    save_analysis_results(analysis_results, pathstring_json)
+    stat = os.stat(pathstring_json)
+    os.utime(pathstring_json, ns=(stat.st_atime_ns, stat.st_mtime_ns +10**9))
+    assert gemseana.ingest_analysis_results(pathstring_db, [pathstring_json]) == 1
+    assert gemseana.query_analyses(pathstring_db, flag_latest_only=False)["analysis_id"].tolist() == [analysis_id]
+    isotope_results = gemseana.query_isotope_results(pathstring_db)
+    assert isotope_results["isotope"].tolist() == ["Th228"]
+    assert isotope_results["upper_limit_bq"].tolist() == [2.0e-3]
+
+
+def test_latest_only(tmp_path):
+    pathstring_db = str(tmp_path / "results.sqlite")
+    input_analysis_results = [
+        gen_analysis_results(datetimestamp="14-01-2021 10:00:00", th228_upper_limit_bq="1.0e-3"),
+        # the newer analysis is ingested first, the ISO datetime (not the day-first timestamp) determines the order
+        gen_analysis_results(datetimestamp="02-02-2021 10:00:00", th228_upper_limit_bq="4.0e-4"),
+        gen_analysis_results(sample_id="cuboid_05", th228_upper_limit_bq="3.0e-3")][::-1]
+    assert gemseana.ingest_analysis_results(pathstring_db, input_analysis_results) == 3
+    assert len(gemseana.query_analyses(pathstring_db, flag_latest_only=False)) == 3
+    analyses = gemseana.query_analyses(pathstring_db)
+    assert analyses["sample_id"].tolist() == ["cuboid_04", "cuboid_05"]
+    assert analyses["datetimestamp"].tolist() == ["02-02-2021 10:00:00", "14-01-2021 10:00:00"]
+    th228 = gemseana.query_isotope_results(pathstring_db, input_isotopes=["Th228"])
+    assert th228["upper_limit_bq"].tolist() == [4.0e-4, 3.0e-3]
+    th228 = gemseana.query_isotope_results(pathstring_db, input_isotopes=["Th228"], flag_latest_only=False)
+    assert th228["upper_limit_bq"].tolist() == [1.0e-3, 4.0e-4, 3.0e-3]
+    th228 = gemseana.query_isotope_results(pathstring_db, input_isotopes=["Th228"], max_upper_limit_bq_per_kg=1e-3)
+    assert th228["sample_id"].tolist() == ["cuboid_04"]
+
+
+def test_null_values_are_converted_to_nan(tmp_path):
+    pathstring_db = str(tmp_path / "results.sqlite")
+    gemseana.ingest_analysis_results(pathstring_db, [gen_analysis_results()])
+    isotope_results = gemseana.query_isotope_results(pathstring_db)
+    assert isotope_results["isotope"].tolist() == ["K40", "Th228"]
+    assert isotope_results["upper_limit_bq"].dtype == np.float64
+    assert np.isnan(isotope_results["upper_limit_bq"][0]) and isotope_results["upper_limit_bq"][1] == 1.0e-3
+    assert isotope_results["activity_bq"][0] == 0.5 and np.isnan(isotope_results["activity_bq"][1])
+    assert np.isnan(isotope_results["activity_bq_lower"][1])
+    assert gemseana.query_isotope_results(pathstring_db, flag_detected_only=True)["isotope"].tolist() == ["K40"]
+    # NULL values of text columns are converted to ""
+    analyses = gemseana.query_analyses(pathstring_db)
+    assert analyses["pathstring_source"].tolist() == [""]
+    assert np.isnan(analyses["measurement_time_background_sec"][0])
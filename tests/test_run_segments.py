@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+import gemseana
+
+
+pathstring_example_list_file = os.path.join(os.path.dirname(gemseana.__file__), "2020-12-10_cuboid_04_lanza", "20210114__cuboid_04_lanza__old_veto__list_file_ch000_ch000.txt")
+period = gemseana.rollover_period_10ns
+
+
+def gen_run(marker_ids, n_events_per_period=3, seed=0):
+    # rollover markers at the given multiples of the rollover period and a few events after each of them
+    rng = np.random.RandomState(seed)
+    timestamps = [k*period for k in marker_ids]
+    timestamps += [k*period +t for k in marker_ids for t in rng.randint(1, period, n_events_per_period)]
+    run = np.zeros(len(timestamps), gemseana.timestamp_data_mc2_dtype)
+    run["timestamp_10ns"] = np.sort(timestamps)
+    run["pulse_height_adc"] = rng.randint(0, gemseana.n_adc_channels, len(run))
+    mask_marker = run["timestamp_10ns"] % np.uint64(period) == 0
+    run["pulse_height_adc"][mask_marker] = gemseana.rollover_marker_pulse_height_adc
+    run["extra"][mask_marker] = gemseana.rollover_marker_extra
+    return run
+
+
+def gen_synthetic_data():
+    # run 0: markers 1-10, gap (markers 11-14 missing), markers 15-20; run 1 (timestamps reset): markers 1-5
+    return np.concatenate([gen_run(range(1, 11), seed=1), gen_run(range(15, 21), seed=2), gen_run(range(1, 6), seed=3)])
+
+
+def test_rollover_marker_mask():
+    timestamp_data = gen_run(range(1, 4))
+    assert np.sum(gemseana.get_rollover_marker_mask(timestamp_data)) == 3
+    # events with the marker pulse height but not at a multiple of the rollover period are no markers
+    timestamp_data["pulse_height_adc"][1] = gemseana.rollover_marker_pulse_height_adc
+    timestamp_data["extra"][1] = gemseana.rollover_marker_extra
+    assert np.sum(gemseana.get_rollover_marker_mask(timestamp_data)) == 3
+
+
+def test_run_segments_of_synthetic_data():
+    timestamp_data = gen_synthetic_data()
+    run_segments = gemseana.get_run_segments(timestamp_data)
+    assert run_segments.dtype == gemseana.run_segment_dtype
+    assert run_segments["run"].tolist() == [0, 0, 1]
+    assert run_segments["i_start"].tolist() == [0, 40, 64]
+    assert run_segments["i_stop"].tolist() == [40, 64, 84]
+    assert run_segments["n_rollover_markers"].tolist() == [10, 6, 5]
+    assert run_segments["n_events"].tolist() == [30, 18, 15]
+    assert run_segments["n_missing_rollover_markers"].tolist() == [0, 0, 0]
+    assert run_segments["start_s"].tolist() == [period*10**(-8), 15*period*10**(-8), period*10**(-8)]
+    assert np.allclose(run_segments["live_time_s"], run_segments["stop_s"] -run_segments["start_s"])
+    assert np.all(run_segments["stop_s"][:2] < [11*period*10**(-8), 21*period*10**(-8)])
+
+
+def test_single_missing_rollover_marker_is_tolerated():
+    timestamp_data = gen_run([1, 2, 3, 5, 6], n_events_per_period=0)
+    run_segments = gemseana.get_run_segments(timestamp_data)
+    assert len(run_segments) == 1
+    assert run_segments["n_missing_rollover_markers"].tolist() == [1]
+    assert len(gemseana.get_run_segments(timestamp_data, max_gap_s=1.5*period*10**(-8))) == 2
+
+
+def test_list_file_live_time_of_synthetic_list_file(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    timestamp_data = gen_synthetic_data()
+    gemseana.gen_pseudo_list_file(pathstring_data, [1, 2, 3], timestamp_data)
+    run_segments = gemseana.get_run_segments(timestamp_data)
+    assert gemseana.get_run_segments(pathstring_data).tolist() == run_segments.tolist()
+    assert gemseana.get_list_file_live_time(pathstring_data) == pytest.approx(np.sum(run_segments["live_time_s"]))
+
+
+def test_segment_time_windows_round_trip():
+    timestamp_data = gen_synthetic_data()
+    run_segments = gemseana.get_run_segments(timestamp_data)
+    with pytest.raises(Exception, match="timestamps were reset"):
+        gemseana.get_segment_time_windows(run_segments)
+    run_segments_0 = run_segments[run_segments["run"]==0]
+    input_time_windows = gemseana.get_segment_time_windows(run_segments_0)
+    assert len(input_time_windows) == 2
+    assert all([type(t) == int for time_window in input_time_windows for t in time_window])
+    # the (full second) time windows select exactly the events of the segments
+    data_run_0 = timestamp_data[:run_segments_0["i_stop"][-1]]
+    for time_window, segment in zip(input_time_windows, run_segments_0):
+        assert gemseana.get_time_window_indices(data_run_0["timestamp_10ns"], time_window) == (segment["i_start"], segment["i_stop"])
+    assert len(gemseana.get_segment_time_windows(run_segments_0, min_live_time_s=80)) == 1
+
+
+def test_example_list_file_live_time():
+    assert gemseana.get_list_file_live_time(pathstring_example_list_file) == pytest.approx(324077.5, abs=0.05)
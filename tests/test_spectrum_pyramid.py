@@ -0,0 +1,51 @@
+import numpy as np
+
+import gemseana
+
+
+def gen_spectrum_dict(n_bins, binwidth=1., seed=0):
+    rng = np.random.RandomState(seed)
+    counts = rng.poisson(20, n_bins).astype(np.float64)
+    return gemseana.gen_spectrum_dict(np.arange(n_bins +1)*binwidth, counts, 1., [0, 1])
+
+
+def test_sum_is_conserved_and_errors_combine_in_quadrature():
+    spectrum_dict = gen_spectrum_dict(1024)
+    spectrum_dict["counts_errors"] = np.random.RandomState(1).uniform(1, 5, 1024)
+    pyramid = gemseana.gen_spectrum_pyramid(spectrum_dict, min_bins=64)
+    assert [len(level["counts"]) for level in pyramid] == [1024, 512, 256, 128, 64]
+    for previous_level, level in zip(pyramid[:-1], pyramid[1:]):
+        assert np.sum(level["counts"]) == np.sum(previous_level["counts"])
+        assert np.allclose(level["counts"], previous_level["counts"][::2] +previous_level["counts"][1::2])
+        assert np.allclose(level["counts_errors"]**2, previous_level["counts_errors"][::2]**2 +previous_level["counts_errors"][1::2]**2)
+        assert np.array_equal(level["bin_edges"], previous_level["bin_edges"][::2])
+        assert len(level["bin_edges"]) == len(level["counts"]) +1
+    assert not pyramid[-1]["counts"].flags.writeable
+
+
+def test_odd_trailing_bin_is_carried_over():
+    spectrum_dict = gen_spectrum_dict(259)
+    pyramid = gemseana.gen_spectrum_pyramid(spectrum_dict, min_bins=64)
+    assert [len(level["counts"]) for level in pyramid] == [259, 130, 65]
+    for previous_level, level in zip(pyramid[:-1], pyramid[1:]):
+        assert np.sum(level["counts"]) == np.sum(previous_level["counts"])
+        assert len(level["bin_edges"]) == len(level["counts"]) +1
+        assert level["bin_edges"][-1] == spectrum_dict["bin_edges"][-1]
+    # 259 bins: the last level-1 bin is the unchanged last level-0 bin
+    assert pyramid[1]["counts"][-1] == spectrum_dict["counts"][-1]
+    assert pyramid[1]["counts_errors"][-1] == spectrum_dict["counts_errors"][-1]
+    assert pyramid[1]["bin_edges"][-2:].tolist() == [258., 259.]
+
+
+def test_level_selection():
+    pyramid = gemseana.gen_spectrum_pyramid(gen_spectrum_dict(2048), min_bins=64)
+    binwidths = [np.max(np.diff(level["bin_edges"])) for level in pyramid]
+    assert binwidths == [1., 2., 4., 8., 16., 32.]
+    # 10 keV per pixel: 8 keV bins are the coarsest ones that are still resolved
+    assert gemseana.select_spectrum_pyramid_level(pyramid, [0, 1000], 100) is pyramid[3]
+    assert gemseana.select_spectrum_pyramid_level(pyramid, [1000, 0], 100) is pyramid[3]
+    assert gemseana.select_spectrum_pyramid_level(pyramid, [0, 1000], 100, pixels_per_bin=2) is pyramid[4]
+    # zoomed in beyond the original binning: level 0
+    assert gemseana.select_spectrum_pyramid_level(pyramid, [100, 110], 1000) is pyramid[0]
+    # zoomed out beyond the coarsest level: coarsest level
+    assert gemseana.select_spectrum_pyramid_level(pyramid, [0, 10**6], 100) is pyramid[-1]
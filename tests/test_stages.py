@@ -0,0 +1,59 @@
+import os
+import shutil
+import subprocess
+
+import gemseana
+
+
+abspath_isotope_parameters = os.path.join(os.path.dirname(gemseana.__file__), "gemse_analysis_files", "isotope_parameters") +"/"
+
+
+def run_counted_stage(tmp_path, input_pathstrings, output_pathstrings, ctr_runs):
+    def stage_function():
+        ctr_runs.append(1)
+        return subprocess.CompletedProcess(args=[], returncode=0)
+    return gemseana.run_stage(
+        stage_function = stage_function,
+        stage_key = "stage",
+        input_pathstrings = input_pathstrings,
+        input_parameters = {},
+        output_pathstrings = output_pathstrings,
+        pathstring_stage_manifest = str(tmp_path / gemseana.stage_manifest_filename))
+
+
+def test_stage_without_outputs_is_always_run(tmp_path):
+    ctr_runs = []
+    run_counted_stage(tmp_path, [], [], ctr_runs)
+    run_counted_stage(tmp_path, [], [], ctr_runs)
+    assert len(ctr_runs) == 2
+
+
+def test_gemse_analysis_inputs_cover_configuration(tmp_path):
+    abspath_folder = str(tmp_path / "isotope_parameters") +"/"
+    shutil.copytree(abspath_isotope_parameters, abspath_folder)
+    for filename in ["background.root", "efficiency.root", "resolution.root", "summary.txt"]:
+        (tmp_path / filename).write_text("0")
+    pathstring_configuration_file = gemseana.gen_analysis_configuration_file(
+        pathstring_output = str(tmp_path / "analysis_configuration_file.txt"),
+        sample_name = "sample",
+        abspath_isotope_parameters_folder = abspath_folder,
+        abspath_sample_spectrum_root_file = str(tmp_path / "sample.root"),
+        abspath_background_spectrum_root_file = str(tmp_path / "background.root"),
+        abspath_efficiency_root_file = str(tmp_path / "efficiency.root"),
+        abspath_resolution_root_file = str(tmp_path / "resolution.root"),
+        abspath_results_folder = str(tmp_path) +"/",
+        list_isotopes_to_analyze = ["Co60", "K40"])
+    input_pathstrings = gemseana.get_gemse_analysis_input_pathstrings(pathstring_configuration_file)
+    assert abspath_folder +"parameters_Co60.txt" in input_pathstrings
+    assert str(tmp_path / "efficiency.root") in input_pathstrings
+    ctr_runs = []
+    output_pathstrings = [str(tmp_path / "summary.txt")]
+    run_counted_stage(tmp_path, input_pathstrings, output_pathstrings, ctr_runs)
+    run_counted_stage(tmp_path, gemseana.get_gemse_analysis_input_pathstrings(pathstring_configuration_file), output_pathstrings, ctr_runs)
+    assert len(ctr_runs) == 1
+    # modifying any referenced file invalidates the stage
+    for pathstring in [abspath_folder +"parameters_Co60.txt", str(tmp_path / "resolution.root")]:
+        with open(pathstring, "a") as f:
+            f.write("\n")
+        run_counted_stage(tmp_path, gemseana.get_gemse_analysis_input_pathstrings(pathstring_configuration_file), output_pathstrings, ctr_runs)
+    assert len(ctr_runs) == 3
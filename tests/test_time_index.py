@@ -0,0 +1,33 @@
+import numpy as np
+
+import gemseana
+
+
+def gen_timestamp_data(n_events=5000, seed=0):
+    rng = np.random.RandomState(seed)
+    timestamp_data = np.zeros(n_events, gemseana.timestamp_data_mc2_dtype)
+    timestamp_data["timestamp_10ns"] = np.sort(rng.randint(0, 10*3600*10**8, n_events)).astype(np.uint64)
+    timestamp_data["pulse_height_adc"] = rng.randint(0, gemseana.n_adc_channels, n_events)
+    return timestamp_data
+
+
+def test_time_index_spectrum_matches_direct_histogram():
+    timestamp_data = gen_timestamp_data()
+    timestamp_data["status"][::7] = gemseana.status_vetoed
+    time_index = gemseana.get_time_index(timestamp_data)
+    spectrum_dict = gemseana.get_energy_spectrum_from_time_index(time_index, timestamp_data, [0., 1.], [1000, 20000])
+    i_min, i_max = gemseana.get_time_window_indices(timestamp_data["timestamp_10ns"], [1000, 20000])
+    assert np.array_equal(spectrum_dict["counts"], gemseana.get_adc_channel_histogram(timestamp_data[i_min:i_max]))
+
+
+def test_time_index_key_covers_status(tmp_path):
+    pathstring_data = str(tmp_path / "list_file.txt")
+    (tmp_path / "list_file.txt").write_text("HEADER0:1\n")
+    timestamp_data = gen_timestamp_data()
+    gemseana.save_time_index(gemseana.get_time_index(timestamp_data), pathstring_data)
+    assert gemseana.load_time_index(pathstring_data, gemseana.get_time_index_key(timestamp_data)) != None
+    assert gemseana.load_time_index(pathstring_data, gemseana.get_time_index_key(timestamp_data, input_block_s=60)) == None
+    # e.g., vetoed with different veto parameters
+    timestamp_data["status"][::3] = gemseana.status_vetoed
+    assert gemseana.load_time_index(pathstring_data, gemseana.get_time_index_key(timestamp_data)) == None
+    assert gemseana.load_time_index(pathstring_data, gemseana.get_time_index_key(timestamp_data, flag_exclude_cut_and_vetoed=False)) == None
@@ -0,0 +1,93 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import gemseana
+
+
+# baseline line-by-line implementation of 'get_veto_information' (operating on the former 'timestamp_data_mc2_legacy_dtype'), kept unmodified as a reference
+def get_veto_information_baseline(
+    input_signal_file,
+    pathstring_vetodata,
+    timingoffset = 10, # in us
+    vetowindow = 10):# in us
+
+    # initial definitions
+    signal_file = input_signal_file.copy()
+    exception_list = []
+    fname = "get_veto_information"
+    t_i = datetime.datetime.now()
+    print(fname, " : started: ", t_i)
+    print(fname, " : input veto file: ", pathstring_vetodata)
+    l = len(signal_file)
+    o = timingoffset*100 # the timestamp recorded by the MCA corresponds to clock cycles, i.e. 10ns
+    v = vetowindow*100 # accordingly one must convert us to 10ns
+    j = 0 # index of the current signal file entry to be checked
+
+    # accessing and looping over the veto file line by line (note that therefore the file does not have to be loaded into the RAM in its entirety)
+    with open(pathstring_vetodata) as input_file:
+        for line in input_file:
+            if not line.startswith("HEADER"):
+                line_list = list(line.split())
+                try:
+                    timestamp_10ns = np.uint64(line_list[0])
+                    pulse_height_adc = np.int64(line_list[1])
+                    # go to the next veto entry if the current signal entry timestamp is larger than the current veto entry timestamp
+                    if signal_file[j]["timestamp_10ns"] > timestamp_10ns +o +v:
+                        continue
+                    # if the veto entry timestamp is larger than the current signal entry, check whether the signal entry timestamp lies within the interval [timestamp_10ns +o, timestamp_10ns +o +w] and therefore needs to be vetoed, otherwiese bring up the next signal entry until their timestamp is greater than timestamp_10ns +o +w (and one would again have to skip lines until a smaller signal entry timestamp is once again found)
+                    else:
+                        while signal_file[j]["timestamp_10ns"] <= timestamp_10ns +o +v and j<l:
+                            if signal_file[j]["timestamp_10ns"] > timestamp_10ns +o:
+                                if signal_file[j]["validity"] == "cut":
+                                    signal_file[j]["validity"] = "cut_and_vetoed"
+                                    print(fname, " : vetoed already cut entry: ", signal_file[j])
+                                else:
+                                    signal_file[j]["validity"] = "vetoed"
+                                    print(fname, " : vetoed: ", signal_file[j])
+                                j +=1
+                            else:
+                                j +=1
+                except:
+                    exception_list.append(line_list)
+            if j % 10000 == 0:
+                print(fname, ": ", f"checked {j} of {l} entries, already running for {datetime.datetime.now()-t_i}" )
+    t_f = datetime.datetime.now()
+    print(fname, ": ", "encountered exceptions:")
+    for i in range(len(exception_list)):
+        print(exception_list[i])
+    print(fname, ": ", "finished: ", t_f)
+    print(fname, ": ", "duration: ", t_f-t_i)
+
+    return signal_file
+
+
+def write_synthetic_data(tmp_path, n_veto=5000, n_signal=2000, seed=42):
+    rng = np.random.RandomState(seed)
+    # synthetic veto data: isolated events plus bursts with overlapping veto windows
+    veto_timestamps = np.cumsum(rng.randint(1, 20000, n_veto)).astype(np.uint64)
+    burst_indices = rng.choice(n_veto, n_veto//10, replace=False)
+    veto_timestamps = np.sort(np.concatenate([veto_timestamps, veto_timestamps[burst_indices] +rng.randint(1, 500, len(burst_indices)).astype(np.uint64)]))
+    pathstring_veto_file = str(tmp_path / "veto_file.txt")
+    with open(pathstring_veto_file, "w") as output_file:
+        output_file.write("".join([f"HEADER{i}:0\n" for i in range(5)]))
+        output_file.write("".join([f"{t} {rng.randint(0,16383)} 0 \n" for t in veto_timestamps]))
+    # synthetic signal data: random events plus events near the veto window edges
+    signal_timestamps = np.concatenate([
+        rng.randint(0, int(veto_timestamps[-1]) +5000, n_signal//2),
+        rng.choice(veto_timestamps, n_signal -n_signal//2).astype(np.int64) +rng.randint(-2500, 3500, n_signal -n_signal//2)])
+    signal_timestamps = np.sort(signal_timestamps[signal_timestamps >= 0])
+    signal_data = np.zeros(len(signal_timestamps), gemseana.timestamp_data_mc2_dtype)
+    signal_data["timestamp_10ns"] = signal_timestamps
+    signal_data["status"][rng.random_sample(len(signal_data)) < 0.2] = gemseana.status_cut
+    return signal_data, pathstring_veto_file
+
+
+@pytest.mark.parametrize("timingoffset, vetowindow", [[10,10], [0,5], [3,20]])
+def test_veto_information_matches_baseline(tmp_path, timingoffset, vetowindow):
+    signal_data, pathstring_veto_file = write_synthetic_data(tmp_path)
+    baseline = get_veto_information_baseline(gemseana.conv_timestamp_data_to_legacy_dtype(signal_data), pathstring_veto_file, timingoffset, vetowindow)
+    vectorized = gemseana.get_veto_information(signal_data, pathstring_veto_file, timingoffset, vetowindow, chunk_events=777)
+    assert np.count_nonzero(vectorized["status"] & gemseana.status_vetoed) > 0
+    assert gemseana.conv_status_to_validity_labels(vectorized["status"]).tolist() == baseline["validity"].tolist()